@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Structured, levelled logging for the National 4-H GIS Leadership Team Website.
+
+Log calls use %-style arguments, so nothing is formatted unless the level is
+enabled. On App Engine every line is a JSON object Cloud Logging understands
+(severity, message, request id, trace); locally it is plain text. Per-item
+debug lines can pass ``extra=SAMPLED`` so only a fraction of them is kept.
+
+    logger = get_logger(__name__)
+    logger.info("Loaded %d projects", len(projects))
+    logger.debug("Loaded project %s", project_id, extra=SAMPLED)
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timezone
+
+ON_APP_ENGINE = bool(os.environ.get('GAE_ENV'))
+
+# Production stays at INFO so per-record debug lines cost one level check and no formatting
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO' if ON_APP_ENGINE else 'DEBUG').upper()
+
+# 'json' for Cloud Logging, 'text' for terminals
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json' if ON_APP_ENGINE else 'text')
+
+# Fraction of records logged with extra=SAMPLED that are kept
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '0.01' if ON_APP_ENGINE else '1'))
+
+# Mark a record for sampling: logger.debug(..., extra=SAMPLED)
+SAMPLED = {'sampled': True}
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+_trace = contextvars.ContextVar('trace', default=None)
+
+
+def set_request_context(request_id: str, trace: str = None):
+    """Tag log records from the current request (and work it hands to other threads) with its id."""
+    _request_id.set(request_id)
+    _trace.set(trace)
+
+
+def clear_request_context():
+    """Stop tagging log records with a request id."""
+    _request_id.set(None)
+    _trace.set(None)
+
+
+def get_request_id() -> str:
+    """Get the current request id, if any."""
+    return _request_id.get()
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the request id (and trace) to every record."""
+
+    def filter(self, record):
+        record.request_id = _request_id.get() or '-'
+        record.trace = _trace.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only LOG_SAMPLE_RATE of the records marked with extra=SAMPLED."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return not getattr(record, 'sampled', False) or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, in the shape Cloud Logging parses from stdout."""
+
+    def format(self, record):
+        entry = {
+            'severity': record.levelname,
+            'message': record.getMessage(),
+            'logger': record.name,
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        trace = getattr(record, 'trace', None)
+        if trace:
+            entry['logging.googleapis.com/trace'] = trace
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+_configured = False
+_level = logging.INFO  # LOG_LEVEL as a number, resolved by configure_logging
+
+
+def configure_logging():
+    """Install the shared handler on the root logger once per process."""
+    global _configured, _level
+    if _configured:
+        return
+    _configured = True
+    level = logging.getLevelNamesMapping().get(LOG_LEVEL)
+    _level = logging.INFO if level is None else level
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    # Library loggers (urllib3, google.auth) stay at INFO even when the app logs DEBUG
+    root.setLevel(max(_level, logging.INFO))
+    if level is None:
+        logging.getLogger(__name__).warning("Unknown LOG_LEVEL %r, logging at INFO", LOG_LEVEL)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get an application logger at LOG_LEVEL, configuring logging on first use."""
+    configure_logging()
+    logger = logging.getLogger(name)
+    logger.setLevel(_level)
+    return logger
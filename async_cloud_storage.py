@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Asyncio client for the National 4-H GIS Leadership Team storage bucket.
+
+``AsyncCloudStorageManager`` offers the same methods as ``CloudStorageManager``
+as coroutines. Reads talk to the Cloud Storage JSON API over aiohttp, so one
+thread can overlap hundreds of round trips, and multi-object reads fan out
+with ``asyncio.gather``. Writes (which mostly read-modify-write manifests)
+run the blocking manager in a worker thread; both share one cache, so a write
+made through either is seen by the other.
+
+    async with AsyncCloudStorageManager() as storage:
+        projects = await storage.get_all_projects()
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from google.api_core.exceptions import NotFound, NotModified, from_http_status
+
+from cloud_storage import CloudStorageManager, VERSION_CHECK_INTERVAL
+from storage_codec import encode_record, decode_record
+from storage_metrics import metrics
+from app_logging import get_logger
+
+try:
+    import aiohttp
+except ImportError:  # only needed by the async client
+    aiohttp = None
+
+logger = get_logger(__name__)
+
+# Requests one manager keeps in flight at once
+ASYNC_CONCURRENCY = int(os.environ.get('STORAGE_ASYNC_CONCURRENCY', '64'))
+
+# Collection versions written by the current task, for read-your-writes (see pop_write_tokens)
+_write_tokens = contextvars.ContextVar('storage_write_tokens', default=None)
+
+
+class AsyncCloudStorageManager:
+    def __init__(self, bucket_name: str = None, manager: CloudStorageManager = None,
+                 session=None, concurrency: int = None):
+        """Initialize the async manager around a (possibly shared) blocking manager."""
+        if aiohttp is None:
+            raise RuntimeError('AsyncCloudStorageManager requires aiohttp (pip install aiohttp)')
+        self.manager = manager or CloudStorageManager(bucket_name)
+        self.bucket_name = self.manager.bucket_name
+        self.cache = self.manager.cache
+        self.concurrency = concurrency or ASYNC_CONCURRENCY
+        # The storage emulator (also honoured by google-cloud-storage) needs no credentials
+        emulator = os.environ.get('STORAGE_EMULATOR_HOST')
+        self.api_root = (emulator or 'https://storage.googleapis.com').rstrip('/')
+        self._anonymous = bool(emulator)
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+        self._credentials = None
+        self._token_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP session if this manager created it."""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+        self._session = None
+
+    def __getattr__(self, name: str):
+        """Expose the remaining manager methods as coroutines run in a worker thread."""
+        if name == 'manager':
+            raise AttributeError(name)
+        attribute = getattr(self.manager, name)
+        if name.startswith('__') or not callable(attribute):
+            return attribute
+
+        async def call_in_thread(*args, **kwargs):
+            written = {}
+
+            def run():
+                try:
+                    return attribute(*args, **kwargs)
+                finally:
+                    # Write tokens are recorded per thread; carry them back to this task
+                    written.update(self.manager.pop_write_tokens())
+
+            try:
+                return await asyncio.to_thread(run)
+            finally:
+                tokens = self._pending_write_tokens()
+                for prefix, version in written.items():
+                    tokens[prefix] = max(version, tokens.get(prefix, 0))
+        call_in_thread.__name__ = name
+        call_in_thread.__doc__ = attribute.__doc__
+        return call_in_thread
+
+    def _pending_write_tokens(self) -> Dict[str, int]:
+        """Get the write tokens recorded by the current task."""
+        tokens = _write_tokens.get()
+        if tokens is None:
+            tokens = {}
+            _write_tokens.set(tokens)
+        return tokens
+
+    def pop_write_tokens(self) -> Dict[str, int]:
+        """Return and clear the collection versions written by the current task."""
+        tokens = self._pending_write_tokens()
+        _write_tokens.set({})
+        return tokens
+
+    # HTTP
+    def _get_session(self):
+        """Get the HTTP session, creating it inside the running event loop."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._token_lock = asyncio.Lock()
+        return self._session
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        """Get the Authorization header, refreshing the access token off the event loop."""
+        if self._anonymous:
+            return {}
+        async with self._token_lock:
+            if self._credentials is None:
+                # Same key file lookup and scopes as the blocking client
+                self._credentials, _ = await asyncio.to_thread(self.manager._load_credentials)
+            if not self._credentials.valid:
+                from google.auth.transport.requests import Request
+                await asyncio.to_thread(self._credentials.refresh, Request())
+            return {'Authorization': f'Bearer {self._credentials.token}'}
+
+    def _object_url(self, path: str, media: bool = False) -> str:
+        """Get the JSON API URL of an object (its bytes when ``media`` is set)."""
+        root = f'{self.api_root}/download' if media else self.api_root
+        return f"{root}/storage/v1/b/{self.bucket_name}/o/{quote(path, safe='')}"
+
+    async def _request(self, method: str, url: str, params: Dict = None, **kwargs):
+        """Send one request and return ``(status, headers, body)``; error statuses raise
+        the same google.api_core exceptions the blocking client raises."""
+        session = self._get_session()
+        headers = await self._auth_headers()
+        headers.update(kwargs.pop('headers', {}))
+        params = {key: str(value) for key, value in (params or {}).items() if value is not None}
+        async with self._semaphore:
+            async with session.request(method, url, params=params, headers=headers, **kwargs) as response:
+                body = await response.read()
+                if response.status >= 300:
+                    raise from_http_status(response.status, f'{method} {url}: {body[:200]!r}')
+                return response.status, response.headers, body
+
+    async def _download(self, path: str, if_generation_not_match: int = None):
+        """Download an object; returns ``(body, generation, metageneration)``."""
+        with metrics.timed('get', path):
+            _, headers, body = await self._request(
+                'GET', self._object_url(path, media=True),
+                params={'alt': 'media', 'ifGenerationNotMatch': if_generation_not_match})
+        generation = headers.get('x-goog-generation')
+        metageneration = headers.get('x-goog-metageneration')
+        return body, int(generation) if generation else None, int(metageneration) if metageneration else None
+
+    async def _get_metadata(self, path: str) -> Optional[Dict]:
+        """Get an object's metadata, or None if it does not exist."""
+        try:
+            with metrics.timed('stat', path):
+                _, _, body = await self._request('GET', self._object_url(path), params={'fields': 'name,generation,metageneration,size,updated'})
+        except NotFound:
+            return None
+        return json.loads(body)
+
+    async def _upload(self, path: str, body: bytes, content_encoding: str = None, if_generation_match: int = None) -> Optional[int]:
+        """Upload an object in one multipart request; returns its new generation."""
+        metadata = {'name': path, 'contentType': 'application/json'}
+        if content_encoding:
+            metadata['contentEncoding'] = content_encoding
+        with aiohttp.MultipartWriter('related') as multipart:
+            multipart.append_json(metadata)
+            multipart.append(body, {'Content-Type': 'application/json'})
+        with metrics.timed('save', path):
+            _, _, response = await self._request(
+                'POST', f'{self.api_root}/upload/storage/v1/b/{self.bucket_name}/o',
+                params={'uploadType': 'multipart', 'ifGenerationMatch': if_generation_match}, data=multipart)
+        generation = json.loads(response).get('generation')
+        return int(generation) if generation is not None else None
+
+    async def _list_files(self, prefix: str) -> List[str]:
+        """List object names under a prefix, following page tokens."""
+        names = []
+        page_token = None
+        while True:
+            with metrics.timed('list', prefix):
+                _, _, body = await self._request(
+                    'GET', f'{self.api_root}/storage/v1/b/{self.bucket_name}/o',
+                    params={'prefix': prefix, 'pageToken': page_token,
+                            'fields': 'items(name),nextPageToken'})
+            page = json.loads(body)
+            names.extend(item['name'] for item in page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                metrics.observe_listing(prefix, len(names))
+                return names
+
+    # JSON Objects
+    async def _fetch_json(self, path: str) -> Optional[Dict]:
+        """Load JSON data through the shared cache, revalidating expired entries by generation."""
+        collection = self.manager._collection_prefix(path)
+        if collection:
+            await self._check_collection_version(collection)
+        cached = self.cache.get(path)
+        if cached is not None:
+            return cached
+        stale_generation = self.cache.stale_generation(path)
+        try:
+            body, generation, metageneration = await self._download(path, if_generation_not_match=stale_generation)
+        except NotModified:
+            cached = self.cache.revalidated(path)
+            if cached is not None:
+                return cached
+            # Evicted while we were revalidating; fetch the body after all
+            body, generation, metageneration = await self._download(path)
+        except NotFound:
+            self.cache.invalidate(path)
+            return None
+        data = decode_record(body)
+        self.cache.put(path, data, len(body), generation, metageneration)
+        return data
+
+    async def _load_json(self, path: str) -> Optional[Dict]:
+        """Load JSON data, returning None (and logging why) when it is missing or unreadable."""
+        try:
+            data = await self._fetch_json(path)
+            if data is None:
+                logger.debug("File %s does not exist", path)
+            return data
+        except Exception as e:
+            logger.error("Error loading JSON from %s: %s", path, e)
+            return None
+
+    async def _load_many(self, paths: List[str]):
+        """Load several JSON objects concurrently with asyncio.gather.
+
+        Returns ``(results, failures)`` like ``CloudStorageManager._load_many``.
+        """
+        outcomes = await asyncio.gather(*(self._fetch_json(path) for path in paths), return_exceptions=True)
+        results = []
+        failures = {}
+        for path, outcome in zip(paths, outcomes):
+            if isinstance(outcome, Exception):
+                failures[path] = str(outcome)
+                logger.error("Error loading JSON from %s: %s", path, outcome)
+                outcome = None
+            results.append(outcome)
+        return results, failures
+
+    async def _save_json(self, path: str, data: Dict, if_generation_match: int = None) -> Optional[int]:
+        """Save JSON data, optionally only if the object is still at a given generation."""
+        body, content_encoding = encode_record(data)
+        try:
+            return await self._upload(path, body, content_encoding, if_generation_match)
+        finally:
+            self.cache.invalidate(path)
+
+    async def _delete_file(self, path: str) -> bool:
+        """Delete a file from cloud storage."""
+        self.cache.invalidate(path)
+        try:
+            with metrics.timed('delete', path):
+                await self._request('DELETE', self._object_url(path))
+            return True
+        except NotFound:
+            logger.debug("File %s does not exist", path)
+            return False
+
+    async def _list_record_files(self, prefix: str) -> List[str]:
+        """List record files with a specific prefix."""
+        return [path for path in await self._list_files(prefix) if self.manager._is_record_file(path)]
+
+    # Collection Versions
+    async def _check_collection_version(self, prefix: str, force: bool = False):
+        """Drop cached objects of a collection if its version stamp changed (see CloudStorageManager)."""
+        manager = self.manager
+        now = time.monotonic()
+        if not force and now - manager._version_checked_at.get(prefix, float('-inf')) < VERSION_CHECK_INTERVAL:
+            return
+        manager._version_checked_at[prefix] = now
+        try:
+            stamp = await self._get_metadata(manager._version_path(prefix))
+        except Exception as e:
+            logger.error("Error checking version for %s: %s", prefix, e)
+            return
+        version = int(stamp['generation']) if stamp else 0
+        if manager._known_versions.get(prefix) != version:
+            if prefix in manager._known_versions:
+                # Same delta refresh as the blocking manager; its projected listing runs off the loop
+                await asyncio.to_thread(manager._drop_changed, prefix)
+            manager._known_versions[prefix] = version
+
+    async def require_versions(self, tokens: Dict[str, int]):
+        """Make sure reads reflect at least the given collection versions (read-your-writes)."""
+        await asyncio.gather(*(self._check_collection_version(prefix, force=True)
+                               for prefix, version in tokens.items()
+                               if self.manager._known_versions.get(prefix, 0) < version))
+
+    # Collections
+    async def _load_collection(self, prefix: str) -> List[Dict]:
+        """Load every record of a collection with a single manifest read."""
+        if self.manager._uses_journal(prefix):
+            return await asyncio.to_thread(self.manager._load_collection, prefix)
+        manifest = await self._load_json(self.manager._manifest_path(prefix))
+        if manifest is None:
+            manifest = await asyncio.to_thread(self.manager.rebuild_manifest, prefix)
+        return list(manifest['items'].values())
+
+    async def _load_summaries(self, prefix: str) -> List[Dict]:
+        """Load the card fields of every record in a collection."""
+        if not self.manager._uses_journal(prefix):
+            summaries = await self._load_json(self.manager._summary_path(prefix))
+            if summaries is not None:
+                return list(summaries['items'].values())
+        return await asyncio.to_thread(self.manager._load_summaries, prefix)
+
+    async def _get_record(self, prefix: str, record_id: str) -> Optional[Dict]:
+        """Load one record of a collection by id."""
+        if self.manager._uses_journal(prefix):
+            return await asyncio.to_thread(self.manager._get_record, prefix, record_id)
+        return await self._load_json(f'{prefix}{record_id}.json')
+
+    # Users
+    async def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID."""
+        return await self._load_json(f'users/{user_id}.json')
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[Optional[Dict]]:
+        """Get several users by ID in one concurrent fan-out (None where missing)."""
+        users, _ = await self._load_many([f'users/{user_id}.json' for user_id in user_ids])
+        return users
+
+    async def get_all_users(self) -> List[Dict]:
+        """Get all users."""
+        user_data_list, failures = await self._load_many(await self._list_record_files('users/'))
+        if failures:
+            logger.warning("Skipped %s unreadable user files", len(failures))
+        return [user_data for user_data in user_data_list if user_data]
+
+    # Projects
+    async def get_project_by_id(self, project_id: str) -> Optional[Dict]:
+        """Get project by ID."""
+        return await self._get_record('projects/', project_id)
+
+    async def get_all_projects(self) -> List[Dict]:
+        """Get all active projects."""
+        projects = [project_data for project_data in await self._load_collection('projects/')
+                    if project_data.get('is_active', True)]
+        logger.debug("Total projects loaded: %d", len(projects))
+        return sorted(projects, key=lambda x: x['created_at'], reverse=True)
+
+    async def list_projects(self, limit: int = None, cursor: str = None, page: int = None,
+                            filters: Dict[str, List[str]] = None, query: str = None) -> Dict[str, Any]:
+        """Get one page of active project summaries, newest first, optionally filtered like the sync manager."""
+        # The facet and search indexes are in-memory objects of the blocking manager
+        ids = await asyncio.to_thread(self.manager._matching_project_ids, filters, query)
+        projects = [project_data for project_data in await self._load_summaries('projects/')
+                    if project_data.get('is_active', True) and (ids is None or project_data['id'] in ids)]
+        return self.manager._paginate(projects, 'created_at', limit, cursor, page)
+
+    # Gallery
+    async def get_gallery_item_by_id(self, item_id: str) -> Optional[Dict]:
+        """Get gallery item by ID."""
+        return await self._get_record('gallery/', item_id)
+
+    async def get_all_gallery_items(self) -> List[Dict]:
+        """Get all active gallery items."""
+        items = [item_data for item_data in await self._load_collection('gallery/') if item_data.get('is_active', True)]
+        return sorted(items, key=lambda x: x['created_at'], reverse=True)
+
+    async def list_gallery_items(self, limit: int = None, cursor: str = None, page: int = None) -> Dict[str, Any]:
+        """Get one page of active gallery item summaries, newest first."""
+        items = [item_data for item_data in await self._load_summaries('gallery/') if item_data.get('is_active', True)]
+        return self.manager._paginate(items, 'created_at', limit, cursor, page)
+
+    # Team Members
+    async def get_team_member(self, member_id: str) -> Optional[Dict]:
+        """Get team member by ID."""
+        return await self._get_record('team_members/', member_id)
+
+    async def get_all_team_members(self) -> List[Dict]:
+        """Get all team members, board first and then by name."""
+        team_members = await self._load_collection('team_members/')
+        logger.debug("Total team members loaded: %d", len(team_members))
+        team_members.sort(key=lambda x: (x.get('member_type', 'board') != 'board', x.get('name', '')))
+        return team_members
+
+    # Contact Messages
+    async def get_all_contact_messages(self) -> List[Dict]:
+        """Get all contact messages."""
+        messages = await self._load_collection('contact_messages/')
+        return sorted(messages, key=lambda x: x['timestamp'], reverse=True)
+
+    async def list_contact_messages(self, limit: int = None, cursor: str = None, page: int = None) -> Dict[str, Any]:
+        """Get one page of contact messages, newest first."""
+        return self.manager._paginate(await self._load_collection('contact_messages/'), 'timestamp', limit, cursor, page)
+
+    # Bulk Operations
+    async def delete_many(self, paths: List[str]) -> Dict[str, bool]:
+        """Delete many files concurrently; returns path -> deleted (False if it did not exist)."""
+        outcomes = await asyncio.gather(*(self._delete_file(path) for path in paths), return_exceptions=True)
+        results = {}
+        for path, outcome in zip(paths, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Error deleting %s: %s", path, outcome)
+                outcome = False
+            results[path] = outcome
+        return results
+
+    async def save_many(self, items: Dict[str, Dict]) -> Dict[str, bool]:
+        """Save many JSON objects concurrently; returns path -> saved."""
+        paths = list(items)
+        outcomes = await asyncio.gather(*(self._save_json(path, items[path]) for path in paths), return_exceptions=True)
+        results = {}
+        for path, outcome in zip(paths, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("Error saving %s: %s", path, outcome)
+            results[path] = not isinstance(outcome, Exception)
+        return results
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Script to backfill the username/email index objects for existing users.
+Run once per bucket; until then logins fall back to scanning users/.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import cloud_storage
+
+def backfill_user_indexes():
+    """Build users/_by_username/ and users/_by_email/ entries for every user."""
+    print("Backfilling user indexes...")
+
+    counts = cloud_storage.backfill_user_indexes()
+    print(f"✓ Indexed {counts['users']} users")
+    if counts['conflicts']:
+        print(f"⚠ {counts['conflicts']} index conflicts (see above); the oldest account kept the entry")
+
+    print("\nUser index backfill complete!")
+
+if __name__ == "__main__":
+    backfill_user_indexes()
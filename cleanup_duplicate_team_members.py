@@ -44,14 +44,15 @@ def cleanup_duplicate_team_members():
     # Delete the duplicates
     if duplicates_to_delete:
         print(f"\nDeleting {len(duplicates_to_delete)} duplicate team members...")
-        for member_id in duplicates_to_delete:
-            try:
-                cloud_storage.delete_team_member(member_id)
+        results = cloud_storage.delete_team_members(duplicates_to_delete)
+        for member_id, deleted in results.items():
+            if deleted:
                 print(f"✓ Deleted: {member_id}")
-            except Exception as e:
-                print(f"✗ Failed to delete {member_id}: {str(e)}")
+            else:
+                print(f"✗ Failed to delete {member_id}")
         
-        print(f"\nCleanup complete! Deleted {len(duplicates_to_delete)} duplicate team members.")
+        deleted_count = sum(1 for deleted in results.values() if deleted)
+        print(f"\nCleanup complete! Deleted {deleted_count} duplicate team members.")
     else:
         print("No duplicates found!")
 
@@ -4,88 +4,1351 @@ Cloud Storage Manager for National 4-H GIS Leadership Team Website
 Handles all data storage using Google Cloud Storage buckets
 """
 
+import base64
+import contextvars
 import json
+import logging
 import os
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import quote
 from typing import List, Dict, Optional, Any
+import google.auth
 from google.cloud import storage
+from google.oauth2 import service_account
+from google.api_core.exceptions import NotFound, NotModified, PreconditionFailed
+from flask import g, has_request_context
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
+from storage_cache import JsonCache
+from storage_codec import encode_record, decode_record
+from search_index import SearchIndex, SEARCH_FIELDS
+from facet_index import FacetIndex, FACETS
+from suggest_index import SuggestIndex, SUGGEST_FIELDS
+from cluster_index import ClusterIndex, clamp_zoom
+from spatial_index import SpatialIndex, check_location, check_extent, MAX_RADIUS_KM, DEFAULT_NEAR_RESULTS, MAX_NEAR_RESULTS
+from storage_http import get_http_session, http_pool_stats, STORAGE_SCOPES, WEB_THREADS
+from storage_metrics import metrics
+from app_logging import get_logger, SAMPLED
+
+logger = get_logger(__name__)
+
+# Name of the consolidated object each collection prefix keeps next to its records
+MANIFEST_NAME = '_manifest.json'
+
+# Collections whose listings are served from a manifest instead of list + N GETs
+MANIFEST_COLLECTIONS = ['projects/', 'gallery/', 'team_members/', 'contact_messages/']
+
+# Collections that also keep a summary document with just the fields their listing cards show
+SUMMARY_NAME = '_summaries.json'
+SUMMARY_FIELDS = {
+    'projects/': ['id', 'title', 'description', 'project_link', 'project_type', 'tags', 'image_url',
+                  'creator_name', 'created_by', 'created_at', 'updated_at', 'is_active'],
+    'gallery/': ['id', 'title', 'description', 'image_url', 'created_by', 'created_at', 'is_active'],
+}
+# Descriptions in summaries are cut to this many characters
+SUMMARY_DESCRIPTION_CHARS = 300
+
+# How many times a conditional (generation-matched) write is retried on contention
+MAX_WRITE_RETRIES = 5
+
+# Tiny per-collection stamp objects rewritten on every mutation; their generation is the
+# collection version other instances compare against to drop stale cache entries
+VERSION_PREFIX = '_versions/'
+VERSIONED_COLLECTIONS = MANIFEST_COLLECTIONS + ['users/']
+
+# Minimum seconds between version checks of one collection on an instance
+VERSION_CHECK_INTERVAL = float(os.environ.get('STORAGE_VERSION_CHECK_INTERVAL', '1'))
+
+# When another instance writes, list the collection and drop only the cached objects whose
+# generation changed (instead of the whole collection); set STORAGE_DELTA_REFRESH=0 to disable
+DELTA_REFRESH = os.environ.get('STORAGE_DELTA_REFRESH', '1') != '0'
+
+# Field projection for listings that only need to know what changed
+LISTING_FIELDS = 'items(name,generation,updated,size),nextPageToken'
+
+# 'records' keeps one object per record plus manifests; 'journal' stores JOURNAL_COLLECTIONS
+# as a periodically compacted snapshot plus an append-only journal of change events
+STORAGE_MODE = os.environ.get('STORAGE_MODE', 'records')
+JOURNAL_COLLECTIONS = ['projects/', 'gallery/', 'team_members/']
+SNAPSHOT_NAME = '_snapshot.json'
+JOURNAL_DIR = '_journal/'
+# Journal entries a reader may replay before it folds them into a new snapshot
+JOURNAL_COMPACT_THRESHOLD = int(os.environ.get('STORAGE_JOURNAL_COMPACT_THRESHOLD', '50'))
+
+# Records per page returned by the list_* APIs when no limit is given
+PAGE_SIZE = int(os.environ.get('STORAGE_PAGE_SIZE', '24'))
+MAX_PAGE_SIZE = 100
+
+# Sort fields _paginate orders by number (the others hold ISO timestamps)
+NUMERIC_SORT_FIELDS = {'score'}
+
+# Threads used to fetch many objects concurrently, shared by every manager in a worker
+FETCH_WORKERS = int(os.environ.get('STORAGE_FETCH_WORKERS', '8'))
+
+# Secondary indexes mapping normalized usernames / email hashes to user ids
+USERNAME_INDEX_PREFIX = 'users/_by_username/'
+EMAIL_INDEX_PREFIX = 'users/_by_email/'
+# Written by backfill_user_indexes once every existing user has index entries
+USER_INDEX_MARKER = 'users/_indexes.json'
+
+# Site-wide search index over the collections in search_index.SEARCH_FIELDS
+SEARCH_INDEX_PATH = '_search/index.json'
+SEARCH_COLLECTIONS = list(SEARCH_FIELDS)
+
+# Facet counts (type, collection, tag, month) behind the projects filter panel
+FACET_COLLECTION = 'projects/'
+FACET_INDEX_PATH = 'projects/_facets.json'
+
+# Typeahead phrases (project titles, tags, creators, team members); see suggest_index.py
+SUGGEST_INDEX_PATH = '_search/suggest.json'
+SUGGEST_COLLECTIONS = list(SUGGEST_FIELDS)
+
+# Point/extent of every geotagged project; see spatial_index.py
+GEO_COLLECTION = 'projects/'
+GEO_INDEX_PATH = 'projects/_geo.json'
+
+# Project fields holding geometry; updating one to an empty value removes it
+GEOMETRY_FIELDS = ('location', 'extent')
+
+# Connections kept per worker: one per request thread plus one per fetch pool thread,
+# so concurrent fetches never wait for (or throw away) a connection
+HTTP_POOL_SIZE = int(os.environ.get('STORAGE_HTTP_POOL_SIZE', str(WEB_THREADS + FETCH_WORKERS)))
+
+_fetch_executor = None
+_fetch_executor_pid = None
+_fetch_executor_lock = threading.Lock()
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Get the worker-wide fetch pool, recreating it after a fork (e.g. gunicorn preload)."""
+    global _fetch_executor, _fetch_executor_pid
+    with _fetch_executor_lock:
+        if _fetch_executor is None or _fetch_executor_pid != os.getpid():
+            _fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='storage-fetch')
+            _fetch_executor_pid = os.getpid()
+        return _fetch_executor
+
+
+def encode_cursor(sort_value: Any, record_id: str) -> str:
+    """Encode the position after a record as an opaque, URL-safe cursor."""
+    raw = json.dumps([sort_value, record_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_type=str) -> tuple:
+    """Decode a cursor from encode_cursor; raises ValueError if it is malformed.
+    
+    The sort value must be a ``sort_type`` and the record id a string, so a
+    cursor from another listing or a hand-edited one is rejected instead of
+    failing the comparisons in _paginate.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except Exception:
+        raise ValueError(f'Invalid cursor {cursor!r}')
+    if not (isinstance(position, list) and len(position) == 2):
+        raise ValueError(f'Invalid cursor {cursor!r}')
+    sort_value, record_id = position
+    if not isinstance(record_id, str) or isinstance(sort_value, bool) or not isinstance(sort_value, sort_type):
+        raise ValueError(f'Invalid cursor {cursor!r}')
+    return sort_value, record_id
+
 
 class CloudStorageManager:
-    def __init__(self, bucket_name: str = None):
+    def __init__(self, bucket_name: str = None, storage_mode: str = None):
         """Initialize cloud storage manager."""
         self.bucket_name = bucket_name or os.environ.get('STORAGE_BUCKET', 'national-4h-gis-team-data')
+        self.storage_mode = storage_mode or STORAGE_MODE
+        self._user_indexes_backfilled = False
+        self._indexes = {}  # stored index path -> (versions of the collections it covers, built index)
+        self._clusters = None  # (geo index the clusters were built from, ClusterIndex)
+        self.cache = JsonCache()
+        self._known_versions = {}  # collection prefix -> stamp generation our cache reflects
+        self._version_checked_at = {}  # collection prefix -> monotonic time of the last check
+        self._write_tokens = threading.local()  # versions written by the current request's thread
         
-        # Initialize storage client with authentication
+        # The client is created on first use, so importing this module does no I/O
+        self._client = None
+        self._bucket = None
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """Get the storage client, connecting on first use."""
+        if self._client is None:
+            self._connect()
+        return self._client
+    
+    @property
+    def bucket(self):
+        """Get the bucket handle, connecting on first use."""
+        if self._bucket is None:
+            self._connect()
+        return self._bucket
+    
+    def _load_credentials(self):
+        """Resolve storage credentials and their project: the local service account key if present, else the defaults."""
+        # For local development, use service account key if available
+        if os.path.exists('service-account-key.json'):
+            credentials = service_account.Credentials.from_service_account_file(
+                'service-account-key.json', scopes=STORAGE_SCOPES)
+            return credentials, credentials.project_id
+        # For production (App Engine), use default credentials
+        return google.auth.default(scopes=STORAGE_SCOPES)
+    
+    def _connect(self):
+        """Resolve credentials and create the storage client (no request is sent to the bucket)."""
+        with self._client_lock:
+            if self._client is not None:
+                return
+            try:
+                credentials, project = self._load_credentials()
+                # Every manager in this worker shares one tuned connection pool
+                client = storage.Client(project=project, credentials=credentials,
+                                        _http=get_http_session(credentials, HTTP_POOL_SIZE))
+                self._bucket = client.bucket(self.bucket_name)
+                self._client = client
+            except Exception as e:
+                logger.error("Error initializing cloud storage: %s. Make sure you have: "
+                             "1. Google Cloud SDK installed and authenticated, "
+                             "2. Service account key file (service-account-key.json) for local development, "
+                             "3. Proper permissions for the storage bucket", e)
+                raise
+    
+    def health_check(self) -> Dict[str, Any]:
+        """Check that the bucket is reachable; returns ok, latency_ms and any error."""
+        start = time.monotonic()
         try:
-            # For local development, use service account key if available
-            if os.path.exists('service-account-key.json'):
-                self.client = storage.Client.from_service_account_json('service-account-key.json')
-            else:
-                # For production (App Engine), use default credentials
-                self.client = storage.Client()
-            
-            self.bucket = self.client.bucket(self.bucket_name)
-            
-            # Ensure bucket exists
-            if not self.bucket.exists():
-                self.bucket.create()
-                print(f"Created bucket: {self.bucket_name}")
-                
+            with metrics.timed('exists', '/'):
+                ok = self.bucket.exists()
+            error = None if ok else f"Bucket {self.bucket_name} does not exist"
         except Exception as e:
-            print(f"Error initializing cloud storage: {e}")
-            print("Make sure you have:")
-            print("1. Google Cloud SDK installed and authenticated")
-            print("2. Service account key file (service-account-key.json) for local development")
-            print("3. Proper permissions for the storage bucket")
-            raise
+            ok, error = False, str(e)
+        return {
+            'ok': ok,
+            'bucket': self.bucket_name,
+            'latency_ms': round((time.monotonic() - start) * 1000, 1),
+            'error': error
+        }
     
     def _get_blob(self, path: str):
         """Get a blob from the bucket."""
         return self.bucket.blob(path)
     
-    def _save_json(self, path: str, data: Dict):
-        """Save JSON data to cloud storage."""
+    def _save_json(self, path: str, data: Dict, if_generation_match: int = None) -> Optional[int]:
+        """Save JSON data to cloud storage, optionally only if the blob is still at a given generation.
+        
+        Returns the generation of the written blob.
+        """
         blob = self._get_blob(path)
-        blob.upload_from_string(
-            json.dumps(data, default=str),
-            content_type='application/json'
-        )
+        body, blob.content_encoding = encode_record(data)
+        try:
+            with metrics.timed('save', path):
+                blob.upload_from_string(
+                    body,
+                    content_type='application/json',
+                    if_generation_match=if_generation_match
+                )
+        except BaseException:
+            self._forget_request_object(path)
+            raise
+        finally:
+            self.cache.invalidate(path)
+        self._remember_request_object(path, data)
+        return self._blob_generation(blob)
+    
+    def _fetch_json(self, path: str) -> Optional[Dict]:
+        """Load JSON data through the request's identity map and the cache.
+        
+        Returns None if the object is missing and raises on other errors. Within
+        a web request each object is fetched at most once; later reads get the
+        same dict back.
+        """
+        objects = self._request_objects()
+        if objects is not None and path in objects:
+            return objects[path]
+        data = self._read_json(path)
+        if objects is not None:
+            objects[path] = data
+        return data
+    
+    def _read_json(self, path: str) -> Optional[Dict]:
+        """Load JSON data through the cache; returns None if missing and raises on other errors.
+        
+        An expired cache entry is revalidated with an if-generation-not-match
+        download, so the body is only transferred when the blob has changed.
+        """
+        collection = self._collection_prefix(path)
+        if collection:
+            self._check_collection_version(collection)
+        cached = self.cache.get(path)
+        if cached is not None:
+            return cached
+        blob = self._get_blob(path)
+        stale_generation = self.cache.stale_generation(path)
+        try:
+            with metrics.timed('get', path):
+                if stale_generation is not None:
+                    body = blob.download_as_bytes(if_generation_not_match=stale_generation)
+                else:
+                    body = blob.download_as_bytes()
+        except NotModified:
+            cached = self.cache.revalidated(path)
+            if cached is not None:
+                return cached
+            # Evicted while we were revalidating; fetch the body after all
+            with metrics.timed('get', path):
+                body = blob.download_as_bytes()
+        except NotFound:
+            self.cache.invalidate(path)
+            return None
+        data = decode_record(body)
+        self.cache.put(path, data, len(body), self._blob_generation(blob), self._blob_metageneration(blob))
+        return data
+    
+    def _blob_generation(self, blob) -> Optional[int]:
+        """Get a blob's generation as an int (None if unknown)."""
+        return int(blob.generation) if blob.generation is not None else None
+    
+    def _blob_metageneration(self, blob) -> Optional[int]:
+        """Get a blob's metageneration as an int (None if unknown)."""
+        return int(blob.metageneration) if blob.metageneration is not None else None
     
     def _load_json(self, path: str) -> Optional[Dict]:
-        """Load JSON data from cloud storage."""
+        """Load JSON data, serving it from the in-process cache when possible."""
         try:
-            blob = self._get_blob(path)
-            if blob.exists():
-                return json.loads(blob.download_as_text())
-            else:
-                print(f"File {path} does not exist")
-                return None
+            data = self._fetch_json(path)
+            if data is None:
+                logger.debug("File %s does not exist", path)
+            return data
         except Exception as e:
-            print(f"Error loading JSON from {path}: {str(e)}")
+            logger.error("Error loading JSON from %s: %s", path, e)
             return None
     
+    def _load_many(self, paths: List[str]):
+        """Load several JSON objects concurrently on the shared fetch pool.
+        
+        Returns ``(results, failures)``: ``results`` lines up with ``paths`` (None
+        for missing or failed objects) and ``failures`` maps each failed path to
+        its error, so one bad object never fails the whole listing.
+        """
+        results = [None] * len(paths)
+        failures = {}
+        objects = self._request_objects()
+        pending = [i for i, path in enumerate(paths) if objects is None or path not in objects]
+        if len(pending) <= 1:
+            futures = {}
+        else:
+            executor = get_fetch_executor()
+            # Each task runs in a copy of this context so it is counted against the current request
+            futures = {i: executor.submit(contextvars.copy_context().run, self._fetch_json, paths[i]) for i in pending}
+        
+        for i, path in enumerate(paths):
+            try:
+                results[i] = futures[i].result() if i in futures else self._fetch_json(path)
+            except Exception as e:
+                failures[path] = str(e)
+                logger.error("Error loading JSON from %s: %s", path, e)
+        return results, failures
+    
+    def _load_json_with_generation(self, path: str):
+        """Load JSON data together with the blob generation (0 if the blob is missing)."""
+        blob = self._get_blob(path)
+        try:
+            with metrics.timed('get', path):
+                body = blob.download_as_bytes()
+        except NotFound:
+            return None, 0
+        data = decode_record(body)
+        return data, self._blob_generation(blob)
+    
     def _list_files(self, prefix: str) -> List[str]:
         """List files with a specific prefix."""
-        blobs = self.client.list_blobs(self.bucket_name, prefix=prefix)
-        return [blob.name for blob in blobs]
+        with metrics.timed('list', prefix):
+            blobs = self.client.list_blobs(self.bucket_name, prefix=prefix)
+            names = [blob.name for blob in blobs]
+        metrics.observe_listing(prefix, len(names))
+        return names
+    
+    def _is_record_file(self, path: str) -> bool:
+        """Return True for record objects, skipping manifests and other '_'-prefixed bookkeeping objects."""
+        return path.endswith('.json') and not any(part.startswith('_') for part in path.split('/'))
+    
+    def _list_record_files(self, prefix: str) -> List[str]:
+        """List record files with a specific prefix, dropping cached objects the listing shows have changed."""
+        listed = self._list_blob_stats(prefix)
+        self._reconcile_cache(prefix, listed)
+        return [path for path in listed if self._is_record_file(path)]
+    
+    def _list_blob_stats(self, prefix: str) -> Dict[str, Dict[str, Any]]:
+        """List objects under a prefix with just their generation, update time and size."""
+        with metrics.timed('list', prefix):
+            blobs = self.client.list_blobs(self.bucket_name, prefix=prefix, fields=LISTING_FIELDS)
+            stats = {blob.name: {'generation': self._blob_generation(blob), 'updated': blob.updated, 'size': blob.size}
+                     for blob in blobs}
+        metrics.observe_listing(prefix, len(stats))
+        return stats
+    
+    def _reconcile_cache(self, prefix: str, listed: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Bring the cache in line with a listing of a prefix.
+        
+        Cached objects still at the listed generation get a fresh TTL without a
+        request; changed and deleted ones (and derived entries such as a
+        replayed journal state) are dropped.
+        """
+        counts = {'unchanged': 0, 'changed': 0, 'deleted': 0}
+        for path, generation in self.cache.generations(prefix).items():
+            stat = listed.get(path)
+            if stat is None:
+                self.cache.invalidate(path)
+                counts['deleted'] += 1
+            elif self.cache.confirm(path, stat['generation']):
+                counts['unchanged'] += 1
+            else:
+                self.cache.invalidate(path)
+                counts['changed'] += 1
+        return counts
+    
+    def refresh_collection(self, prefix: str) -> Dict[str, int]:
+        """Bring the cached copy of a collection up to date with one listing plus the changed objects.
+        
+        Unchanged records stay cached, deleted ones are dropped and only new or
+        changed records are downloaded. Returns counts of each.
+        """
+        listed = self._list_blob_stats(prefix)
+        counts = self._reconcile_cache(prefix, listed)
+        stale = [path for path in listed if self._is_record_file(path) and self.cache.generation(path) is None]
+        _, failures = self._load_many(stale)
+        counts.update(listed=len(listed), fetched=len(stale) - len(failures), failed=len(failures))
+        logger.info("Refreshed %s: %s", prefix, counts)
+        return counts
+    
+    def _mutate_json(self, path: str, mutate) -> Optional[Dict]:
+        """Read-modify-write a JSON object guarded by a generation precondition.
+        
+        ``mutate`` receives the current data (None if the object is missing) and
+        returns the new data, or None to leave the object untouched. The write is
+        retried when another writer changed the object in between.
+        """
+        for _ in range(MAX_WRITE_RETRIES):
+            data, generation = self._load_json_with_generation(path)
+            new_data = mutate(data)
+            if new_data is None:
+                return data
+            try:
+                self._save_json(path, new_data, if_generation_match=generation)
+                return new_data
+            except PreconditionFailed:
+                logger.info("Concurrent update of %s, retrying", path)
+        raise RuntimeError(f"Could not update {path} after {MAX_WRITE_RETRIES} attempts")
     
     def _delete_file(self, path: str):
         """Delete a file from cloud storage."""
+        return self._delete_file_status(path) == 'deleted'
+    
+    def _delete_file_status(self, path: str) -> str:
+        """Delete a file; returns 'deleted', 'missing' (it was already gone) or 'failed'."""
+        self.cache.invalidate(path)
+        self._forget_request_object(path)
         try:
-            blob = self._get_blob(path)
-            if blob.exists():
-                blob.delete()
-                return True
+            with metrics.timed('delete', path):
+                self._get_blob(path).delete()
+            self._remember_request_object(path, None)
+            return 'deleted'
+        except NotFound:
+            logger.info("File %s does not exist", path)
+            self._remember_request_object(path, None)
+            return 'missing'
+        except Exception as e:
+            logger.error("Error deleting file %s: %s", path, e)
+            return 'failed'
+    
+    # Request-scoped Identity Map
+    def _request_objects(self) -> Optional[Dict[str, Optional[Dict]]]:
+        """Get the objects the current web request has read or written, by path (None outside requests).
+        
+        Kept on ``flask.g``, so it lives exactly as long as the request and is
+        shared with the fetch pool tasks it starts.
+        """
+        if not has_request_context():
+            return None
+        return g.setdefault('storage_objects', {}).setdefault(self.bucket_name, {})
+    
+    def _remember_request_object(self, path: str, data: Optional[Dict]):
+        """Record what the current request now knows an object holds (None: missing)."""
+        objects = self._request_objects()
+        if objects is not None:
+            objects[path] = data
+    
+    def _forget_request_object(self, path: str):
+        """Make the current request read an object from storage again."""
+        objects = self._request_objects()
+        if objects is not None:
+            objects.pop(path, None)
+    
+    def http_pool_stats(self) -> Dict[str, Any]:
+        """Get the shared HTTP pool's size, in-flight peak, saturation and connection counters."""
+        return http_pool_stats()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters for the in-process JSON cache."""
+        return self.cache.stats()
+    
+    def metrics_text(self) -> str:
+        """Render storage operation metrics plus cache and HTTP pool gauges in Prometheus text format."""
+        cache = self.cache.stats()
+        gauges = {
+            'storage_cache_events_total': {
+                'help': 'In-process JSON cache events since start.',
+                'type': 'counter',
+                'values': {f'event="{name}"': cache[name] for name in
+                           ('hits', 'misses', 'evictions', 'expirations', 'invalidations', 'revalidations', 'not_modified',
+                            'confirmed')}
+            },
+            'storage_cache_bytes': {'help': 'Bytes held by the JSON cache.', 'values': {'': cache['bytes']}},
+            'storage_cache_entries': {'help': 'Entries held by the JSON cache.', 'values': {'': cache['entries']}},
+        }
+        pool = http_pool_stats()
+        if pool:
+            gauges['storage_http_pool'] = {
+                'help': 'Shared storage HTTP pool size and usage.',
+                'values': {f'stat="{name}"': value for name, value in pool.items()}
+            }
+        return metrics.render(gauges)
+    
+    def delete_many(self, paths: List[str]) -> Dict[str, bool]:
+        """Delete many files concurrently.
+        
+        Returns a per-path result: True if deleted, False if missing or failed.
+        """
+        return {path: status == 'deleted' for path, status in self._delete_many_statuses(paths).items()}
+    
+    def _delete_many_statuses(self, paths: List[str]) -> Dict[str, str]:
+        """Delete many files concurrently; returns 'deleted', 'missing' or 'failed' per path.
+        
+        Each delete is its own request on the shared fetch pool, so every path
+        gets its own outcome. The GCS batch endpoint only reports per-request
+        results through the client library's private state.
+        """
+        executor = get_fetch_executor()
+        futures = [executor.submit(contextvars.copy_context().run, self._delete_file_status, path) for path in paths]
+        return {path: future.result() for path, future in zip(paths, futures)}
+    
+    def save_many(self, items: Dict[str, Dict]) -> Dict[str, bool]:
+        """Save many JSON objects concurrently and return a per-path success flag.
+        
+        The GCS batch endpoint does not accept media uploads, so writes are
+        spread over the shared fetch pool instead.
+        """
+        paths = list(items)
+        executor = get_fetch_executor()
+        futures = [executor.submit(contextvars.copy_context().run, self._save_json, path, items[path]) for path in paths]
+        results = {}
+        for path, future in zip(paths, futures):
+            try:
+                future.result()
+                results[path] = True
+            except Exception as e:
+                logger.error("Error saving file %s: %s", path, e)
+                results[path] = False
+        return results
+    
+    # Collection Versions
+    def _collection_prefix(self, path: str) -> Optional[str]:
+        """Get the versioned collection a path belongs to, if any."""
+        prefix = path.split('/', 1)[0] + '/'
+        return prefix if prefix in VERSIONED_COLLECTIONS else None
+    
+    def _version_path(self, prefix: str) -> str:
+        """Get the version stamp path for a collection prefix."""
+        return f"{VERSION_PREFIX}{prefix.rstrip('/')}.json"
+    
+    def _bump_collection_version(self, prefix: str):
+        """Rewrite a collection's version stamp so other instances drop their cached copies.
+        
+        This instance's own view is not advanced: another instance may have
+        written in between, so the next check reloads here as well.
+        """
+        try:
+            version = self._save_json(self._version_path(prefix), {'updated_at': datetime.utcnow().isoformat()})
+        except Exception as e:
+            logger.error("Error bumping version for %s: %s", prefix, e)
+            return
+        if version is not None:
+            tokens = self._pending_write_tokens()
+            tokens[prefix] = max(version, tokens.get(prefix, 0))
+    
+    def _check_collection_version(self, prefix: str, force: bool = False):
+        """Drop cached objects of a collection if its version stamp changed since we last looked.
+        
+        Costs one metadata GET, at most once per VERSION_CHECK_INTERVAL per
+        collection unless ``force`` is set.
+        """
+        now = time.monotonic()
+        if not force and now - self._version_checked_at.get(prefix, float('-inf')) < VERSION_CHECK_INTERVAL:
+            return
+        self._version_checked_at[prefix] = now
+        try:
+            with metrics.timed('stat', VERSION_PREFIX):
+                stamp = self.bucket.get_blob(self._version_path(prefix))
+        except Exception as e:
+            logger.error("Error checking version for %s: %s", prefix, e)
+            return
+        version = self._blob_generation(stamp) if stamp else 0
+        if self._known_versions.get(prefix) != version:
+            if prefix in self._known_versions:
+                self._drop_changed(prefix)
+            self._known_versions[prefix] = version
+    
+    def _drop_changed(self, prefix: str):
+        """Drop the cached objects of a collection another instance changed.
+        
+        With DELTA_REFRESH one projected listing tells which objects changed;
+        otherwise (or if the listing fails) the whole collection is dropped.
+        """
+        if not DELTA_REFRESH or not self.cache.generations(prefix):
+            self.cache.invalidate_prefix(prefix)
+            return
+        try:
+            self._reconcile_cache(prefix, self._list_blob_stats(prefix))
+        except Exception as e:
+            logger.error("Error listing %s for a delta refresh: %s", prefix, e)
+            self.cache.invalidate_prefix(prefix)
+    
+    def collection_versions(self) -> Dict[str, int]:
+        """Get the collection versions this instance's cache currently reflects."""
+        return dict(self._known_versions)
+    
+    def _pending_write_tokens(self) -> Dict[str, int]:
+        """Get the write tokens recorded on the current thread."""
+        if not hasattr(self._write_tokens, 'versions'):
+            self._write_tokens.versions = {}
+        return self._write_tokens.versions
+    
+    def pop_write_tokens(self) -> Dict[str, int]:
+        """Return and clear the collection versions written on the current thread.
+        
+        The web app stores these in the writer's session so its next requests,
+        on any instance, can demand at least that version via ``require_versions``.
+        """
+        tokens = self._pending_write_tokens()
+        self._write_tokens.versions = {}
+        return tokens
+    
+    def require_versions(self, tokens: Dict[str, int]):
+        """Make sure reads reflect at least the given collection versions (read-your-writes).
+        
+        Collections this instance has not yet seen at the required version are
+        rechecked immediately, bypassing the check interval.
+        """
+        for prefix, version in tokens.items():
+            if prefix in VERSIONED_COLLECTIONS and self._known_versions.get(prefix, 0) < version:
+                self._check_collection_version(prefix, force=True)
+    
+    # Collection Manifests
+    def _manifest_path(self, prefix: str) -> str:
+        """Get the manifest path for a collection prefix."""
+        return f'{prefix}{MANIFEST_NAME}'
+    
+    def _put_record(self, prefix: str, record: Dict):
+        """Save a record and keep its collection manifest (or journal) up to date."""
+        if self._uses_journal(prefix):
+            self._append_journal(prefix, [{'op': 'put', 'id': record['id'], 'record': record}])
+        else:
+            self._save_json(f"{prefix}{record['id']}.json", record)
+            if prefix in MANIFEST_COLLECTIONS:
+                self._update_manifest(prefix, {record['id']: record})
+        self._update_indexes(prefix, {record['id']: record})
+        self._bump_collection_version(prefix)
+    
+    def _remove_record(self, prefix: str, record_id: str) -> bool:
+        """Delete a record and drop it from its collection manifest (or journal)."""
+        if self._uses_journal(prefix):
+            delete_result = record_id in self._load_journal_state(prefix)
+            if delete_result:
+                self._append_journal(prefix, [{'op': 'delete', 'id': record_id}])
             else:
-                print(f"File {path} does not exist")
+                logger.info("Record %s%s does not exist", prefix, record_id)
+        else:
+            status = self._delete_file_status(f'{prefix}{record_id}.json')
+            delete_result = status == 'deleted'
+            if status == 'failed':
+                # The record is still stored, so it stays listed and indexed
                 return False
+            if prefix in MANIFEST_COLLECTIONS:
+                self._update_manifest(prefix, {record_id: None})
+        self._update_indexes(prefix, {record_id: None})
+        self._bump_collection_version(prefix)
+        return delete_result
+    
+    def _put_records(self, prefix: str, records: List[Dict]) -> Dict[str, bool]:
+        """Save many records with one manifest update (or journal entry) and one version bump."""
+        if self._uses_journal(prefix):
+            if records:
+                self._append_journal(prefix, [{'op': 'put', 'id': record['id'], 'record': record} for record in records])
+                self._update_indexes(prefix, {record['id']: record for record in records})
+                self._bump_collection_version(prefix)
+            return {record['id']: True for record in records}
+        
+        results = self.save_many({f"{prefix}{record['id']}.json": record for record in records})
+        saved = {record['id']: record for record in records if results[f"{prefix}{record['id']}.json"]}
+        if saved and prefix in MANIFEST_COLLECTIONS:
+            self._update_manifest(prefix, saved)
+        if saved:
+            self._update_indexes(prefix, saved)
+            self._bump_collection_version(prefix)
+        return {record['id']: results[f"{prefix}{record['id']}.json"] for record in records}
+    
+    def _remove_records(self, prefix: str, record_ids: List[str]) -> Dict[str, bool]:
+        """Delete many records with concurrent deletes (or one journal entry) and one version bump."""
+        if self._uses_journal(prefix):
+            state = self._load_journal_state(prefix)
+            results = {record_id: record_id in state for record_id in record_ids}
+            existing = [record_id for record_id in record_ids if results[record_id]]
+            if existing:
+                self._append_journal(prefix, [{'op': 'delete', 'id': record_id} for record_id in existing])
+                self._update_indexes(prefix, {record_id: None for record_id in existing})
+                self._bump_collection_version(prefix)
+            return results
+        
+        statuses = self._delete_many_statuses([f'{prefix}{record_id}.json' for record_id in record_ids])
+        # Records whose delete failed are still stored, so they stay listed and indexed
+        gone = {record_id: None for record_id in record_ids if statuses[f'{prefix}{record_id}.json'] != 'failed'}
+        if gone and prefix in MANIFEST_COLLECTIONS:
+            self._update_manifest(prefix, gone)
+        if gone:
+            self._update_indexes(prefix, gone)
+            self._bump_collection_version(prefix)
+        return {record_id: statuses[f'{prefix}{record_id}.json'] == 'deleted' for record_id in record_ids}
+    
+    def _get_record(self, prefix: str, record_id: str) -> Optional[Dict]:
+        """Load one record of a collection by id."""
+        if self._uses_journal(prefix):
+            return self._load_journal_state(prefix).get(record_id)
+        return self._load_json(f'{prefix}{record_id}.json')
+    
+    def _get_records(self, prefix: str, record_ids: List[str]) -> List[Optional[Dict]]:
+        """Load several records of a collection by id, in order (None where missing)."""
+        if self._uses_journal(prefix):
+            state = self._load_journal_state(prefix)
+            return [state.get(record_id) for record_id in record_ids]
+        records, _ = self._load_many([f'{prefix}{record_id}.json' for record_id in record_ids])
+        return records
+    
+    def _update_manifest(self, prefix: str, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes (id -> record, or None to drop it) to a collection manifest.
+        
+        A missing manifest is left alone: the next listing rebuilds it from the
+        record files, which already include this change. Failures are reported
+        but never fail the record write; ``rebuild_manifest`` repairs any drift.
+        """
+        def mutate(manifest):
+            if manifest is None:
+                return None
+            for record_id, record in changes.items():
+                if record is None:
+                    manifest['items'].pop(record_id, None)
+                else:
+                    manifest['items'][record_id] = record
+            manifest['updated_at'] = datetime.utcnow().isoformat()
+            return manifest
+        
+        try:
+            self._mutate_json(self._manifest_path(prefix), mutate)
         except Exception as e:
-            print(f"Error deleting file {path}: {str(e)}")
-            return False
+            logger.error("Error updating manifest for %s: %s", prefix, e)
+        if prefix in SUMMARY_FIELDS:
+            self._update_summaries(prefix, changes)
+    
+    def rebuild_manifest(self, prefix: str) -> Dict:
+        """Rebuild a collection manifest from the individual record files.
+        
+        If some records cannot be read, the partial manifest is returned with a
+        ``failures`` mapping and is not saved.
+        """
+        manifest_path = self._manifest_path(prefix)
+        for _ in range(MAX_WRITE_RETRIES):
+            # Remember the generation first so a write racing with the scan forces a retry
+            _, generation = self._load_json_with_generation(manifest_path)
+            items = {}
+            records, failures = self._load_many(self._list_record_files(prefix))
+            for record in records:
+                if record and 'id' in record:
+                    items[record['id']] = record
+            manifest = {
+                'prefix': prefix,
+                'items': items,
+                'updated_at': datetime.utcnow().isoformat()
+            }
+            if failures:
+                # Serve what loaded, but never persist a manifest that would hide records
+                logger.warning("Not saving manifest %s: %s records failed to load", manifest_path, len(failures))
+                manifest['failures'] = failures
+                return manifest
+            try:
+                self._save_json(manifest_path, manifest, if_generation_match=generation)
+                if prefix in SUMMARY_FIELDS:
+                    self._save_json(self._summary_path(prefix), self._build_summaries(prefix, items))
+                self._bump_collection_version(prefix)
+                logger.info("Rebuilt manifest %s with %s records", manifest_path, len(items))
+                return manifest
+            except PreconditionFailed:
+                logger.info("Manifest %s changed during rebuild, retrying", manifest_path)
+        raise RuntimeError(f"Could not rebuild {manifest_path} after {MAX_WRITE_RETRIES} attempts")
+    
+    def rebuild_all_manifests(self) -> Dict[str, int]:
+        """Rebuild every collection manifest and return the record count per prefix."""
+        return {prefix: len(self.rebuild_manifest(prefix)['items']) for prefix in MANIFEST_COLLECTIONS}
+    
+    def _load_collection(self, prefix: str) -> List[Dict]:
+        """Load every record of a collection with a single manifest read (or journal replay)."""
+        if self._uses_journal(prefix):
+            return list(self._load_journal_state(prefix).values())
+        manifest = self._load_json(self._manifest_path(prefix))
+        if manifest is None:
+            manifest = self.rebuild_manifest(prefix)
+        return list(manifest['items'].values())
+    
+    # Summaries
+    def _summary_path(self, prefix: str) -> str:
+        """Get the summary document path for a collection prefix."""
+        return f'{prefix}{SUMMARY_NAME}'
+    
+    def _summarize(self, prefix: str, record: Dict) -> Dict:
+        """Reduce a record to the fields its listing card shows."""
+        summary = {field: record[field] for field in SUMMARY_FIELDS[prefix] if field in record}
+        description = summary.get('description')
+        if description and len(description) > SUMMARY_DESCRIPTION_CHARS:
+            summary['description'] = description[:SUMMARY_DESCRIPTION_CHARS].rstrip() + '…'
+            summary['description_truncated'] = True
+        return summary
+    
+    def _build_summaries(self, prefix: str, items: Dict[str, Dict]) -> Dict:
+        """Build a collection's summary document from its records."""
+        return {
+            'prefix': prefix,
+            'items': {record_id: self._summarize(prefix, record) for record_id, record in items.items()},
+            'updated_at': datetime.utcnow().isoformat()
+        }
+    
+    def _update_summaries(self, prefix: str, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes to a collection's summary document (left alone while missing)."""
+        def mutate(summaries):
+            if summaries is None:
+                return None
+            for record_id, record in changes.items():
+                if record is None:
+                    summaries['items'].pop(record_id, None)
+                else:
+                    summaries['items'][record_id] = self._summarize(prefix, record)
+            summaries['updated_at'] = datetime.utcnow().isoformat()
+            return summaries
+        
+        try:
+            self._mutate_json(self._summary_path(prefix), mutate)
+        except Exception as e:
+            logger.error("Error updating summaries for %s: %s", prefix, e)
+    
+    def _load_summaries(self, prefix: str) -> List[Dict]:
+        """Load the card fields of every record in a collection from its summary document."""
+        if self._uses_journal(prefix):
+            return [self._summarize(prefix, record) for record in self._load_journal_state(prefix).values()]
+        summaries = self._load_json(self._summary_path(prefix))
+        if summaries is None:
+            items = {record['id']: record for record in self._load_collection(prefix)}
+            summaries = self._build_summaries(prefix, items)
+            try:
+                self._save_json(self._summary_path(prefix), summaries, if_generation_match=0)
+            except PreconditionFailed:
+                pass  # Another instance created it first
+        return list(summaries['items'].values())
+    
+    # Pagination
+    def _paginate(self, records: List[Dict], sort_field: str, limit: int = None,
+                  cursor: str = None, page: int = None) -> Dict[str, Any]:
+        """Slice records sorted newest first by (sort_field, id) into one page.
+        
+        A cursor resumes right after the last record of the previous page, so
+        records created in between do not shift later pages; ``page`` (1-based)
+        is offered for numbered links. Returns the page items, the cursor of the
+        next page (None on the last page), the page number and the total count.
+        """
+        limit = max(1, min(limit or PAGE_SIZE, MAX_PAGE_SIZE))
+        numeric = sort_field in NUMERIC_SORT_FIELDS
+        missing = 0 if numeric else ''
+        
+        def sort_key(record):
+            value = record.get(sort_field)
+            return (missing if value is None else value, record.get('id', ''))
+        
+        ordered = sorted(records, key=sort_key, reverse=True)
+        
+        if cursor:
+            position = decode_cursor(cursor, (int, float) if numeric else str)
+            start = next((index for index, record in enumerate(ordered) if sort_key(record) < position), len(ordered))
+            page = None
+        else:
+            page = max(1, page or 1)
+            start = (page - 1) * limit
+        
+        items = ordered[start:start + limit]
+        next_cursor = None
+        if start + limit < len(ordered) and items:
+            last = items[-1]
+            next_cursor = encode_cursor(sort_key(last)[0], last.get('id', ''))
+        return {'items': items, 'next_cursor': next_cursor, 'page': page, 'limit': limit, 'total': len(ordered)}
+    
+    # Stored Indexes (search, facets, suggestions, geometry)
+    def _update_indexes(self, prefix: str, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes (id -> record, or None to drop it) to the stored indexes a collection feeds."""
+        if prefix in SEARCH_COLLECTIONS:
+            self._update_index(SEARCH_INDEX_PATH, SearchIndex.from_dict, lambda index: index.apply(prefix, changes))
+        if prefix == FACET_COLLECTION:
+            self._update_index(FACET_INDEX_PATH, FacetIndex.from_dict, lambda index: index.apply(changes))
+        if prefix in SUGGEST_COLLECTIONS:
+            self._update_index(SUGGEST_INDEX_PATH, SuggestIndex.from_dict, lambda index: index.apply(prefix, changes))
+        if prefix == GEO_COLLECTION:
+            self._update_index(GEO_INDEX_PATH, SpatialIndex.from_dict, lambda index: index.apply(changes))
+    
+    def _update_index(self, path: str, load, apply):
+        """Read-modify-write one stored index.
+        
+        Like manifests, a missing index is left alone (the next read builds it)
+        and failures never fail the record write; the rebuild_* methods repair
+        any drift.
+        """
+        updated = []
+        
+        def mutate(data):
+            if data is None:
+                return None
+            index = load(data)
+            apply(index)
+            updated.append(index)
+            return index.to_dict()
+        
+        try:
+            self._mutate_json(path, mutate)
+        except Exception as e:
+            logger.error("Error updating index %s: %s", path, e)
+            return
+        if updated:
+            # Serve our own write right away; other instances reload when they see the new version
+            versions = self._indexes.get(path, (None, None))[0]
+            self._indexes[path] = (versions, updated[-1])
+    
+    def _load_index(self, path: str, prefixes: List[str], load, rebuild):
+        """Get a stored index, reloading it only after one of the collections it covers changed."""
+        for prefix in prefixes:
+            self._check_collection_version(prefix)
+        versions = tuple(self._known_versions.get(prefix) for prefix in prefixes)
+        cached = self._indexes.get(path)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        # Read past the JSON cache: the built index is kept here instead
+        data, _ = self._load_json_with_generation(path)
+        index = load(data) if data is not None else rebuild()
+        self._indexes[path] = (versions, index)
+        return index
+    
+    def rebuild_search_index(self) -> SearchIndex:
+        """Rebuild the search index from every searchable collection and save it."""
+        index = SearchIndex()
+        for prefix in SEARCH_COLLECTIONS:
+            for record in self._load_collection(prefix):
+                if 'id' in record:
+                    index.add(prefix, record)
+        self._save_json(SEARCH_INDEX_PATH, index.to_dict())
+        logger.info("Rebuilt search index: %s", index.stats())
+        return index
+    
+    def _load_search_index(self) -> SearchIndex:
+        """Get the site search index."""
+        return self._load_index(SEARCH_INDEX_PATH, SEARCH_COLLECTIONS, SearchIndex.from_dict, self.rebuild_search_index)
+    
+    def rebuild_facet_index(self) -> FacetIndex:
+        """Rebuild the project facet index from the project records and save it."""
+        index = FacetIndex()
+        for record in self._load_collection(FACET_COLLECTION):
+            if 'id' in record:
+                index.add(record)
+        self._save_json(FACET_INDEX_PATH, index.to_dict())
+        logger.info("Rebuilt facet index with %d projects", len(index.docs))
+        return index
+    
+    def _load_facet_index(self) -> FacetIndex:
+        """Get the project facet index."""
+        return self._load_index(FACET_INDEX_PATH, [FACET_COLLECTION], FacetIndex.from_dict, self.rebuild_facet_index)
+    
+    def rebuild_suggest_index(self) -> SuggestIndex:
+        """Rebuild the typeahead index from the project and team member records and save it."""
+        index = SuggestIndex()
+        for prefix in SUGGEST_COLLECTIONS:
+            for record in self._load_collection(prefix):
+                if 'id' in record:
+                    index.add(prefix, record)
+        self._save_json(SUGGEST_INDEX_PATH, index.to_dict())
+        logger.info("Rebuilt suggest index: %s", index.stats())
+        return index
+    
+    def _load_suggest_index(self) -> SuggestIndex:
+        """Get the typeahead index."""
+        return self._load_index(SUGGEST_INDEX_PATH, SUGGEST_COLLECTIONS, SuggestIndex.from_dict, self.rebuild_suggest_index)
+    
+    def suggest(self, query: str, limit: int = None, kinds: List[str] = None) -> List[Dict]:
+        """Get typeahead suggestions for a partly typed query, newest and most used first.
+        
+        ``kinds`` limits them to 'project', 'tag', 'creator' or 'team_member'
+        phrases; an unknown kind raises ValueError.
+        """
+        known = {kind for fields in SUGGEST_FIELDS.values() for kind in fields.values()}
+        unknown = [kind for kind in (kinds or []) if kind not in known]
+        if unknown:
+            raise ValueError(f'Unknown suggestion kinds: {unknown}')
+        return self._load_suggest_index().suggest(query or '', limit, kinds)
+    
+    def rebuild_geo_index(self) -> SpatialIndex:
+        """Rebuild the project spatial index from the project records and save it."""
+        index = SpatialIndex()
+        for record in self._load_collection(GEO_COLLECTION):
+            if 'id' in record:
+                index.add(record)
+        self._save_json(GEO_INDEX_PATH, index.to_dict())
+        logger.info("Rebuilt geo index with %d placed projects", len(index.docs))
+        return index
+    
+    def _load_geo_index(self) -> SpatialIndex:
+        """Get the project spatial index."""
+        return self._load_index(GEO_INDEX_PATH, [GEO_COLLECTION], SpatialIndex.from_dict, self.rebuild_geo_index)
+    
+    def projects_near(self, lat: float, lon: float, radius_km: float, limit: int = None) -> Dict[str, Any]:
+        """Get the active projects within ``radius_km`` of a point, nearest first.
+        
+        Returns at most ``limit`` items plus the total within the radius;
+        coordinates out of range or a radius above MAX_RADIUS_KM raise ValueError.
+        """
+        location = check_location({'lat': lat, 'lon': lon})
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValueError(f'Radius must be between 0 and {MAX_RADIUS_KM:g} km')
+        limit = max(1, min(limit or DEFAULT_NEAR_RESULTS, MAX_NEAR_RESULTS))
+        hits = self._load_geo_index().near(location['lat'], location['lon'], radius_km)
+        return {'items': hits[:limit], 'limit': limit, 'total': len(hits)}
+    
+    def projects_in_bbox(self, bbox: List[float], limit: int = None, cursor: str = None,
+                         page: int = None) -> Dict[str, Any]:
+        """Get one page of the active projects whose point or extent intersects a box, newest first.
+        
+        ``bbox`` is [west, south, east, north] in degrees (west > east crosses
+        the antimeridian); an invalid box raises ValueError.
+        """
+        bbox = check_extent(bbox)
+        if bbox is None:
+            raise ValueError('A bounding box is required')
+        return self._paginate(self._load_geo_index().within(*bbox), 'created_at', limit, cursor, page)
+    
+    def _load_cluster_index(self) -> ClusterIndex:
+        """Get the globe clusters, rebuilt only when the geo index changed.
+        
+        Every project write (here or on another instance) replaces the loaded
+        geo index, so keying the clusters by it invalidates them on writes.
+        """
+        geo_index = self._load_geo_index()
+        cached = self._clusters
+        if cached is not None and cached[0] is geo_index:
+            return cached[1]
+        clusters = ClusterIndex(list(geo_index.docs.values()))
+        self._clusters = (geo_index, clusters)
+        logger.debug("Clustered %s", clusters.stats())
+        return clusters
+    
+    def project_clusters(self, zoom: int, bbox: List[float] = None) -> Dict[str, Any]:
+        """Get geotagged projects clustered for a zoom level, as a GeoJSON FeatureCollection.
+        
+        ``zoom`` is clamped to the levels served and returned as used. ``bbox``
+        ([west, south, east, north], default the whole world) limits the
+        features to those inside it; an invalid box raises ValueError.
+        """
+        zoom = clamp_zoom(zoom)
+        bbox = check_extent(bbox) or [-180.0, -90.0, 180.0, 90.0]
+        features = self._load_cluster_index().clusters(bbox, zoom)
+        return {'type': 'FeatureCollection', 'features': features, 'zoom': zoom, 'bbox': bbox}
+    
+    def _check_facet_filters(self, filters: Dict[str, List[str]] = None) -> Dict[str, List[str]]:
+        """Drop empty facet filters; raises ValueError for an unknown facet."""
+        unknown = [facet for facet in (filters or {}) if facet not in FACETS]
+        if unknown:
+            raise ValueError(f'Unknown project facets: {unknown}')
+        return {facet: values for facet, values in (filters or {}).items() if values}
+    
+    def _search_project_ids(self, query: str = None) -> Optional[set]:
+        """Get the ids of projects matching a search query (None without a query)."""
+        if not query:
+            return None
+        return {hit['id'] for hit in self._load_search_index().search(query, [FACET_COLLECTION])}
+    
+    def _matching_project_ids(self, filters: Dict[str, List[str]] = None, query: str = None) -> Optional[set]:
+        """Get the ids of active projects matching facet filters and a search query (None: no filtering)."""
+        filters = self._check_facet_filters(filters)
+        if not filters and not query:
+            return None
+        ids = self._load_facet_index().match(filters)
+        searched = self._search_project_ids(query)
+        return ids if searched is None else ids & searched
+    
+    def project_facets(self, filters: Dict[str, List[str]] = None, query: str = None) -> Dict[str, Any]:
+        """Count active projects per type, collection, tag and month under the given filters.
+        
+        Each facet's counts apply every other facet's filter (and the query), so
+        they tell how many projects choosing that value would show.
+        """
+        filters = self._check_facet_filters(filters)
+        index = self._load_facet_index()
+        searched = self._search_project_ids(query)
+        matched = index.match(filters)
+        if searched is not None:
+            matched &= searched
+        return {'facets': index.counts(filters, searched), 'total': len(matched)}
+    
+    def search(self, query: str, types: List[str] = None, limit: int = None,
+               cursor: str = None, page: int = None) -> Dict[str, Any]:
+        """Search projects, gallery items and team members; one page of hits, best first.
+        
+        ``types`` limits the hits to some collections ('projects', 'gallery',
+        'team_members'); an unknown type raises ValueError.
+        """
+        collections = None
+        if types:
+            collections = [f"{name.strip().rstrip('/')}/" for name in types]
+            unknown = [name for name in collections if name not in SEARCH_COLLECTIONS]
+            if unknown:
+                raise ValueError(f'Unknown search types: {unknown}')
+        hits = self._load_search_index().search(query or '', collections)
+        return self._paginate(hits, 'score', limit, cursor, page)
+    
+    # Journal Storage Mode
+    def _uses_journal(self, prefix: str) -> bool:
+        """Check whether a collection is stored as snapshot + journal."""
+        return self.storage_mode == 'journal' and prefix in JOURNAL_COLLECTIONS
+    
+    def _snapshot_path(self, prefix: str) -> str:
+        """Get the snapshot path for a journal collection."""
+        return f'{prefix}{SNAPSHOT_NAME}'
+    
+    def _journal_prefix(self, prefix: str) -> str:
+        """Get the prefix holding a collection's journal entries."""
+        return f'{prefix}{JOURNAL_DIR}'
+    
+    def _state_cache_key(self, prefix: str) -> str:
+        """Get the cache key of a collection's replayed state (not a real object)."""
+        return f'{prefix}_state'
+    
+    def _append_journal(self, prefix: str, ops: List[Dict]):
+        """Append one journal entry holding create/update ('put') and 'delete' events.
+        
+        Entry names start with a nanosecond timestamp, which only orders the
+        replay of unfolded entries; which entries a snapshot already holds is
+        recorded by name (see compact_journal), never inferred from the clock.
+        """
+        entry_path = f"{self._journal_prefix(prefix)}{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.json"
+        try:
+            self._save_json(entry_path, {'ops': ops, 'at': datetime.utcnow().isoformat()})
+        finally:
+            self.cache.invalidate(self._state_cache_key(prefix))
+            self._forget_request_object(self._state_cache_key(prefix))
+    
+    def _apply_journal_ops(self, items: Dict[str, Dict], entry: Dict):
+        """Replay one journal entry onto a collection state."""
+        for op in entry.get('ops', []):
+            if op['op'] == 'put':
+                items[op['id']] = op['record']
+            elif op['op'] == 'delete':
+                items.pop(op['id'], None)
+    
+    def _load_journal_state(self, prefix: str) -> Dict[str, Dict]:
+        """Load a journal collection as id -> record: the snapshot plus every listed entry it has not folded."""
+        state_key = self._state_cache_key(prefix)
+        objects = self._request_objects()
+        if objects is not None and objects.get(state_key) is not None:
+            return objects[state_key]
+        self._check_collection_version(prefix)
+        cached = self.cache.get(state_key)
+        if cached is not None:
+            self._remember_request_object(state_key, cached)
+            return cached
+        
+        snapshot = self._load_json(self._snapshot_path(prefix))
+        if snapshot is None:
+            snapshot = self.migrate_to_journal(prefix)
+        # Replay onto a copy: the snapshot itself may be shared through the request's identity map
+        items = dict(snapshot['items'])
+        # List the whole journal: an entry uploaded late can sort before ones already folded
+        listed = self._list_files(self._journal_prefix(prefix))
+        folded = set(snapshot['folded'])
+        entry_paths = [path for path in listed if path not in folded]
+        entries, failures = self._load_many(entry_paths)
+        for entry in entries:
+            if entry:
+                self._apply_journal_ops(items, entry)
+        
+        if failures:
+            logger.warning("Replayed %s without %s unreadable journal entries; not caching it", prefix, len(failures))
+        else:
+            self.cache.put(state_key, items, len(json.dumps(items, default=str)))
+        
+        if len(entry_paths) >= JOURNAL_COMPACT_THRESHOLD:
+            try:
+                self.compact_journal(prefix)
+            except Exception as e:
+                logger.error("Error compacting journal for %s: %s", prefix, e)
+        self._remember_request_object(state_key, items)
+        return items
+    
+    def compact_journal(self, prefix: str) -> int:
+        """Fold every unfolded journal entry into a new snapshot and return the number folded.
+        
+        The snapshot records the names of the entries it holds. Only entries
+        the previous snapshot already held are deleted now; this round's are
+        kept until the next one, so a reader still holding the old snapshot can
+        replay them. An entry no snapshot has folded is never deleted.
+        """
+        snapshot_path = self._snapshot_path(prefix)
+        snapshot, generation = self._load_json_with_generation(snapshot_path)
+        if snapshot is None:
+            logger.warning("No snapshot for %s; run migrate_to_journal.py first", prefix)
+            return 0
+        listed = self._list_files(self._journal_prefix(prefix))
+        folded, previous_folded = set(snapshot['folded']), set(snapshot['previous_folded'])
+        entry_paths = [path for path in listed if path not in folded]
+        if not entry_paths:
+            return 0
+        
+        entries, failures = self._load_many(entry_paths)
+        if failures:
+            logger.warning("Not compacting %s: %s journal entries failed to load", prefix, len(failures))
+            return 0
+        items = snapshot['items']
+        for entry in entries:
+            if entry:
+                self._apply_journal_ops(items, entry)
+        
+        # Names of entries already deleted drop out; ones whose delete failed stay folded and are retried
+        still_listed = set(listed)
+        new_snapshot = {
+            'prefix': prefix,
+            'items': items,
+            'folded': sorted((folded & still_listed) | set(entry_paths)),
+            'previous_folded': sorted(folded & still_listed),
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        try:
+            self._save_json(snapshot_path, new_snapshot, if_generation_match=generation)
+        except PreconditionFailed:
+            logger.info("Journal for %s was compacted concurrently", prefix)
+            return 0
+        
+        expired = sorted(previous_folded & still_listed)
+        if expired:
+            self.delete_many(expired)
+        logger.info("Compacted %s journal entries into %s", len(entry_paths), snapshot_path)
+        return len(entry_paths)
+    
+    def migrate_to_journal(self, prefix: str) -> Dict:
+        """Create a collection's snapshot from its per-record files (if it has none yet)."""
+        items = {}
+        records, failures = self._load_many(self._list_record_files(prefix))
+        if failures:
+            raise RuntimeError(f"Could not load {len(failures)} records under {prefix}")
+        for record in records:
+            if record and 'id' in record:
+                items[record['id']] = record
+        snapshot = {
+            'prefix': prefix,
+            'items': items,
+            'folded': [],
+            'previous_folded': [],
+            'updated_at': datetime.utcnow().isoformat()
+        }
+        try:
+            self._save_json(self._snapshot_path(prefix), snapshot, if_generation_match=0)
+            logger.info("Created snapshot for %s with %s records", prefix, len(items))
+            return snapshot
+        except PreconditionFailed:
+            # Another instance migrated first; use its snapshot
+            return self._load_json(self._snapshot_path(prefix))
+    
+    def export_journal_to_records(self, prefix: str) -> int:
+        """Write a journal collection back to per-record files and rebuild its manifest (for leaving journal mode)."""
+        state = self._load_journal_state(prefix)
+        results = self.save_many({f'{prefix}{record_id}.json': record for record_id, record in state.items()})
+        failed = [path for path, saved in results.items() if not saved]
+        if failed:
+            raise RuntimeError(f"Could not write {len(failed)} records under {prefix}")
+        stale = [path for path in self._list_record_files(prefix) if path[len(prefix):-len('.json')] not in state]
+        if stale:
+            self.delete_many(stale)
+        self.rebuild_manifest(prefix)
+        return len(state)
     
     # User Management
+    def _normalize_username(self, username: str) -> str:
+        """Normalize a username for index lookups."""
+        return (username or '').strip().lower()
+    
+    def _normalize_email(self, email: str) -> str:
+        """Normalize an email address for index lookups."""
+        return (email or '').strip().lower()
+    
+    def _username_index_path(self, username: str) -> str:
+        """Get the index object path for a username."""
+        return f"{USERNAME_INDEX_PREFIX}{quote(self._normalize_username(username), safe='')}.json"
+    
+    def _email_index_path(self, email: str) -> str:
+        """Get the index object path for an email (hashed so addresses never appear in object names)."""
+        digest = hashlib.sha256(self._normalize_email(email).encode('utf-8')).hexdigest()
+        return f'{EMAIL_INDEX_PREFIX}{digest}.json'
+    
+    def _claim_user_index(self, path: str, user_id: str) -> bool:
+        """Create an index entry only if none exists yet; return False if it is taken."""
+        try:
+            self._save_json(path, {'user_id': user_id}, if_generation_match=0)
+            return True
+        except PreconditionFailed:
+            return False
+    
+    def _user_indexes_ready(self) -> bool:
+        """Check whether the user indexes have been backfilled for this bucket."""
+        if not self._user_indexes_backfilled:
+            with metrics.timed('exists', USER_INDEX_MARKER):
+                self._user_indexes_backfilled = self._get_blob(USER_INDEX_MARKER).exists()
+        return self._user_indexes_backfilled
+    
+    def _find_user(self, field: str, value: str, index_path: str) -> Optional[Dict]:
+        """Find a user by a normalized field via its index, scanning only if indexes are not backfilled."""
+        normalize = self._normalize_email if field == 'email' else self._normalize_username
+        wanted = normalize(value)
+        if not wanted:
+            return None
+        
+        if self._user_indexes_ready():
+            entry = self._load_json(index_path)
+            if not entry:
+                return None
+            user_data = self.get_user_by_id(entry['user_id'])
+            # Guard against index entries left behind by deleted or changed users
+            if user_data and normalize(user_data.get(field)) == wanted:
+                return user_data
+            return None
+        
+        logger.info("User indexes not backfilled yet, scanning users/ for %s", field)
+        for user_data in self.get_all_users():
+            if normalize(user_data.get(field)) == wanted:
+                return user_data
+        return None
+    
     def create_user(self, username: str, email: str, password: str, first_name: str = None, last_name: str = None) -> Dict:
         """Create a new user."""
         user_id = str(uuid.uuid4())
@@ -107,30 +1370,64 @@ class CloudStorageManager:
         if self.get_user_by_email(email):
             raise ValueError('Email already exists')
         
-        self._save_json(f'users/{user_id}.json', user_data)
+        # Claim the index entries first so concurrent registrations cannot both succeed
+        username_index = self._username_index_path(username)
+        email_index = self._email_index_path(email)
+        if not self._claim_user_index(username_index, user_id):
+            raise ValueError('Username already exists')
+        if not self._claim_user_index(email_index, user_id):
+            self._delete_file(username_index)
+            raise ValueError('Email already exists')
+        
+        try:
+            self._save_json(f'users/{user_id}.json', user_data)
+        except Exception:
+            self._delete_file(username_index)
+            self._delete_file(email_index)
+            raise
+        self._bump_collection_version('users/')
         return user_data
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """Get user by ID."""
         return self._load_json(f'users/{user_id}.json')
     
+    def get_users_by_ids(self, user_ids: List[str]) -> List[Optional[Dict]]:
+        """Get several users by ID in one concurrent fan-out (None where missing)."""
+        return self._get_records('users/', user_ids)
+    
     def get_user_by_username(self, username: str) -> Optional[Dict]:
-        """Get user by username."""
-        users = self._list_files('users/')
-        for user_file in users:
-            user_data = self._load_json(user_file)
-            if user_data and user_data.get('username') == username:
-                return user_data
-        return None
+        """Get user by username (case-insensitive)."""
+        return self._find_user('username', username, self._username_index_path(username))
     
     def get_user_by_email(self, email: str) -> Optional[Dict]:
-        """Get user by email."""
-        users = self._list_files('users/')
-        for user_file in users:
-            user_data = self._load_json(user_file)
-            if user_data and user_data.get('email') == email:
-                return user_data
-        return None
+        """Get user by email (case-insensitive)."""
+        return self._find_user('email', email, self._email_index_path(email))
+    
+    def backfill_user_indexes(self) -> Dict[str, int]:
+        """Write username/email index entries for every existing user, then mark the indexes ready."""
+        counts = {'users': 0, 'conflicts': 0}
+        users = sorted(self.get_all_users(), key=lambda x: x.get('created_at') or '')
+        claimed = {}
+        for user_data in users:
+            counts['users'] += 1
+            for path in (self._username_index_path(user_data.get('username')),
+                         self._email_index_path(user_data.get('email'))):
+                # The oldest account keeps a normalized name or address shared by several users
+                if path in claimed:
+                    logger.warning("Index conflict for user %s: %s already points to %s", user_data['id'], path, claimed[path])
+                    counts['conflicts'] += 1
+                    continue
+                claimed[path] = user_data['id']
+                self._save_json(path, {'user_id': user_data['id']})
+        
+        self._save_json(USER_INDEX_MARKER, {
+            'backfilled_at': datetime.utcnow().isoformat(),
+            'users': counts['users']
+        })
+        self._user_indexes_backfilled = True
+        self._bump_collection_version('users/')
+        return counts
     
     def update_user_login(self, user_id: str):
         """Update user's last login time."""
@@ -138,21 +1435,22 @@ class CloudStorageManager:
         if user_data:
             user_data['last_login'] = datetime.utcnow().isoformat()
             self._save_json(f'users/{user_id}.json', user_data)
+            self._bump_collection_version('users/')
     
     def get_all_users(self) -> List[Dict]:
         """Get all users."""
-        users = []
-        user_files = self._list_files('users/')
-        for user_file in user_files:
-            user_data = self._load_json(user_file)
-            if user_data:
-                users.append(user_data)
-        return users
+        user_data_list, failures = self._load_many(self._list_record_files('users/'))
+        if failures:
+            logger.warning("Skipped %s unreadable user files", len(failures))
+        return [user_data for user_data in user_data_list if user_data]
     
     # Project Management
     def create_project(self, title: str, creator_name: str, description: str, project_link: str, project_type: str, 
-                      tags: str, image_url: str, created_by: str) -> Dict:
-        """Create a new project."""
+                      tags: str, image_url: str, created_by: str, location: Dict[str, float] = None,
+                      extent: List[float] = None) -> Dict:
+        """Create a new project, optionally placed at a point ({'lat', 'lon'}) and/or an extent ([west, south, east, north])."""
+        location = check_location(location)
+        extent = check_extent(extent)
         project_id = str(uuid.uuid4())
         project_data = {
             'id': project_id,
@@ -168,75 +1466,94 @@ class CloudStorageManager:
             'created_by': created_by,
             'is_active': True
         }
+        if location:
+            project_data['location'] = location
+        if extent:
+            project_data['extent'] = extent
         
-        self._save_json(f'projects/{project_id}.json', project_data)
+        self._put_record('projects/', project_data)
         return project_data
     
     def get_project_by_id(self, project_id: str) -> Optional[Dict]:
         """Get project by ID."""
-        return self._load_json(f'projects/{project_id}.json')
+        return self._get_record('projects/', project_id)
     
     def get_all_projects(self) -> List[Dict]:
         """Get all active projects."""
         projects = []
-        project_files = self._list_files('projects/')
-        print(f"Found {len(project_files)} project files: {project_files}")
-        
-        for project_file in project_files:
-            project_data = self._load_json(project_file)
-            if project_data and project_data.get('is_active', True):
-                print(f"Loaded project from {project_file}: {project_data.get('title', 'Unknown')} - Image: {project_data.get('image_url', 'None')}")
+        log_items = logger.isEnabledFor(logging.DEBUG)
+        for project_data in self._load_collection('projects/'):
+            if project_data.get('is_active', True):
+                if log_items:
+                    logger.debug("Loaded project: %s - Image: %s", project_data.get('title', 'Unknown'), project_data.get('image_url', 'None'), extra=SAMPLED)
                 projects.append(project_data)
-            else:
-                print(f"Failed to load project from {project_file}")
         
-        print(f"Total projects loaded: {len(projects)}")
+        logger.debug("Total projects loaded: %d", len(projects))
         return sorted(projects, key=lambda x: x['created_at'], reverse=True)
     
-    def update_project(self, project_id: str, **kwargs) -> Optional[Dict]:
-        """Update a project."""
-        print(f"Updating project {project_id} with kwargs: {kwargs}")
+    def list_projects(self, limit: int = None, cursor: str = None, page: int = None,
+                      filters: Dict[str, List[str]] = None, query: str = None) -> Dict[str, Any]:
+        """Get one page of active project summaries, newest first (see get_project_by_id for full records).
         
+        ``filters`` maps facets ('type', 'collection', 'tag', 'month') to the
+        values to keep, and ``query`` keeps search matches only.
+        """
+        ids = self._matching_project_ids(filters, query)
+        projects = [project_data for project_data in self._load_summaries('projects/')
+                    if project_data.get('is_active', True) and (ids is None or project_data['id'] in ids)]
+        return self._paginate(projects, 'created_at', limit, cursor, page)
+    
+    def update_project(self, project_id: str, **kwargs) -> Optional[Dict]:
+        """Update a project; an empty ``location`` or ``extent`` removes it (invalid geometry raises ValueError)."""
+        for key, check in (('location', check_location), ('extent', check_extent)):
+            if kwargs.get(key) is not None:
+                kwargs[key] = check(kwargs[key]) or {}
         project_data = self.get_project_by_id(project_id)
         if not project_data:
-            print(f"Project {project_id} not found")
+            logger.info("Project %s not found", project_id)
             return None
         
-        print(f"Original project data: {project_data}")
-        
         # Update fields
+        changed = []
         for key, value in kwargs.items():
-            if value is not None:
+            if value is None:
+                continue
+            if key in GEOMETRY_FIELDS and not value:
+                project_data.pop(key, None)
+            else:
                 project_data[key] = value
-                print(f"Updated {key}: {value}")
+            changed.append(key)
         
         project_data['updated_at'] = datetime.utcnow().isoformat()
-        
-        print(f"Final project data: {project_data}")
+        logger.info("Updating project %s: %s", project_id, ', '.join(changed) or 'no fields')
         
         try:
-            self._save_json(f'projects/{project_id}.json', project_data)
-            print(f"Successfully saved project {project_id}")
+            self._put_record('projects/', project_data)
+            logger.info("Successfully saved project %s", project_id)
             return project_data
         except Exception as e:
-            print(f"Error saving project {project_id}: {str(e)}")
+            logger.error("Error saving project %s: %s", project_id, e)
             return None
     
     def delete_project(self, project_id: str):
         """Hard delete a project."""
         try:
             # Delete the file from cloud storage
-            delete_result = self._delete_file(f'projects/{project_id}.json')
+            delete_result = self._remove_record('projects/', project_id)
             if delete_result:
-                print(f"Successfully deleted project file: {project_id}")
+                logger.info("Successfully deleted project file: %s", project_id)
                 return True
             else:
-                print(f"Failed to delete project file: {project_id}")
+                logger.warning("Failed to delete project file: %s", project_id)
                 return False
         except Exception as e:
-            print(f"Error deleting project {project_id}: {str(e)}")
+            logger.error("Error deleting project %s: %s", project_id, e)
             return False
     
+    def delete_projects(self, project_ids: List[str]) -> Dict[str, bool]:
+        """Hard delete many projects; returns a per-id success flag."""
+        return self._remove_records('projects/', project_ids)
+    
     # Gallery Management
     def create_gallery_item(self, title: str, description: str, image_url: str, created_by: str) -> Dict:
         """Create a new gallery item."""
@@ -251,36 +1568,36 @@ class CloudStorageManager:
             'is_active': True
         }
         
-        self._save_json(f'gallery/{item_id}.json', item_data)
+        self._put_record('gallery/', item_data)
         return item_data
     
     def get_gallery_item_by_id(self, item_id: str) -> Optional[Dict]:
         """Get gallery item by ID."""
-        return self._load_json(f'gallery/{item_id}.json')
+        return self._get_record('gallery/', item_id)
     
     def get_all_gallery_items(self) -> List[Dict]:
         """Get all active gallery items."""
-        items = []
-        item_files = self._list_files('gallery/')
-        for item_file in item_files:
-            item_data = self._load_json(item_file)
-            if item_data and item_data.get('is_active', True):
-                items.append(item_data)
+        items = [item_data for item_data in self._load_collection('gallery/') if item_data.get('is_active', True)]
         return sorted(items, key=lambda x: x['created_at'], reverse=True)
     
+    def list_gallery_items(self, limit: int = None, cursor: str = None, page: int = None) -> Dict[str, Any]:
+        """Get one page of active gallery item summaries, newest first."""
+        items = [item_data for item_data in self._load_summaries('gallery/') if item_data.get('is_active', True)]
+        return self._paginate(items, 'created_at', limit, cursor, page)
+    
     def delete_gallery_item(self, item_id: str):
         """Hard delete a gallery item."""
         try:
             # Delete the file from cloud storage
-            delete_result = self._delete_file(f'gallery/{item_id}.json')
+            delete_result = self._remove_record('gallery/', item_id)
             if delete_result:
-                print(f"Successfully deleted gallery item file: {item_id}")
+                logger.info("Successfully deleted gallery item file: %s", item_id)
                 return True
             else:
-                print(f"Failed to delete gallery item file: {item_id}")
+                logger.warning("Failed to delete gallery item file: %s", item_id)
                 return False
         except Exception as e:
-            print(f"Error deleting gallery item {item_id}: {str(e)}")
+            logger.error("Error deleting gallery item %s: %s", item_id, e)
             return False
     
     def update_gallery_item(self, item_id: str, **kwargs) -> Optional[Dict]:
@@ -295,10 +1612,14 @@ class CloudStorageManager:
             # Update timestamp
             item_data['updated_at'] = datetime.utcnow().isoformat()
             
-            self._save_json(f'gallery/{item_id}.json', item_data)
+            self._put_record('gallery/', item_data)
             return item_data
         return None
     
+    def delete_gallery_items(self, item_ids: List[str]) -> Dict[str, bool]:
+        """Hard delete many gallery items; returns a per-id success flag."""
+        return self._remove_records('gallery/', item_ids)
+    
     # Contact Message Management
     def create_contact_message(self, name: str, email: str, subject: str, message: str, user_id: str = None) -> Dict:
         """Create a new contact message."""
@@ -313,17 +1634,16 @@ class CloudStorageManager:
             'user_id': user_id
         }
         
-        self._save_json(f'contact_messages/{message_id}.json', message_data)
+        self._put_record('contact_messages/', message_data)
         return message_data
     
+    def list_contact_messages(self, limit: int = None, cursor: str = None, page: int = None) -> Dict[str, Any]:
+        """Get one page of contact messages, newest first."""
+        return self._paginate(self._load_collection('contact_messages/'), 'timestamp', limit, cursor, page)
+    
     def get_all_contact_messages(self) -> List[Dict]:
         """Get all contact messages."""
-        messages = []
-        message_files = self._list_files('contact_messages/')
-        for message_file in message_files:
-            message_data = self._load_json(message_file)
-            if message_data:
-                messages.append(message_data)
+        messages = self._load_collection('contact_messages/')
         return sorted(messages, key=lambda x: x['timestamp'], reverse=True)
     
     # File Upload Management
@@ -335,23 +1655,25 @@ class CloudStorageManager:
             unique_filename = f"{timestamp}_{filename}"
             file_path = f"{folder}/{unique_filename}"
             
-            print(f"Uploading file: {filename} to path: {file_path}")
+            logger.info("Uploading file: %s to path: %s", filename, file_path)
             
             # Upload file
             blob = self._get_blob(file_path)
-            blob.upload_from_file(file_data)
+            with metrics.timed('save', file_path):
+                blob.upload_from_file(file_data)
             
-            print(f"File uploaded successfully to blob: {blob.name}")
+            logger.info("File uploaded successfully to blob: %s", blob.name)
             
             # Make public and return URL
-            blob.make_public()
+            with metrics.timed('acl', file_path):
+                blob.make_public()
             public_url = blob.public_url
             
-            print(f"File made public. URL: {public_url}")
+            logger.info("File made public. URL: %s", public_url)
             return public_url
             
         except Exception as e:
-            print(f"Error uploading file {filename}: {str(e)}")
+            logger.error("Error uploading file %s: %s", filename, e)
             return None
     
     # Authentication
@@ -387,83 +1709,126 @@ class CloudStorageManager:
             'updated_at': datetime.utcnow().isoformat()
         }
         
-        self._save_json(f'team_members/{member_id}.json', member_data)
+        self._put_record('team_members/', member_data)
         return member_data
     
     def get_team_member(self, member_id: str) -> Optional[Dict]:
         """Get team member by ID."""
-        file_path = f'team_members/{member_id}.json'
-        print(f"Loading team member from: {file_path}")
-        member_data = self._load_json(file_path)
+        member_data = self._get_record('team_members/', member_id)
         if member_data:
-            print(f"Loaded team member: {member_data.get('name', 'Unknown')} with updated_at: {member_data.get('updated_at', 'No updated_at')}")
+            logger.debug("Loaded team member %s with updated_at: %s", member_id, member_data.get('updated_at'))
         else:
-            print(f"No team member data found at: {file_path}")
+            logger.info("No team member data found for %s", member_id)
         return member_data
     
     def get_all_team_members(self) -> List[Dict]:
         """Get all team members."""
-        team_members = []
-        files = self._list_files('team_members/')
-        print(f"Found {len(files)} team member files: {files}")
-        
-        for file_path in files:
-            if file_path.endswith('.json'):
-                member_data = self._load_json(file_path)
-                if member_data:
-                    print(f"Loaded team member from {file_path}: {member_data.get('name', 'Unknown')}")
-                    team_members.append(member_data)
-                else:
-                    print(f"Failed to load team member from {file_path}")
+        team_members = self._load_collection('team_members/')
+        if logger.isEnabledFor(logging.DEBUG):
+            for member_data in team_members:
+                logger.debug("Loaded team member: %s", member_data.get('name', 'Unknown'), extra=SAMPLED)
         
-        print(f"Total team members loaded: {len(team_members)}")
+        logger.debug("Total team members loaded: %d", len(team_members))
         # Sort by member type (board first) and then by name
         team_members.sort(key=lambda x: (x.get('member_type', 'board') != 'board', x.get('name', '')))
         return team_members
     
     def update_team_member(self, member_id: str, **kwargs) -> Optional[Dict]:
         """Update a team member."""
-        print(f"Updating team member {member_id} with kwargs: {kwargs}")
-        
         member_data = self.get_team_member(member_id)
         if not member_data:
-            print(f"Team member {member_id} not found")
+            logger.info("Team member %s not found", member_id)
             return None
         
-        print(f"Original member data: {member_data}")
-        
         # Update fields
+        changed = []
         for key, value in kwargs.items():
             if value is not None:
                 member_data[key] = value
-                print(f"Updated {key}: {value}")
+                changed.append(key)
         
         member_data['updated_at'] = datetime.utcnow().isoformat()
-        
-        print(f"Final member data: {member_data}")
+        logger.info("Updating team member %s: %s", member_id, ', '.join(changed) or 'no fields')
         
         try:
-            self._save_json(f'team_members/{member_id}.json', member_data)
-            print(f"Successfully saved team member {member_id}")
+            self._put_record('team_members/', member_data)
+            logger.info("Successfully saved team member %s", member_id)
             return member_data
         except Exception as e:
-            print(f"Error saving team member {member_id}: {str(e)}")
+            logger.error("Error saving team member %s: %s", member_id, e)
             return None
     
     def delete_team_member(self, member_id: str):
         """Delete a team member."""
         try:
             # Delete the file from cloud storage
-            delete_result = self._delete_file(f'team_members/{member_id}.json')
+            delete_result = self._remove_record('team_members/', member_id)
             if delete_result:
-                print(f"Successfully deleted team member file: {member_id}")
+                logger.info("Successfully deleted team member file: %s", member_id)
                 return True
             else:
-                print(f"Failed to delete team member file: {member_id}")
+                logger.warning("Failed to delete team member file: %s", member_id)
                 return False
         except Exception as e:
-            print(f"Error deleting team member {member_id}: {str(e)}")
+            logger.error("Error deleting team member %s: %s", member_id, e)
             return False
+    
+    def delete_team_members(self, member_ids: List[str]) -> Dict[str, bool]:
+        """Delete many team members; returns a per-id success flag."""
+        return self._remove_records('team_members/', member_ids)
+    
+    def update_team_members(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, Optional[Dict]]:
+        """Update many team members at once; ``updates`` maps member id -> fields.
+        
+        Returns the updated record per id, or None for members that were not
+        found or could not be saved.
+        """
+        member_ids = list(updates)
+        members = self._get_records('team_members/', member_ids)
+        
+        results = {}
+        to_save = []
+        for member_id, member_data in zip(member_ids, members):
+            results[member_id] = None
+            if not member_data:
+                logger.info("Team member %s not found", member_id)
+                continue
+            for key, value in updates[member_id].items():
+                if value is not None:
+                    member_data[key] = value
+            member_data['updated_at'] = datetime.utcnow().isoformat()
+            to_save.append(member_data)
+        
+        saved = self._put_records('team_members/', to_save)
+        for member_data in to_save:
+            if saved[member_data['id']]:
+                results[member_data['id']] = member_data
+        return results
 
 # Global instance
-cloud_storage = CloudStorageManager() 
\ No newline at end of file
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_cloud_storage() -> CloudStorageManager:
+    """Get the process-wide storage manager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = CloudStorageManager()
+    return _manager
+
+
+class _SharedManager:
+    """Stand-in for the shared manager that creates it on first attribute access."""
+    
+    def __getattr__(self, name):
+        return getattr(get_cloud_storage(), name)
+    
+    def __repr__(self):
+        return f'<shared {get_cloud_storage()!r}>' if _manager is not None else '<shared CloudStorageManager (not created yet)>'
+
+
+# Global instance; importing it does no I/O
+cloud_storage = _SharedManager()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Hierarchical point clustering for the home page globe, in the manner of
+supercluster: geotagged projects are projected to Web Mercator and merged level
+by level from MAX_ZOOM down to MIN_ZOOM, every point within CLUSTER_RADIUS
+pixels of a seed joining its cluster. Each level keeps its own packed R-tree,
+so a query returns the clusters visible in a box at one zoom, never more than
+the screen can hold, whatever the number of projects.
+"""
+
+import math
+from typing import Dict, List, Tuple
+
+from spatial_index import RTree, split_box
+
+# Zoom levels that get their own clusters; deeper zooms are served the unclustered points
+MIN_ZOOM = 0
+MAX_ZOOM = 10
+
+# Cluster radius in pixels, on tiles TILE_EXTENT pixels wide
+CLUSTER_RADIUS = 40
+TILE_EXTENT = 512
+
+# Latitude limit of Web Mercator
+MAX_LATITUDE = 85.0511287798
+
+# Query results kept per (zoom, box) until the projects change; the memo is emptied when it fills
+MEMO_SIZE = 256
+
+
+def clamp_zoom(zoom: int) -> int:
+    """Clamp a zoom level to those served: MIN_ZOOM to MAX_ZOOM clustered, MAX_ZOOM + 1 unclustered."""
+    return max(MIN_ZOOM, min(int(zoom), MAX_ZOOM + 1))
+
+
+def mercator_x(lon: float) -> float:
+    """Project a longitude to Web Mercator x in [0, 1]."""
+    return lon / 360 + 0.5
+
+
+def mercator_y(lat: float) -> float:
+    """Project a latitude to Web Mercator y in [0, 1] (0 is north)."""
+    sin = math.sin(math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))))
+    return 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi
+
+
+def mercator_lon(x: float) -> float:
+    """Unproject Web Mercator x to a longitude."""
+    return (x - 0.5) * 360
+
+
+def mercator_lat(y: float) -> float:
+    """Unproject Web Mercator y to a latitude."""
+    return math.degrees(2 * math.atan(math.exp(math.pi * (1 - 2 * y)))) - 90
+
+
+class ClusterIndex:
+    def __init__(self, docs: List[Dict]):
+        """Cluster spatial index documents (each with 'id' and 'point': [lon, lat]) at every zoom."""
+        self.docs = docs
+        # Nodes are (x, y, point count, doc index or None for a cluster, cluster id or None)
+        nodes = [(mercator_x(doc['point'][0]), mercator_y(doc['point'][1]), 1, index, None)
+                 for index, doc in enumerate(docs)]
+        self.levels = {MAX_ZOOM + 1: self._level(nodes)}
+        for zoom in range(MAX_ZOOM, MIN_ZOOM - 1, -1):
+            nodes = self._cluster(nodes, zoom)
+            self.levels[zoom] = self._level(nodes)
+        self._memo = {}  # (zoom, box) -> features
+
+    def clusters(self, bbox: List[float], zoom: int) -> List[Dict]:
+        """Get the clusters and single projects inside [west, south, east, north] at a zoom, as GeoJSON features."""
+        zoom = clamp_zoom(zoom)
+        memo_key = (zoom, tuple(bbox))
+        features = self._memo.get(memo_key)
+        if features is None:
+            nodes, tree = self.levels[zoom]
+            found = {}
+            for west, south, east, north in split_box(*bbox):
+                for item in tree.search(mercator_x(west), mercator_y(north), mercator_x(east), mercator_y(south)):
+                    found[item] = True
+            features = [self._feature(nodes[item]) for item in found]
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo = {}
+            self._memo[memo_key] = features
+        return list(features)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of points and the number of nodes at the widest zoom."""
+        return {'points': len(self.docs), 'top_level_nodes': len(self.levels[MIN_ZOOM][0])}
+
+    def _feature(self, node: Tuple) -> Dict:
+        """Get the GeoJSON feature of a node: a single project, or a cluster with its point count."""
+        x, y, count, doc_index, cluster_id = node
+        if doc_index is not None:
+            doc = self.docs[doc_index]
+            properties = {name: value for name, value in doc.items() if name not in ('point', 'extent')}
+            return {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': list(doc['point'])},
+                    'properties': properties}
+        return {'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [round(mercator_lon(x), 6), round(mercator_lat(y), 6)]},
+                'properties': {'cluster': True, 'cluster_id': cluster_id, 'point_count': count}}
+
+    @staticmethod
+    def _level(nodes: List[Tuple]) -> Tuple[List[Tuple], RTree]:
+        """Index one zoom level's nodes for box queries."""
+        return nodes, RTree([(node[0], node[1], node[0], node[1]) for node in nodes])
+
+    @staticmethod
+    def _cluster(nodes: List[Tuple], zoom: int) -> List[Tuple]:
+        """Merge the nodes of the next zoom level into this level's clusters.
+
+        Neighbours are found through a grid of radius-sized cells, so each node
+        only looks at the nine cells around it.
+        """
+        radius = CLUSTER_RADIUS / (TILE_EXTENT * 2 ** zoom)
+        grid = {}
+        for index, node in enumerate(nodes):
+            grid.setdefault((int(node[0] / radius), int(node[1] / radius)), []).append(index)
+        merged = [False] * len(nodes)
+        clusters = []
+        for index, node in enumerate(nodes):
+            if merged[index]:
+                continue
+            merged[index] = True
+            x, y = node[0], node[1]
+            members = [index]
+            cell_x, cell_y = int(x / radius), int(y / radius)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for other in grid.get((cell_x + dx, cell_y + dy), ()):
+                        if not merged[other] and (nodes[other][0] - x) ** 2 + (nodes[other][1] - y) ** 2 <= radius ** 2:
+                            merged[other] = True
+                            members.append(other)
+            if len(members) == 1:
+                clusters.append(node)
+                continue
+            total = sum(nodes[member][2] for member in members)
+            # Weighted centre, so a cluster sits where most of its projects are
+            cluster_x = sum(nodes[member][0] * nodes[member][2] for member in members) / total
+            cluster_y = sum(nodes[member][1] * nodes[member][2] for member in members) / total
+            clusters.append((cluster_x, cluster_y, total, None, f'{zoom}-{len(clusters)}'))
+        return clusters
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Facet index for the projects filter panel: project type, collection (a group of
+types), normalized tags and the month a project was created. Every project
+keeps its own facet values, so a write only touches that project's postings,
+and counts for any combination of filters come from set intersections instead
+of a scan over the records.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+# Project types offered by ProjectForm, in the order the filter panel lists them
+PROJECT_TYPES = ['Hub Page', 'Form', 'Feature Service', 'Dataset', 'Survey123',
+                 'Web App', 'Dashboard', 'Story Map', 'Other']
+
+# Filter panel collections and the project types each one groups
+PROJECT_COLLECTIONS = {
+    'data': ['Feature Service', 'Dataset'],
+    'documents': ['Form', 'Hub Page', 'Survey123'],
+    'apps': ['Web App', 'Dashboard', 'Story Map'],
+}
+
+# Facets projects can be filtered on (also their query argument names)
+FACETS = ['collection', 'type', 'tag', 'month']
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a tag for matching: trimmed, single-spaced, lowercase."""
+    return ' '.join(str(tag).split()).lower()
+
+
+def split_tags(tags) -> List[str]:
+    """Split a stored tags value (a comma string, or a list) into distinct normalized tags."""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    return list(dict.fromkeys(tag for tag in (normalize_tag(tag) for tag in tags) if tag))
+
+
+def facet_values(record: Dict) -> Dict[str, List[str]]:
+    """Get the facet values of a project record."""
+    project_type = record.get('project_type')
+    created_at = record.get('created_at') or ''
+    return {
+        'collection': [name for name, types in PROJECT_COLLECTIONS.items() if project_type in types],
+        'type': [project_type] if project_type else [],
+        'tag': split_tags(record.get('tags')),
+        'month': [created_at[:7]] if len(created_at) >= 7 else [],
+    }
+
+
+class FacetIndex:
+    def __init__(self, docs: Dict[str, Dict[str, List[str]]] = None):
+        """Initialize the index from stored documents (project id -> facet values)."""
+        self.docs = {}
+        self.postings = {facet: {} for facet in FACETS}  # facet -> value -> set of project ids
+        for record_id, values in (docs or {}).items():
+            self._add_doc(record_id, values)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'FacetIndex':
+        """Load an index from its stored form."""
+        return cls((data or {}).get('docs'))
+
+    def to_dict(self) -> Dict:
+        """Get the stored form of the index."""
+        return {'docs': self.docs}
+
+    def add(self, record: Dict):
+        """Index a project, replacing its previous values; inactive projects are removed."""
+        self._remove_doc(record['id'])
+        if record.get('is_active', True):
+            self._add_doc(record['id'], facet_values(record))
+
+    def remove(self, record_id: str):
+        """Drop a project from the index."""
+        self._remove_doc(record_id)
+
+    def apply(self, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes (id -> record, or None to drop it)."""
+        for record_id, record in changes.items():
+            if record is None:
+                self.remove(record_id)
+            else:
+                self.add(record)
+
+    def match(self, filters: Dict[str, Iterable[str]] = None, skip: str = None) -> Set[str]:
+        """Get the ids of projects matching the filters: any value within a facet, every facet.
+
+        ``skip`` leaves one facet's filter out, which is how that facet's own
+        counts are computed.
+        """
+        ids = set(self.docs)
+        for facet, values in (filters or {}).items():
+            if facet == skip or not values:
+                continue
+            postings = self.postings[facet]
+            wanted = [normalize_tag(value) for value in values] if facet == 'tag' else values
+            matched = set()
+            for value in wanted:
+                matched |= postings.get(value, set())
+            ids &= matched
+        return ids
+
+    def counts(self, filters: Dict[str, Iterable[str]] = None, within: Set[str] = None) -> Dict[str, List[Dict]]:
+        """Count projects per facet value under the other facets' filters (and within a set of ids).
+
+        Project types and collections are always listed, even at zero, so the
+        filter panel keeps its buttons; tags and months are listed when used.
+        """
+        result = {}
+        for facet in FACETS:
+            ids = self.match(filters, skip=facet)
+            if within is not None:
+                ids &= within
+            counts = {value: len(ids & members) for value, members in self.postings[facet].items()}
+            if facet == 'type':
+                order = PROJECT_TYPES + sorted(value for value in counts if value not in PROJECT_TYPES)
+                result[facet] = [{'value': value, 'count': counts.get(value, 0)} for value in order]
+            elif facet == 'collection':
+                result[facet] = [{'value': value, 'count': counts.get(value, 0)} for value in PROJECT_COLLECTIONS]
+            elif facet == 'month':
+                result[facet] = [{'value': value, 'count': count}
+                                 for value, count in sorted(counts.items(), reverse=True) if count]
+            else:
+                result[facet] = [{'value': value, 'count': count}
+                                 for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])) if count]
+        return result
+
+    def _add_doc(self, record_id: str, values: Dict[str, List[str]]):
+        """Add a project's facet values to the postings."""
+        self.docs[record_id] = values
+        for facet in FACETS:
+            for value in values.get(facet, []):
+                self.postings[facet].setdefault(value, set()).add(record_id)
+
+    def _remove_doc(self, record_id: str):
+        """Remove a project's facet values from the postings, if present."""
+        values = self.docs.pop(record_id, None)
+        if values is None:
+            return
+        for facet in FACETS:
+            for value in values.get(facet, []):
+                members = self.postings[facet].get(value)
+                if members is not None:
+                    members.discard(record_id)
+                    if not members:
+                        del self.postings[facet][value]
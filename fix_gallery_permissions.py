@@ -18,9 +18,9 @@ def fix_gallery_permissions():
         
         # Delete all existing gallery items
         existing_items = cloud_storage.get_all_gallery_items()
-        for item in existing_items:
-            cloud_storage.delete_gallery_item(item['id'])
-        print(f"Deleted {len(existing_items)} existing gallery items.")
+        results = cloud_storage.delete_gallery_items([item['id'] for item in existing_items])
+        deleted_count = sum(1 for deleted in results.values() if deleted)
+        print(f"Deleted {deleted_count} of {len(existing_items)} existing gallery items.")
         
         # Get the first user to create items with
         user = users[0]
@@ -1,8 +1,10 @@
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileAllowed
-from wtforms import StringField, PasswordField, SubmitField, BooleanField, TextAreaField, SelectField
-from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError, URL, Optional
+from wtforms import StringField, PasswordField, SubmitField, BooleanField, TextAreaField, SelectField, FloatField
+from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError, URL, Optional, NumberRange
 from cloud_storage import cloud_storage
+from facet_index import PROJECT_TYPES
+from spatial_index import parse_extent
 
 class RegistrationForm(FlaskForm):
     username = StringField('Username', validators=[DataRequired(), Length(min=3, max=20)])
@@ -41,24 +43,39 @@ class ProjectForm(FlaskForm):
     creator_name = StringField('Creator Name', validators=[DataRequired(), Length(max=100)])
     description = TextAreaField('Description', validators=[DataRequired()])
     project_link = StringField('Project Link', validators=[DataRequired(), URL()])
-    project_type = SelectField('Project Type', choices=[
-        ('Hub Page', 'Hub Page'),
-        ('Form', 'Form'),
-        ('Feature Service', 'Feature Service'),
-        ('Dataset', 'Dataset'),
-        ('Survey123', 'Survey123'),
-        ('Web App', 'Web App'),
-        ('Dashboard', 'Dashboard'),
-        ('Story Map', 'Story Map'),
-        ('Other', 'Other')
-    ], validators=[DataRequired()])
+    project_type = SelectField('Project Type', choices=[(project_type, project_type) for project_type in PROJECT_TYPES],
+                               validators=[DataRequired()])
     tags = StringField('Tags (comma-separated)', validators=[Length(max=500)])
     image_url = StringField('Image URL (optional - will auto-detect if left empty)', validators=[Length(max=500)])
     image_file = FileField('Or upload image from computer', validators=[
         Optional(),
         FileAllowed(['jpg', 'jpeg', 'png', 'gif', 'webp'], 'Only image files are allowed!')
     ])
+    latitude = FloatField('Latitude (optional)', validators=[Optional(), NumberRange(min=-90, max=90)])
+    longitude = FloatField('Longitude (optional)', validators=[Optional(), NumberRange(min=-180, max=180)])
+    extent = StringField('Extent (optional: west, south, east, north)', validators=[Length(max=200)])
     submit = SubmitField('Add Project')
+    
+    def validate(self, extra_validators=None):
+        # Field validators stop at an empty optional field, so the pairing is checked here
+        if not super().validate(extra_validators):
+            return False
+        if (self.latitude.data is None) != (self.longitude.data is None):
+            self.longitude.errors.append('Enter both latitude and longitude, or neither.')
+            return False
+        return True
+    
+    def validate_extent(self, extent):
+        try:
+            parse_extent(extent.data)
+        except ValueError as e:
+            raise ValidationError(str(e))
+    
+    def location_data(self):
+        """The entered point as {'lat', 'lon'}, or None."""
+        if self.latitude.data is None or self.longitude.data is None:
+            return None
+        return {'lat': self.latitude.data, 'lon': self.longitude.data}
 
 class GalleryForm(FlaskForm):
     title = StringField('Image Title', validators=[DataRequired(), Length(max=200)])
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration for the National 4-H GIS Leadership Team Website.
+Each worker warms itself up right after it is forked, so the first request
+it serves finds open storage connections, compiled templates and cached data.
+"""
+import os
+
+# Set PREWARM_WORKERS=0 to boot workers without warming them
+PREWARM_WORKERS = os.environ.get('PREWARM_WORKERS', '1') != '0'
+
+
+def post_fork(server, worker):
+    """Warm up the freshly forked worker before it accepts requests."""
+    if not PREWARM_WORKERS:
+        return
+    try:
+        from main_cloud import warm_up
+        result = warm_up()
+        server.log.info("Worker %s warmed up in %sms", worker.pid, result['total_ms'])
+    except Exception as e:
+        server.log.warning("Worker %s warmup failed: %s", worker.pid, e)
@@ -4,22 +4,32 @@ Main Flask application for National 4-H GIS Leadership Team Website
 Cloud Storage Version - Uses Google Cloud Storage for data persistence
 """
 
-from flask import Flask, render_template, request, flash, redirect, url_for, send_from_directory, jsonify
+from flask import Flask, render_template, request, flash, redirect, url_for, send_from_directory, jsonify, session, abort, g, Response
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+import logging
 import os
+import time
+import uuid
 import requests
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import re
 from dotenv import load_dotenv
-from cloud_storage import CloudStorageManager
+from cloud_storage import cloud_storage
+from facet_index import FACETS
+from spatial_index import parse_extent
+from cluster_index import clamp_zoom
+from storage_metrics import metrics
+from app_logging import get_logger, set_request_context, clear_request_context, get_request_id, SAMPLED
 from cloud_user import CloudUser
 from forms import RegistrationForm, LoginForm, ContactForm, ProjectForm, GalleryForm
 
 # Load environment variables
 load_dotenv()
 
+logger = get_logger(__name__)
+
 # Simple object wrapper to convert dictionaries to objects with attributes
 class DictToObject:
     def __init__(self, data_dict):
@@ -34,8 +44,16 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Initialize cloud storage
-cloud_storage = CloudStorageManager()
+# Seconds a session keeps demanding the versions it wrote; after that every
+# instance has rechecked the collection on its own
+WRITE_TOKEN_TTL = 30
+
+# Bearer token Prometheus sends to scrape /metrics (team accounts can view it when logged in)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Seconds /health reuses its last bucket check, so a flood of probes costs one request per interval
+HEALTH_CHECK_TTL = 10
+_last_health = None  # (monotonic time, {'ok', 'latency_ms'})
 
 # Initialize Flask-Login
 login_manager = LoginManager()
@@ -47,6 +65,64 @@ def load_user(user_id):
     """Load user for Flask-Login."""
     return CloudUser.get(user_id)
 
+@app.before_request
+def start_request_logging():
+    """Tag this request's log lines with its id and Cloud Trace context."""
+    request_id = request.headers.get('X-Request-Id')
+    trace = None
+    trace_header = request.headers.get('X-Cloud-Trace-Context')
+    if trace_header:
+        trace_id = trace_header.split('/', 1)[0]
+        request_id = request_id or trace_id
+        project = os.environ.get('GOOGLE_CLOUD_PROJECT')
+        if project:
+            trace = f'projects/{project}/traces/{trace_id}'
+    set_request_context(request_id or uuid.uuid4().hex, trace)
+
+@app.teardown_request
+def end_request_logging(exc=None):
+    """Stop tagging log lines once the request is done."""
+    clear_request_context()
+
+@app.before_request
+def start_storage_metrics():
+    """Count the storage operations this request makes."""
+    g.storage_metrics_token = metrics.begin_request()
+
+@app.after_request
+def record_storage_metrics(response):
+    """Record this request's storage operation count under its endpoint."""
+    token = g.pop('storage_metrics_token', None)
+    if token is not None:
+        metrics.end_request(request.endpoint or 'unknown', token)
+    return response
+
+@app.before_request
+def require_own_writes():
+    """Make this request see the storage writes made earlier in the same session."""
+    # Drop tokens left on this worker thread by a request that failed before after_request
+    cloud_storage.pop_write_tokens()
+    
+    tokens = session.get('storage_writes')
+    if not tokens:
+        return
+    now = time.time()
+    live_tokens = {prefix: token for prefix, token in tokens.items() if now - token[1] < WRITE_TOKEN_TTL}
+    cloud_storage.require_versions({prefix: token[0] for prefix, token in live_tokens.items()})
+    if live_tokens != tokens:
+        session['storage_writes'] = live_tokens
+
+@app.after_request
+def remember_own_writes(response):
+    """Record the collection versions this request wrote in the session."""
+    written = cloud_storage.pop_write_tokens()
+    if written:
+        tokens = dict(session.get('storage_writes', {}))
+        for prefix, version in written.items():
+            tokens[prefix] = [version, time.time()]
+        session['storage_writes'] = tokens
+    return response
+
 @app.after_request
 def add_header(response):
     """Add headers to prevent caching issues."""
@@ -54,8 +130,91 @@ def add_header(response):
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '0'
     response.headers['Last-Modified'] = '0'
+    request_id = get_request_id()
+    if request_id:
+        response.headers['X-Request-Id'] = request_id
     return response
 
+# Heavy templates compiled before the first real request
+WARMUP_TEMPLATES = ['projects.html', 'team.html', 'about.html']
+
+# Result of this process's first complete warmup
+_warmup_result = None
+
+def warm_up():
+    """Open storage connections, compile templates and preload collection caches.
+    
+    Returns per-step timings in milliseconds plus any step errors; a failed
+    step never stops the others. Once a warmup completes without errors, later
+    calls return its result without touching storage again.
+    """
+    global _warmup_result
+    if _warmup_result is not None:
+        return _warmup_result
+    steps = [
+        ('storage_connection', lambda: cloud_storage.health_check()),
+        ('templates', lambda: [app.jinja_env.get_template(name) for name in WARMUP_TEMPLATES]),
+        ('projects', lambda: cloud_storage.list_projects()),
+        ('project_facets', lambda: cloud_storage.project_facets()),
+        ('suggestions', lambda: cloud_storage.suggest('a')),
+        ('project_clusters', lambda: cloud_storage.project_clusters(1)),
+        ('gallery', lambda: cloud_storage.list_gallery_items()),
+        ('team_members', lambda: cloud_storage.get_all_team_members()),
+    ]
+    timings = {}
+    errors = {}
+    start = time.perf_counter()
+    for name, step in steps:
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            errors[name] = str(e)
+        timings[name] = round((time.perf_counter() - step_start) * 1000, 1)
+    total = round((time.perf_counter() - start) * 1000, 1)
+    if errors:
+        logger.warning("Warmup finished in %sms: %s (errors: %s)", total, timings, errors)
+    else:
+        logger.info("Warmup finished in %sms: %s", total, timings)
+    result = {'timings_ms': timings, 'total_ms': total, 'errors': errors}
+    if not errors:
+        _warmup_result = result
+    return result
+
+@app.route('/_ah/warmup')
+def warmup():
+    """App Engine warmup request, sent before a new instance receives traffic.
+    
+    The route is public, but warming up is idempotent and only the first
+    complete warmup reads storage, so outside requests cost nothing.
+    """
+    return jsonify(warm_up())
+
+@app.route('/metrics')
+def storage_metrics():
+    """Storage metrics in Prometheus text format."""
+    authorized = bool(METRICS_TOKEN) and request.headers.get('Authorization') == f'Bearer {METRICS_TOKEN}'
+    if not authorized and not (current_user.is_authenticated and current_user.email.endswith('@national4hgeospatialteam.us')):
+        abort(403)
+    return Response(cloud_storage.metrics_text(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/health')
+def health():
+    """Storage health check for uptime monitoring.
+    
+    The route is public, so it returns only the status and latency; the error
+    and bucket name go to the log.
+    """
+    global _last_health
+    now = time.monotonic()
+    if _last_health is None or now - _last_health[0] >= HEALTH_CHECK_TTL:
+        status = cloud_storage.health_check()
+        if not status['ok']:
+            logger.error("Health check failed for bucket %s: %s", status['bucket'], status['error'])
+        _last_health = (now, {'ok': status['ok'], 'latency_ms': status['latency_ms']})
+    body = _last_health[1]
+    return jsonify(body), 200 if body['ok'] else 503
+
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     """Serve static files."""
@@ -71,40 +230,132 @@ def about():
     """About page."""
     return render_template('about.html')
 
-@app.route('/projects')
-def projects():
-    """Projects page."""
-    projects_data = cloud_storage.get_all_projects()
-    print(f"Loaded {len(projects_data)} projects from database")
-    
-    # Convert dictionaries to objects with attributes
+def load_page(list_method):
+    """Load the page of a listing selected by the ?cursor=, ?page= and ?limit= arguments."""
+    try:
+        return list_method(limit=request.args.get('limit', type=int),
+                           cursor=request.args.get('cursor') or None,
+                           page=request.args.get('page', type=int))
+    except ValueError:
+        abort(400)
+
+def page_response(page_data, template, name, items):
+    """JSON body for "load more": the items, or their rendered cards with ?html=1."""
+    body = {key: value for key, value in page_data.items() if key != 'items'}
+    if request.args.get('html'):
+        body['html'] = ''.join(render_template(template, **{name: item}) for item in items)
+    else:
+        body['items'] = page_data['items']
+    return jsonify(body)
+
+def project_objects(projects_data):
+    """Convert project dictionaries to objects with attributes."""
     projects_objects = []
+    log_items = logger.isEnabledFor(logging.DEBUG)
     for project_dict in projects_data:
-        print(f"Project: {project_dict.get('title', 'Unknown')} - Image URL: {project_dict.get('image_url', 'None')}")
+        if log_items:
+            logger.debug("Project: %s - Image URL: %s", project_dict.get('title', 'Unknown'), project_dict.get('image_url', 'None'), extra=SAMPLED)
         
         # Convert to object
         project_obj = DictToObject(project_dict)
         projects_objects.append(project_obj)
-    
-    return render_template('projects.html', projects=projects_objects)
+    return projects_objects
 
-@app.route('/gallery')
-def gallery():
-    """Gallery page."""
-    gallery_items = cloud_storage.get_all_gallery_items()
-    
-    # Convert dictionaries to objects with attributes
+def gallery_objects(gallery_items):
+    """Convert gallery item dictionaries to objects with attributes and their creator."""
     gallery_objects = []
+    # Load each distinct creator once, all in one fan-out
+    creator_ids = list(dict.fromkeys(item_dict['created_by'] for item_dict in gallery_items))
+    creators = dict(zip(creator_ids, cloud_storage.get_users_by_ids(creator_ids)))
     for item_dict in gallery_items:
         # Add creator information to each gallery item
-        creator = cloud_storage.get_user_by_id(item_dict['created_by'])
-        item_dict['creator'] = creator
+        item_dict['creator'] = creators[item_dict['created_by']]
         
         # Convert to object
         item_obj = DictToObject(item_dict)
         gallery_objects.append(item_obj)
-    
-    return render_template('gallery.html', gallery_items=gallery_objects)
+    return gallery_objects
+
+def project_filters():
+    """The facet filters (?type=, ?collection=, ?tag=, ?month=, each repeatable) and ?q= of a request."""
+    filters = {facet: request.args.getlist(facet) for facet in FACETS if request.args.getlist(facet)}
+    return filters, request.args.get('q', '').strip() or None
+
+def load_project_page():
+    """Load the page of projects selected by the request's filters and paging arguments."""
+    filters, query = project_filters()
+    return load_page(lambda **kwargs: cloud_storage.list_projects(filters=filters, query=query, **kwargs))
+
+@app.route('/projects')
+def projects():
+    """Projects page."""
+    page_data = load_project_page()
+    filters, query = project_filters()
+    facets = cloud_storage.project_facets(filters, query)
+    logger.debug("Loaded %d of %d projects from database", len(page_data['items']), page_data['total'])
+    link_args = dict(filters, **({'q': query} if query else {}))
+    return render_template('projects.html', projects=project_objects(page_data['items']), pagination=page_data,
+                           facets=facets['facets'], filters=filters, query=query or '', link_args=link_args)
+
+@app.route('/api/projects')
+def api_projects():
+    """One page of projects as JSON, for "load more" and the filter panel."""
+    page_data = load_project_page()
+    return page_response(page_data, '_project_card.html', 'project', project_objects(page_data['items']))
+
+@app.route('/api/projects/facets')
+def api_project_facets():
+    """Project counts per type, collection, tag and month under the request's filters."""
+    filters, query = project_filters()
+    return jsonify(cloud_storage.project_facets(filters, query))
+
+@app.route('/api/projects/near')
+def api_projects_near():
+    """Geotagged projects near a point as JSON, nearest first: ?lat=, ?lon=, ?r= (km, default 50) and ?limit=."""
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    radius_km = request.args.get('r', 50.0, type=float)
+    if lat is None or lon is None:
+        abort(400)
+    try:
+        return jsonify(cloud_storage.projects_near(lat, lon, radius_km, limit=request.args.get('limit', type=int)))
+    except ValueError:
+        abort(400)
+
+@app.route('/api/projects/bbox')
+def api_projects_bbox():
+    """One page of geotagged projects inside ?bbox=west,south,east,north as JSON, newest first."""
+    try:
+        bbox = parse_extent(request.args.get('bbox', ''))
+    except ValueError:
+        abort(400)
+    if bbox is None:
+        abort(400)
+    page_data = load_page(lambda **kwargs: cloud_storage.projects_in_bbox(bbox, **kwargs))
+    return jsonify(dict(page_data, bbox=bbox))
+
+@app.route('/api/projects/clusters')
+def api_project_clusters():
+    """Geotagged projects clustered for the globe as GeoJSON: ?z= (zoom, default 0) and optional ?bbox=west,south,east,north."""
+    zoom = clamp_zoom(request.args.get('z', 0, type=int))
+    try:
+        bbox = parse_extent(request.args.get('bbox', ''))
+        return jsonify(cloud_storage.project_clusters(zoom, bbox))
+    except ValueError:
+        abort(400)
+
+@app.route('/gallery')
+def gallery():
+    """Gallery page."""
+    page_data = load_page(cloud_storage.list_gallery_items)
+    return render_template('gallery.html', gallery_items=gallery_objects(page_data['items']), pagination=page_data)
+
+@app.route('/api/gallery')
+def api_gallery():
+    """One page of gallery items as JSON, for "load more"."""
+    page_data = load_page(cloud_storage.list_gallery_items)
+    items = gallery_objects(page_data['items']) if request.args.get('html') else page_data['items']
+    return page_response(page_data, '_gallery_item.html', 'item', items)
 
 @app.route('/add-gallery-item', methods=['GET', 'POST'])
 @login_required
@@ -170,32 +421,30 @@ def add_gallery_item():
 @login_required
 def delete_gallery_item(item_id):
     """Delete gallery item."""
-    print(f"Delete request received for item_id: {item_id}")
-    print(f"Current user: {current_user.email}")
+    logger.info("Delete request for gallery item %s by user %s", item_id, current_user.id)
     
     # Check if user has authorized email domain
     if not current_user.email.endswith('@national4hgeospatialteam.us'):
-        print("Unauthorized user attempted to delete gallery item")
+        logger.warning("Unauthorized user attempted to delete gallery item")
         return jsonify({'success': False, 'message': 'Only users with @national4hgeospatialteam.us email addresses can delete gallery items.'})
     
     gallery_item = cloud_storage.get_gallery_item_by_id(item_id)
-    print(f"Gallery item found: {gallery_item is not None}")
     
     # Allow any geospatial user to delete any gallery item
     if gallery_item:
         try:
             delete_result = cloud_storage.delete_gallery_item(item_id)
             if delete_result:
-                print(f"Successfully deleted gallery item: {item_id}")
+                logger.info("Successfully deleted gallery item: %s", item_id)
                 return jsonify({'success': True, 'message': 'Gallery item deleted successfully!'})
             else:
-                print(f"Failed to delete gallery item: {item_id}")
+                logger.warning("Failed to delete gallery item: %s", item_id)
                 return jsonify({'success': False, 'message': 'Failed to delete gallery item from storage.'})
         except Exception as e:
-            print(f"Error deleting gallery item: {str(e)}")
+            logger.error("Error deleting gallery item: %s", e)
             return jsonify({'success': False, 'message': f'Error deleting gallery item: {str(e)}'})
     else:
-        print(f"Gallery item not found: {item_id}")
+        logger.info("Gallery item not found: %s", item_id)
         return jsonify({'success': False, 'message': 'Gallery item not found.'})
 
 @app.route('/edit-gallery-item/<item_id>', methods=['POST'])
@@ -260,14 +509,14 @@ def add_project():
         
         # Check if file was uploaded
         if form.image_file.data and form.image_file.data.filename:
-            print(f"Processing uploaded file: {form.image_file.data.filename}")
+            logger.info("Processing uploaded file: %s", form.image_file.data.filename)
             uploaded_image = cloud_storage.upload_file(form.image_file.data, form.image_file.data.filename, 'uploads')
             if uploaded_image:
                 image_url = uploaded_image
-                print(f"Image uploaded successfully. URL: {image_url}")
+                logger.info("Image uploaded successfully. URL: %s", image_url)
                 flash('Image uploaded successfully!', 'success')
             else:
-                print("Failed to upload image")
+                logger.warning("Failed to upload image")
                 flash('Error uploading image. Please try again.', 'error')
                 return render_template('add_project.html', form=form)
         
@@ -291,7 +540,9 @@ def add_project():
             project_type=form.project_type.data,
             tags=form.tags.data,
             image_url=image_url,
-            created_by=current_user.id
+            created_by=current_user.id,
+            location=form.location_data(),
+            extent=parse_extent(form.extent.data)
         )
         
         flash('Project added successfully!', 'success')
@@ -303,21 +554,18 @@ def add_project():
 @login_required
 def edit_project(project_id):
     """Edit project."""
-    print(f"Edit project request for project_id: {project_id}")
-    print(f"Current user: {current_user.email}")
+    logger.info("Edit project request for %s by user %s", project_id, current_user.id)
     
     # Check if user has authorized email domain
     if not current_user.email.endswith('@national4hgeospatialteam.us'):
-        print("Unauthorized user attempted to edit project")
+        logger.warning("Unauthorized user attempted to edit project")
         flash('Only users with @national4hgeospatialteam.us email addresses can edit projects.', 'danger')
         return redirect(url_for('projects'))
     
     project_dict = cloud_storage.get_project_by_id(project_id)
-    print(f"Project found: {project_dict is not None}")
-    if project_dict:
-        print(f"Project data: {project_dict}")
     
     if not project_dict:
+        logger.info("Project not found: %s", project_id)
         flash('Project not found.', 'error')
         return redirect(url_for('projects'))
     
@@ -326,14 +574,11 @@ def edit_project(project_id):
     
     # Only allow the creator to edit
     if project_dict['created_by'] != current_user.id:
-        print(f"User {current_user.id} tried to edit project created by {project_dict['created_by']}")
+        logger.info("User %s tried to edit project created by %s", current_user.id, project_dict['created_by'])
         flash('You can only edit your own projects.', 'danger')
         return redirect(url_for('projects'))
     
     form = ProjectForm()
-    print(f"Form validation result: {form.validate_on_submit()}")
-    if form.errors:
-        print(f"Form errors: {form.errors}")
     if form.validate_on_submit():
         # Handle image upload or URL
         image_url = form.image_url.data
@@ -359,18 +604,8 @@ def edit_project(project_id):
                 flash('No map or main image found on the project page. Please upload an image manually.', 'warning')
                 return render_template('edit_project.html', form=form, project=project)
         
-        print("Processing POST request for project edit")
-        print(f"Form data received:")
-        print(f"  title: {form.title.data}")
-        print(f"  description: {form.description.data}")
-        print(f"  project_link: {form.project_link.data}")
-        print(f"  project_type: {form.project_type.data}")
-        print(f"  tags: {form.tags.data}")
-        print(f"  image_url: {image_url}")
-        
         # Update project
         try:
-            print("Attempting to update project in cloud storage")
             updated_project = cloud_storage.update_project(
                 project_id,
                 title=form.title.data,
@@ -379,17 +614,19 @@ def edit_project(project_id):
                 project_link=form.project_link.data,
                 project_type=form.project_type.data,
                 tags=form.tags.data,
-                image_url=image_url
+                image_url=image_url,
+                location=form.location_data() or {},
+                extent=parse_extent(form.extent.data) or []
             )
             if updated_project:
-                print(f"Successfully updated project: {project_id}")
+                logger.info("Successfully updated project: %s", project_id)
                 flash('Project updated successfully!', 'success')
             else:
-                print(f"Failed to update project: {project_id}")
+                logger.warning("Failed to update project: %s", project_id)
                 flash('Failed to update project.', 'error')
             return redirect(url_for('projects'))
         except Exception as e:
-            print(f"Error updating project: {str(e)}")
+            logger.error("Error updating project: %s", e)
             flash(f'Error updating project: {str(e)}', 'error')
             return render_template('edit_project.html', form=form, project=project)
     
@@ -402,6 +639,10 @@ def edit_project(project_id):
         form.project_type.data = project_dict['project_type']
         form.tags.data = project_dict['tags']
         form.image_url.data = project_dict['image_url']
+        location = project_dict.get('location') or {}
+        form.latitude.data = location.get('lat')
+        form.longitude.data = location.get('lon')
+        form.extent.data = ', '.join(f'{value:g}' for value in project_dict.get('extent') or [])
     
     return render_template('edit_project.html', form=form, project=project)
 
@@ -409,41 +650,37 @@ def edit_project(project_id):
 @login_required
 def delete_project(project_id):
     """Delete project."""
-    print(f"Delete project request for project_id: {project_id}")
-    print(f"Current user: {current_user.email}")
+    logger.info("Delete project request for %s by user %s", project_id, current_user.id)
     
     # Check if user has authorized email domain
     if not current_user.email.endswith('@national4hgeospatialteam.us'):
-        print("Unauthorized user attempted to delete project")
+        logger.warning("Unauthorized user attempted to delete project")
         flash('Only users with @national4hgeospatialteam.us email addresses can delete projects.', 'danger')
         return redirect(url_for('projects'))
     
     project = cloud_storage.get_project_by_id(project_id)
-    print(f"Project found: {project is not None}")
-    if project:
-        print(f"Project data: {project}")
     
     if not project:
+        logger.info("Project not found: %s", project_id)
         flash('Project not found.', 'error')
         return redirect(url_for('projects'))
     
     # Only allow the creator to delete
     if project['created_by'] != current_user.id:
-        print(f"User {current_user.id} tried to delete project created by {project['created_by']}")
+        logger.info("User %s tried to delete project created by %s", current_user.id, project['created_by'])
         flash('You can only delete your own projects.', 'danger')
         return redirect(url_for('projects'))
     
     try:
-        print("Attempting to delete project from cloud storage")
         delete_result = cloud_storage.delete_project(project_id)
         if delete_result:
-            print(f"Successfully deleted project: {project_id}")
+            logger.info("Successfully deleted project: %s", project_id)
             flash('Project deleted successfully!', 'success')
         else:
-            print(f"Failed to delete project: {project_id}")
+            logger.warning("Failed to delete project: %s", project_id)
             flash('Failed to delete project from storage.', 'error')
     except Exception as e:
-        print(f"Error deleting project: {str(e)}")
+        logger.error("Error deleting project: %s", e)
         flash(f'Error deleting project: {str(e)}', 'error')
     
     return redirect(url_for('projects'))
@@ -466,25 +703,47 @@ def music():
 @app.route('/national-4h-gis-team')
 def national_4h_gis_team():
     """National 4-H GIS Team Pictures page."""
-    # Get all gallery items from the database
-    gallery_items = cloud_storage.get_all_gallery_items()
-    return render_template('national_4h_gis_team.html', gallery_items=gallery_items)
+    page_data = load_page(cloud_storage.list_gallery_items)
+    return render_template('national_4h_gis_team.html', gallery_items=page_data['items'], pagination=page_data)
+
+@app.route('/api/team-pictures')
+def api_team_pictures():
+    """One page of team pictures as JSON, for "load more"."""
+    page_data = load_page(cloud_storage.list_gallery_items)
+    return page_response(page_data, '_team_picture.html', 'item', page_data['items'])
+
+@app.route('/api/search')
+def api_search():
+    """Ranked site-wide search as JSON: ?q=, optional ?type= (repeatable) and paging arguments."""
+    query = request.args.get('q', '').strip()
+    types = request.args.getlist('type') or None
+    page_data = load_page(lambda **kwargs: cloud_storage.search(query, types=types, **kwargs))
+    return jsonify(dict(page_data, query=query))
+
+@app.route('/api/suggest')
+def api_suggest():
+    """Typeahead suggestions as JSON: ?q=, optional ?kind= (repeatable) and ?limit=."""
+    query = request.args.get('q', '').strip()
+    try:
+        suggestions = cloud_storage.suggest(query, limit=request.args.get('limit', type=int),
+                                            kinds=request.args.getlist('kind') or None)
+    except ValueError:
+        abort(400)
+    return jsonify({'query': query, 'suggestions': suggestions})
 
 @app.route('/team')
 def team():
     """Team page."""
-    # Force a complete refresh by clearing any potential cache
-    import time
-    time.sleep(0.1)  # Small delay to ensure any caching is cleared
-    
     # Get all team members from the database
     team_members = cloud_storage.get_all_team_members()
-    print(f"Loaded {len(team_members)} team members from database")
+    logger.debug("Loaded %d team members from database", len(team_members))
     
     # Convert dictionaries to objects with attributes
     team_objects = []
+    log_items = logger.isEnabledFor(logging.DEBUG)
     for member_dict in team_members:
-        print(f"Team member: {member_dict.get('name', 'Unknown')} (ID: {member_dict.get('id', 'No ID')}) - Description: {member_dict.get('description', 'No description')[:100]}...")
+        if log_items:
+            logger.debug("Team member: %s (ID: %s)", member_dict.get('name', 'Unknown'), member_dict.get('id', 'No ID'), extra=SAMPLED)
         
         # Convert to object
         member_obj = DictToObject(member_dict)
@@ -535,16 +794,14 @@ def add_team_member():
 @login_required
 def edit_team_member(member_id):
     """Edit a team member."""
-    print(f"Edit team member request for member_id: {member_id}")
-    print(f"Current user: {current_user.email}")
+    logger.info("Edit team member request for %s by user %s", member_id, current_user.id)
     
     if not current_user.email.endswith('@national4hgeospatialteam.us'):
-        print("Unauthorized user attempted to edit team member")
+        logger.warning("Unauthorized user attempted to edit team member")
         flash('Only team members can edit team members.', 'error')
         return redirect(url_for('team'))
     
     if request.method == 'POST':
-        print("Processing POST request for team member edit")
         name = request.form.get('name')
         title = request.form.get('title')
         description = request.form.get('description')
@@ -552,21 +809,12 @@ def edit_team_member(member_id):
         member_type = request.form.get('member_type', 'board')
         year = request.form.get('year', '')
         
-        print(f"Form data received:")
-        print(f"  name: {name}")
-        print(f"  title: {title}")
-        print(f"  description: {description}")
-        print(f"  linkedin_url: {linkedin_url}")
-        print(f"  member_type: {member_type}")
-        print(f"  year: {year}")
-        
         if not all([name, title, description]):
-            print("Missing required fields")
+            logger.info("Missing required fields for team member %s", member_id)
             flash('Name, title, and description are required.', 'error')
             return redirect(url_for('edit_team_member', member_id=member_id))
         
         try:
-            print("Attempting to update team member in cloud storage")
             updated_member = cloud_storage.update_team_member(
                 member_id=member_id,
                 name=name,
@@ -577,22 +825,17 @@ def edit_team_member(member_id):
                 year=year
             )
             if updated_member:
-                print(f"Successfully updated team member: {member_id}")
+                logger.info("Successfully updated team member: %s", member_id)
                 flash('Team member updated successfully!', 'success')
             else:
-                print(f"Failed to update team member: {member_id}")
+                logger.warning("Failed to update team member: %s", member_id)
                 flash('Failed to update team member.', 'error')
             return redirect(url_for('team'))
         except Exception as e:
-            print(f"Error updating team member: {str(e)}")
+            logger.error("Error updating team member: %s", e)
             flash(f'Error updating team member: {str(e)}', 'error')
     
-    # Force a complete refresh by clearing any potential cache and reloading
-    import time
-    time.sleep(2)  # Increased delay to ensure any caching is cleared
-    
     fresh_team_member_dict = cloud_storage.get_team_member(member_id)
-    print(f"Rendering edit form with fresh data: {fresh_team_member_dict.get('updated_at', 'No updated_at') if fresh_team_member_dict else 'No data'}")
     
     if not fresh_team_member_dict:
         flash('Team member not found.', 'error')
@@ -873,7 +1116,7 @@ def extract_image_from_url(url):
         return None
         
     except Exception as e:
-        print(f"Error extracting image from {url}: {e}")
+        logger.error("Error extracting image from %s: %s", url, e)
         return None
 
 def save_uploaded_file(file):
@@ -890,7 +1133,7 @@ def save_uploaded_file(file):
             file_url = cloud_storage.upload_file(file, filename, 'uploads')
             return file_url
         except Exception as e:
-            print(f"Error uploading file: {e}")
+            logger.error("Error uploading file: %s", e)
             return None
     return None
 
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Script to move collections between per-record storage and snapshot + journal storage.
+Run it before switching STORAGE_MODE to 'journal', and with --to-records before
+switching back to 'records'.
+
+Usage: python migrate_to_journal.py [--to-records] [--compact] [projects/ gallery/ team_members/]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import CloudStorageManager, JOURNAL_COLLECTIONS
+
+def migrate(prefixes=None, to_records=False, compact=False):
+    """Create snapshots for (or export records from) the given journal collections."""
+    prefixes = prefixes or JOURNAL_COLLECTIONS
+    manager = CloudStorageManager(storage_mode='journal')
+    print("Exporting journal collections to records..." if to_records else "Migrating collections to snapshot + journal...")
+
+    for prefix in prefixes:
+        if not prefix.endswith('/'):
+            prefix = f'{prefix}/'
+        if prefix not in JOURNAL_COLLECTIONS:
+            print(f"✗ {prefix} is not a journal collection (expected one of {JOURNAL_COLLECTIONS})")
+            continue
+        try:
+            if to_records:
+                count = manager.export_journal_to_records(prefix)
+                print(f"✓ {prefix}: wrote {count} records")
+            elif compact:
+                count = manager.compact_journal(prefix)
+                print(f"✓ {prefix}: folded {count} journal entries")
+            else:
+                snapshot = manager.migrate_to_journal(prefix)
+                print(f"✓ {prefix}: snapshot holds {len(snapshot['items'])} records")
+        except Exception as e:
+            print(f"✗ Failed to migrate {prefix}: {str(e)}")
+
+    print("\nMigration complete!")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    migrate([a for a in args if not a.startswith('--')], to_records='--to-records' in args, compact='--compact' in args)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the site-wide search index, the project facet index, the
+typeahead index and the project spatial index from the stored collections.
+Writes keep them up to date; run this after editing objects by hand or
+changing what search_index.py, facet_index.py, suggest_index.py or
+spatial_index.py index.
+
+Usage: python rebuild_indexes.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import cloud_storage, SEARCH_INDEX_PATH, FACET_INDEX_PATH, SUGGEST_INDEX_PATH, GEO_INDEX_PATH
+
+def rebuild_indexes():
+    """Rebuild and save the search, facet, typeahead and spatial indexes."""
+    print("Rebuilding indexes...")
+    try:
+        stats = cloud_storage.rebuild_search_index().stats()
+        print(f"✓ {SEARCH_INDEX_PATH}: {stats['documents']} documents, {stats['terms']} terms")
+    except Exception as e:
+        print(f"✗ Failed to rebuild search index: {str(e)}")
+
+    try:
+        facets = cloud_storage.rebuild_facet_index()
+        print(f"✓ {FACET_INDEX_PATH}: {len(facets.docs)} projects")
+    except Exception as e:
+        print(f"✗ Failed to rebuild facet index: {str(e)}")
+
+    try:
+        stats = cloud_storage.rebuild_suggest_index().stats()
+        print(f"✓ {SUGGEST_INDEX_PATH}: {stats['documents']} records, {stats['phrases']} phrases")
+    except Exception as e:
+        print(f"✗ Failed to rebuild suggest index: {str(e)}")
+
+    try:
+        places = cloud_storage.rebuild_geo_index()
+        print(f"✓ {GEO_INDEX_PATH}: {len(places.docs)} geotagged projects")
+    except Exception as e:
+        print(f"✗ Failed to rebuild geo index: {str(e)}")
+
+    print("\nIndex rebuild complete!")
+
+if __name__ == "__main__":
+    rebuild_indexes()
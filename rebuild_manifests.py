@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild collection manifests from the individual record files.
+Run it whenever a manifest has drifted, e.g. after editing objects by hand.
+
+Usage: python rebuild_manifests.py [projects/ gallery/ ...]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import cloud_storage, MANIFEST_COLLECTIONS
+
+def rebuild_manifests(prefixes=None):
+    """Rebuild the manifests for the given collection prefixes (all by default)."""
+    prefixes = prefixes or MANIFEST_COLLECTIONS
+    print("Rebuilding collection manifests...")
+
+    for prefix in prefixes:
+        if not prefix.endswith('/'):
+            prefix = f'{prefix}/'
+        if prefix not in MANIFEST_COLLECTIONS:
+            print(f"✗ {prefix} is not a manifest collection (expected one of {MANIFEST_COLLECTIONS})")
+            continue
+        try:
+            manifest = cloud_storage.rebuild_manifest(prefix)
+            if manifest.get('failures'):
+                print(f"✗ {prefix}: not saved, {len(manifest['failures'])} records failed to load")
+                for path, error in manifest['failures'].items():
+                    print(f"    - {path}: {error}")
+            else:
+                print(f"✓ {prefix}: {len(manifest['items'])} records")
+        except Exception as e:
+            print(f"✗ Failed to rebuild {prefix}: {str(e)}")
+
+    print("\nManifest rebuild complete!")
+
+if __name__ == "__main__":
+    rebuild_manifests(sys.argv[1:])
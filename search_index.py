@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Inverted index for site-wide search over projects, gallery items and team members.
+Every document keeps its own weighted terms, so adding, replacing or removing a
+record only touches that record's postings. The bucket copy stores just the
+documents; postings are rebuilt in memory when an instance loads it.
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Indexed fields per collection and how much a match in each one counts
+SEARCH_FIELDS = {
+    'projects/': {'title': 3.0, 'tags': 2.0, 'creator_name': 2.0, 'description': 1.0},
+    'gallery/': {'title': 3.0, 'description': 1.0},
+    'team_members/': {'name': 3.0, 'title': 2.0, 'description': 1.0},
+}
+
+# Record fields copied into each document (hit field -> record field), so hits need no record reads
+DISPLAY_FIELDS = {
+    'projects/': {'title': 'title', 'link': 'project_link', 'image_url': 'image_url', 'created_at': 'created_at'},
+    'gallery/': {'title': 'title', 'image_url': 'image_url', 'created_at': 'created_at'},
+    'team_members/': {'title': 'name', 'subtitle': 'title', 'link': 'linkedin_url', 'created_at': 'created_at'},
+}
+
+# Characters of the description kept as the hit snippet
+SNIPPET_CHARS = 160
+
+# Query prefixes shorter than this are not expanded to longer terms
+MIN_PREFIX_CHARS = 2
+
+# Query prefixes expand to at most this many terms
+MAX_PREFIX_TERMS = 50
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the their this to was were will with
+""".split())
+
+
+def normalize_text(text: Any) -> str:
+    """Lowercase text and strip accents; lists (e.g. tags) are joined."""
+    if text is None:
+        return ''
+    if isinstance(text, (list, tuple)):
+        text = ' '.join(str(item) for item in text)
+    text = unicodedata.normalize('NFKD', str(text))
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def stem(word: str) -> str:
+    """Fold simple English plurals so 'maps' finds 'map'."""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: Any) -> List[str]:
+    """Split text into normalized, stemmed search terms."""
+    return [stem(word) for word in re.findall(r'[a-z0-9]+', normalize_text(text))
+            if len(word) > 1 and word not in STOPWORDS]
+
+
+class SearchIndex:
+    def __init__(self, docs: Dict[str, Dict] = None):
+        """Initialize the index from stored documents (key -> document)."""
+        self.docs = {}
+        self.postings = {}  # term -> {document key: weight}
+        self._terms = None  # sorted terms for prefix expansion, rebuilt after changes
+        for key, doc in (docs or {}).items():
+            self._add_doc(key, doc)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'SearchIndex':
+        """Load an index from its stored form."""
+        return cls((data or {}).get('docs'))
+
+    def to_dict(self) -> Dict:
+        """Get the stored form of the index."""
+        return {'docs': self.docs}
+
+    @staticmethod
+    def key(collection: str, record_id: str) -> str:
+        """Get the document key of a record."""
+        return f'{collection}{record_id}'
+
+    @staticmethod
+    def document(collection: str, record: Dict) -> Dict:
+        """Build the document for a record: display fields plus weighted terms."""
+        terms = Counter()
+        for field, weight in SEARCH_FIELDS[collection].items():
+            for term, count in Counter(tokenize(record.get(field))).items():
+                # Repeats count, but with diminishing returns
+                terms[term] += weight * (1 + math.log(count))
+        doc = {'collection': collection, 'id': record['id'],
+               'terms': {term: round(weight, 3) for term, weight in terms.items()}}
+        for name, field in DISPLAY_FIELDS[collection].items():
+            doc[name] = record.get(field)
+        description = record.get('description') or ''
+        doc['snippet'] = description[:SNIPPET_CHARS] + ('…' if len(description) > SNIPPET_CHARS else '')
+        return doc
+
+    def add(self, collection: str, record: Dict):
+        """Index a record, replacing its previous document; inactive records are removed."""
+        if not record.get('is_active', True):
+            self.remove(collection, record['id'])
+            return
+        key = self.key(collection, record['id'])
+        self._remove_doc(key)
+        self._add_doc(key, self.document(collection, record))
+
+    def remove(self, collection: str, record_id: str):
+        """Drop a record from the index."""
+        self._remove_doc(self.key(collection, record_id))
+
+    def apply(self, collection: str, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes (id -> record, or None to drop it) from one collection."""
+        for record_id, record in changes.items():
+            if record is None:
+                self.remove(collection, record_id)
+            else:
+                self.add(collection, record)
+
+    def search(self, query: str, collections: Iterable[str] = None) -> List[Dict]:
+        """Get the documents matching every query term, with a relevance score.
+
+        The last term also matches longer terms it is a prefix of, so results
+        keep up while a word is being typed.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        allowed = set(collections) if collections else None
+        total = len(self.docs)
+        scores = None
+        for position, term in enumerate(terms):
+            expanded = self._expand(term) if position == len(terms) - 1 else [term]
+            term_scores = {}
+            for match in expanded:
+                postings = self.postings.get(match, {})
+                idf = math.log(1 + total / len(postings)) if postings else 0.0
+                # Prefix matches rank below whole-word matches
+                factor = 1.0 if match == term else 0.5
+                for key, weight in postings.items():
+                    term_scores[key] = max(term_scores.get(key, 0.0), weight * idf * factor)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+            if not scores:
+                return []
+
+        hits = []
+        for key, score in scores.items():
+            doc = self.docs[key]
+            if allowed and doc['collection'] not in allowed:
+                continue
+            hit = {name: value for name, value in doc.items() if name not in ('terms', 'collection')}
+            hit['type'] = doc['collection'].rstrip('/')
+            hit['score'] = round(score, 4)
+            hits.append(hit)
+        return hits
+
+    def stats(self) -> Dict[str, int]:
+        """Get document and term counts."""
+        return {'documents': len(self.docs), 'terms': len(self.postings)}
+
+    def _expand(self, term: str) -> List[str]:
+        """Get the indexed terms starting with a prefix (the term itself first)."""
+        if len(term) < MIN_PREFIX_CHARS:
+            return [term]
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        matches = [term]
+        index = bisect_left(self._terms, term)
+        while index < len(self._terms) and self._terms[index].startswith(term) and len(matches) <= MAX_PREFIX_TERMS:
+            if self._terms[index] != term:
+                matches.append(self._terms[index])
+            index += 1
+        return matches
+
+    def _add_doc(self, key: str, doc: Dict):
+        """Add a document and its postings."""
+        self.docs[key] = doc
+        for term, weight in doc['terms'].items():
+            self.postings.setdefault(term, {})[key] = weight
+        self._terms = None
+
+    def _remove_doc(self, key: str):
+        """Remove a document and its postings, if present."""
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        for term in doc['terms']:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.postings[term]
+        self._terms = None
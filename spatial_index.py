@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Spatial index for geotagged projects. A project may carry a point
+(``location``: {'lat', 'lon'}) and/or an extent (``extent``: [west, south,
+east, north] in degrees, west > east when it crosses the antimeridian). Their
+boxes go into a packed R-tree (sort-tile-recursive bulk load), so radius and
+bounding box queries visit O(log n + k) nodes instead of every project. The
+tree is rebuilt in memory after changes; the bucket copy stores just the
+documents.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Mean Earth radius used for distances
+EARTH_RADIUS_KM = 6371.0088
+
+# Largest radius a proximity query may ask for
+MAX_RADIUS_KM = 5000.0
+
+# Default and largest number of projects a proximity query returns
+DEFAULT_NEAR_RESULTS = 50
+MAX_NEAR_RESULTS = 500
+
+# Children per R-tree node
+NODE_SIZE = 16
+
+# Record fields copied into each document (hit field -> record field), so hits need no record reads
+DISPLAY_FIELDS = {'title': 'title', 'project_type': 'project_type', 'link': 'project_link',
+                  'image_url': 'image_url', 'created_at': 'created_at'}
+
+Box = Tuple[float, float, float, float]  # west, south, east, north
+
+
+def check_location(location: Any) -> Optional[Dict[str, float]]:
+    """Validate a point as {'lat', 'lon'} in degrees (None or empty: no point); raises ValueError."""
+    if not location:
+        return None
+    try:
+        lat, lon = float(location['lat']), float(location['lon'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f'Invalid location {location!r}: expected lat and lon')
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f'Location out of range: lat {lat}, lon {lon}')
+    return {'lat': lat, 'lon': lon}
+
+
+def check_extent(extent: Any) -> Optional[List[float]]:
+    """Validate an extent as [west, south, east, north] in degrees (None or empty: no extent); raises ValueError."""
+    if not extent:
+        return None
+    try:
+        west, south, east, north = (float(value) for value in extent)
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid extent {extent!r}: expected west, south, east, north')
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        raise ValueError(f'Extent out of range: {[west, south, east, north]}')
+    return [west, south, east, north]
+
+
+def parse_extent(text: str) -> Optional[List[float]]:
+    """Parse 'west, south, east, north' (commas or spaces) into a checked extent; raises ValueError."""
+    values = [value for value in re.split(r'[\s,]+', (text or '').strip()) if value]
+    if not values:
+        return None
+    if len(values) != 4:
+        raise ValueError('An extent needs four numbers: west, south, east, north')
+    return check_extent(values)
+
+
+def project_point(record: Dict) -> Optional[Tuple[float, float]]:
+    """Get a project's representative (lon, lat): its location, else the center of its extent."""
+    location = record.get('location')
+    if location:
+        return location['lon'], location['lat']
+    extent = record.get('extent')
+    if extent:
+        west, south, east, north = extent
+        width = (east - west) % 360 if west > east else east - west
+        lon = west + width / 2
+        return (lon - 360 if lon > 180 else lon), (south + north) / 2
+    return None
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def split_box(west: float, south: float, east: float, north: float) -> List[Box]:
+    """Split a box crossing the antimeridian (west > east) into boxes that do not."""
+    if west > east:
+        return [(west, south, 180.0, north), (-180.0, south, east, north)]
+    return [(west, south, east, north)]
+
+
+def radius_box(lat: float, lon: float, radius_km: float) -> List[Box]:
+    """Get the boxes that bound a circle on the sphere (split at the antimeridian)."""
+    angle = radius_km / EARTH_RADIUS_KM
+    south = max(-90.0, lat - math.degrees(angle))
+    north = min(90.0, lat + math.degrees(angle))
+    if north >= 90 or south <= -90 or math.sin(angle) >= math.cos(math.radians(lat)):
+        # The circle reaches a pole, so it spans every longitude
+        return [(-180.0, south, 180.0, north)]
+    dlon = math.degrees(math.asin(math.sin(angle) / math.cos(math.radians(lat))))
+    west, east = lon - dlon, lon + dlon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return split_box(west, south, east, north)
+
+
+class RTree:
+    """Static packed R-tree over boxes: built once, then queried by bounding box."""
+
+    def __init__(self, boxes: List[Box], node_size: int = NODE_SIZE):
+        """Bulk-load the tree; items are identified by their position in ``boxes``."""
+        self.node_size = node_size
+        order = self._str_order(boxes)
+        self.items = order
+        # levels[0] holds the item boxes in packed order; every level above holds one box per node_size children
+        self.levels = [[boxes[index] for index in order]]
+        while len(self.levels[-1]) > node_size:
+            children = self.levels[-1]
+            self.levels.append([self._union(children[start:start + node_size])
+                                for start in range(0, len(children), node_size)])
+
+    def search(self, west: float, south: float, east: float, north: float) -> List[int]:
+        """Get the items whose boxes intersect a box (which must not cross the antimeridian)."""
+        found = []
+        top = len(self.levels) - 1
+        stack = [(top, index) for index in range(len(self.levels[top]))]
+        while stack:
+            level, index = stack.pop()
+            box = self.levels[level][index]
+            if box[0] > east or box[2] < west or box[1] > north or box[3] < south:
+                continue
+            if level == 0:
+                found.append(self.items[index])
+                continue
+            first = index * self.node_size
+            last = min(first + self.node_size, len(self.levels[level - 1]))
+            stack.extend((level - 1, child) for child in range(first, last))
+        return found
+
+    def _str_order(self, boxes: List[Box]) -> List[int]:
+        """Order items sort-tile-recursive: vertical slices by center x, each sorted by center y."""
+        def center_x(index):
+            return boxes[index][0] + boxes[index][2]
+
+        def center_y(index):
+            return boxes[index][1] + boxes[index][3]
+
+        leaves = math.ceil(len(boxes) / self.node_size)
+        slice_size = self.node_size * max(1, math.ceil(math.sqrt(leaves)))
+        by_x = sorted(range(len(boxes)), key=center_x)
+        order = []
+        for start in range(0, len(by_x), slice_size):
+            order.extend(sorted(by_x[start:start + slice_size], key=center_y))
+        return order
+
+    @staticmethod
+    def _union(boxes: List[Box]) -> Box:
+        """Get the box covering a group of boxes."""
+        return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+
+class SpatialIndex:
+    def __init__(self, docs: Dict[str, Dict] = None):
+        """Initialize the index from stored documents (project id -> document)."""
+        self.docs = dict(docs or {})
+        self._tree = None  # RTree over the documents' boxes, rebuilt after changes
+        self._tree_ids = None  # document id of each box in the tree
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'SpatialIndex':
+        """Load an index from its stored form."""
+        return cls((data or {}).get('docs'))
+
+    def to_dict(self) -> Dict:
+        """Get the stored form of the index."""
+        return {'docs': self.docs}
+
+    @staticmethod
+    def document(record: Dict) -> Optional[Dict]:
+        """Build the document for a project, or None if it has no geometry."""
+        point = project_point(record)
+        if point is None:
+            return None
+        doc = {'id': record['id'], 'point': list(point), 'extent': record.get('extent')}
+        for name, field in DISPLAY_FIELDS.items():
+            doc[name] = record.get(field)
+        return doc
+
+    def add(self, record: Dict):
+        """Index a project, replacing its previous document; inactive or unplaced projects are removed."""
+        doc = self.document(record) if record.get('is_active', True) else None
+        if doc is None:
+            self.remove(record['id'])
+            return
+        self.docs[record['id']] = doc
+        self._tree = None
+
+    def remove(self, record_id: str):
+        """Drop a project from the index."""
+        if self.docs.pop(record_id, None) is not None:
+            self._tree = None
+
+    def apply(self, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes (id -> record, or None to drop it)."""
+        for record_id, record in changes.items():
+            if record is None:
+                self.remove(record_id)
+            else:
+                self.add(record)
+
+    def within(self, west: float, south: float, east: float, north: float) -> List[Dict]:
+        """Get the projects whose point or extent intersects a box (west > east crosses the antimeridian)."""
+        return [self.hit(self.docs[record_id]) for record_id in self._search(split_box(west, south, east, north))]
+
+    def near(self, lat: float, lon: float, radius_km: float) -> List[Dict]:
+        """Get the projects within a radius of a point, nearest first, with their distance."""
+        hits = []
+        for record_id in self._search(radius_box(lat, lon, radius_km)):
+            doc = self.docs[record_id]
+            distance = self._distance_km(doc, lat, lon)
+            if distance <= radius_km:
+                hit = self.hit(doc)
+                hit['distance_km'] = round(distance, 3)
+                hits.append(hit)
+        hits.sort(key=lambda hit: (hit['distance_km'], hit['id']))
+        return hits
+
+    @staticmethod
+    def hit(doc: Dict) -> Dict:
+        """Get the public form of a document: display fields, location and extent."""
+        hit = {name: value for name, value in doc.items() if name != 'point'}
+        hit['location'] = {'lat': doc['point'][1], 'lon': doc['point'][0]}
+        return hit
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of placed projects."""
+        return {'documents': len(self.docs)}
+
+    def _search(self, boxes: List[Box]) -> List[str]:
+        """Get the ids of documents intersecting any of the boxes, each once."""
+        if self._tree is None:
+            tree_boxes, tree_ids = [], []
+            for record_id, doc in self.docs.items():
+                for box in self._boxes(doc):
+                    tree_boxes.append(box)
+                    tree_ids.append(record_id)
+            self._tree = RTree(tree_boxes)
+            self._tree_ids = tree_ids
+        found = {}
+        for box in boxes:
+            for item in self._tree.search(*box):
+                found[self._tree_ids[item]] = True
+        return list(found)
+
+    @staticmethod
+    def _boxes(doc: Dict) -> List[Box]:
+        """Get a document's boxes: its extent (split at the antimeridian) and its point."""
+        lon, lat = doc['point']
+        boxes = split_box(*doc['extent']) if doc.get('extent') else []
+        boxes.append((lon, lat, lon, lat))
+        return boxes
+
+    @staticmethod
+    def _distance_km(doc: Dict, lat: float, lon: float) -> float:
+        """Distance from a point to a document: to its point, or to the nearest part of its extent."""
+        lon0, lat0 = doc['point']
+        distance = haversine_km(lat, lon, lat0, lon0)
+        for west, south, east, north in (split_box(*doc['extent']) if doc.get('extent') else []):
+            nearest_lat = min(max(lat, south), north)
+            if west <= lon <= east:
+                nearest_lon = lon
+            else:
+                # Whichever edge is fewer degrees away around the globe
+                nearest_lon = min((west, east), key=lambda edge: abs((lon - edge + 180) % 360 - 180))
+            distance = min(distance, haversine_km(lat, lon, nearest_lat, nearest_lon))
+        return distance
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+In-process read-through cache for JSON objects loaded from Cloud Storage.
+Bounded by a byte budget with LRU eviction and a TTL per path prefix.
+Entries remember the blob generation they were read at, so once their TTL
+passes they can be revalidated instead of downloaded again.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+
+# Serialized JSON bytes kept per process; decoded objects take a few times more RAM,
+# so the default stays well inside an F1 instance's memory.
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# Seconds an entry is served before it is revalidated (or fetched again)
+DEFAULT_TTL = 30
+
+
+def parse_prefix_ttls(value: str) -> Dict[str, float]:
+    """Parse 'projects/=60,users/=10' into a prefix -> seconds mapping."""
+    ttls = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            prefix, seconds = item.split('=', 1)
+            ttls[prefix.strip()] = float(seconds)
+    return ttls
+
+
+class JsonCache:
+    def __init__(self, max_bytes: int = None, default_ttl: float = None, prefix_ttls: Dict[str, float] = None):
+        """Initialize the cache, reading unset limits from the environment."""
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.environ.get('STORAGE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.default_ttl = default_ttl if default_ttl is not None else float(os.environ.get('STORAGE_CACHE_TTL', DEFAULT_TTL))
+        self.prefix_ttls = prefix_ttls if prefix_ttls is not None else parse_prefix_ttls(os.environ.get('STORAGE_CACHE_TTLS', ''))
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # path -> (value, size, expires_at, generation, metageneration)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0,
+                          'revalidations': 0, 'not_modified': 0, 'confirmed': 0}
+
+    def ttl_for(self, path: str) -> float:
+        """Get the TTL for a path from its longest matching prefix."""
+        best = None
+        for prefix in self.prefix_ttls:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.prefix_ttls[best] if best is not None else self.default_ttl
+
+    def get(self, path: str) -> Optional[Any]:
+        """Return a private copy of a fresh cached value, or None on a miss.
+        
+        Expired entries that know their generation are kept so the caller can
+        revalidate them; see ``stale_generation`` and ``revalidated``.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            value, size, expires_at, generation, _ = entry
+            if expires_at <= time.monotonic():
+                if generation is None:
+                    self._remove(path)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(path)
+            self._counters['hits'] += 1
+        # Callers mutate loaded records, so never hand out the cached object itself
+        return copy.deepcopy(value)
+
+    def stale_generation(self, path: str) -> Optional[int]:
+        """Get the generation of an expired entry that can be revalidated, if any."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[2] > time.monotonic():
+                return None
+            self._counters['revalidations'] += 1
+            return entry[3]
+
+    def revalidated(self, path: str) -> Optional[Any]:
+        """Mark an expired entry as still current and return a copy of its value."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            value, size, _, generation, metageneration = entry
+            self._entries[path] = (value, size, time.monotonic() + self.ttl_for(path), generation, metageneration)
+            self._entries.move_to_end(path)
+            self._counters['not_modified'] += 1
+        return copy.deepcopy(value)
+
+    def generation(self, path: str):
+        """Get the (generation, metageneration) a cached path was read at, or None."""
+        with self._lock:
+            entry = self._entries.get(path)
+            return (entry[3], entry[4]) if entry else None
+
+    def generations(self, prefix: str) -> Dict[str, Optional[int]]:
+        """Get the generation every cached path under a prefix was read at."""
+        with self._lock:
+            return {path: entry[3] for path, entry in self._entries.items() if path.startswith(prefix)}
+
+    def confirm(self, path: str, generation: int) -> bool:
+        """Restart the TTL of an entry a listing showed is still at ``generation``."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[3] is None or entry[3] != generation:
+                return False
+            value, size, _, _, metageneration = entry
+            self._entries[path] = (value, size, time.monotonic() + self.ttl_for(path), generation, metageneration)
+            self._counters['confirmed'] += 1
+            return True
+
+    def put(self, path: str, value: Any, size: int, generation: int = None, metageneration: int = None):
+        """Store a value, evicting least recently used entries to stay within budget."""
+        ttl = self.ttl_for(path)
+        # Entries that would take over most of the budget are not worth caching
+        if ttl <= 0 or size > self.max_bytes // 2:
+            return
+        with self._lock:
+            if path in self._entries:
+                self._remove(path)
+            self._entries[path] = (copy.deepcopy(value), size, time.monotonic() + ttl, generation, metageneration)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, path: str):
+        """Drop a single path from the cache."""
+        with self._lock:
+            if path in self._entries:
+                self._remove(path)
+                self._counters['invalidations'] += 1
+
+    def invalidate_prefix(self, prefix: str):
+        """Drop every cached path under a prefix."""
+        with self._lock:
+            for path in [p for p in self._entries if p.startswith(prefix)]:
+                self._remove(path)
+                self._counters['invalidations'] += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current usage."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self.current_bytes
+            stats['max_bytes'] = self.max_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _remove(self, path: str):
+        """Remove an entry; the caller must hold the lock."""
+        size = self._entries.pop(path)[1]
+        self.current_bytes -= size
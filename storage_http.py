@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP connection pool for the Cloud Storage client.
+One authorized session per worker process is reused by every
+CloudStorageManager, sized so request threads plus the fetch pool never wait
+for a connection, with TCP keep-alive and counters to spot saturation.
+"""
+
+import os
+import socket
+import threading
+from typing import Any, Dict
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Threads each gunicorn worker serves requests on (keep in sync with --threads)
+WEB_THREADS = int(os.environ.get('WEB_THREADS', '1'))
+
+# Scope of the storage client's credentials
+STORAGE_SCOPES = ['https://www.googleapis.com/auth/devstorage.full_control']
+
+# Hosts (storage API, token endpoint, ...) that keep their own connection pool
+POOL_HOSTS = 4
+
+# Probe idle connections so load balancers do not drop them silently
+KEEPALIVE_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+for _name, _value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 15), ('TCP_KEEPCNT', 4)):
+    if hasattr(socket, _name):
+        KEEPALIVE_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _name), _value))
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that keeps sockets alive and counts in-flight requests against the pool size."""
+
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._counters = {'requests': 0, 'in_flight': 0, 'peak_in_flight': 0, 'saturated': 0}
+        # pool_block=False: past pool_size a request opens an extra connection instead of waiting
+        super().__init__(pool_connections=POOL_HOSTS, pool_maxsize=pool_size, pool_block=False)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + KEEPALIVE_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        with self._lock:
+            self._counters['requests'] += 1
+            self._counters['in_flight'] += 1
+            in_flight = self._counters['in_flight']
+            if in_flight > self._counters['peak_in_flight']:
+                self._counters['peak_in_flight'] = in_flight
+            if in_flight > self.pool_size:
+                # This request's connection will not fit back into the pool
+                self._counters['saturated'] += 1
+                if self._counters['saturated'] == 1:
+                    logger.warning("Storage HTTP pool saturated: %s requests in flight, pool size %s", in_flight, self.pool_size)
+        try:
+            return super().send(request, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._counters['in_flight'] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request counters plus connections opened and idle per host."""
+        with self._lock:
+            stats = dict(self._counters)
+        stats['pool_size'] = self.pool_size
+        stats['connections_opened'] = 0
+        stats['idle_connections'] = 0
+        for key in list(self.poolmanager.pools.keys()):
+            pool = self.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            stats['connections_opened'] += pool.num_connections
+            stats['idle_connections'] += sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+        return stats
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(credentials, pool_size: int):
+    """Get the worker-wide authorized session, recreating it after a fork (sockets are not shared)."""
+    global _session, _session_pid
+    from google.auth.transport.requests import AuthorizedSession
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = AuthorizedSession(credentials)
+            adapter = PooledAdapter(pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
+
+def http_pool_stats() -> Dict[str, Any]:
+    """Get the shared pool's counters (empty before the first client is created)."""
+    if _session is None or _session_pid != os.getpid():
+        return {}
+    return _session.get_adapter('https://').stats()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Counters and latency histograms for Cloud Storage operations, rendered in the
+Prometheus text exposition format. Operations are labelled by kind
+(get/stat/exists/list/save/delete) and collection prefix, and each
+web request records how many operations it made so N+1 patterns stand out.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from google.api_core.exceptions import NotFound, NotModified, PreconditionFailed
+
+# Histogram upper bounds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+LISTING_BUCKETS = [1, 10, 50, 100, 250, 500, 1000, 5000]
+REQUEST_OPS_BUCKETS = [0, 1, 2, 5, 10, 25, 50, 100]
+
+# Operation counter of the web request running in this context (None outside requests)
+_request_ops = contextvars.ContextVar('storage_request_ops', default=None)
+
+
+def path_prefix(path: str) -> str:
+    """Label a path by its top-level prefix, e.g. 'projects/abc.json' -> 'projects/'."""
+    return path.split('/', 1)[0] + '/' if '/' in path else '/'
+
+
+def outcome_of(error: Optional[BaseException]) -> str:
+    """Label how an operation ended."""
+    if error is None:
+        return 'ok'
+    if isinstance(error, NotFound):
+        return 'not_found'
+    if isinstance(error, NotModified):
+        return 'not_modified'
+    if isinstance(error, PreconditionFailed):
+        return 'precondition_failed'
+    return 'error'
+
+
+class Histogram:
+    def __init__(self, buckets: List[float]):
+        """Initialize an empty histogram with the given upper bounds."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one value; the caller must hold the metrics lock."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        """Yield the _bucket/_sum/_count sample lines."""
+        sep = ',' if labels else ''
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels}{sep}le="{bound:g}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.sum:.6f}' if labels else f'{name}_sum {self.sum:.6f}'
+        yield f'{name}_count{{{labels}}} {self.count}' if labels else f'{name}_count {self.count}'
+
+
+class StorageMetrics:
+    def __init__(self):
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self._operations = {}  # (op, prefix, outcome) -> count
+        self._latency = {}  # (op, prefix) -> Histogram
+        self._listed = {}  # prefix -> Histogram of objects per listing
+        self._request_ops = {}  # endpoint -> Histogram of operations per request
+
+    @contextmanager
+    def timed(self, op: str, path: str):
+        """Time one storage operation on a path and count it, whatever its outcome."""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.observe(op, path_prefix(path), time.perf_counter() - start, outcome_of(error))
+
+    def observe(self, op: str, prefix: str, seconds: float, outcome: str = 'ok'):
+        """Record a finished operation."""
+        request_ops = _request_ops.get()
+        with self._lock:
+            key = (op, prefix, outcome)
+            self._operations[key] = self._operations.get(key, 0) + 1
+            histogram = self._latency.get((op, prefix))
+            if histogram is None:
+                histogram = self._latency[(op, prefix)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            if request_ops is not None:
+                request_ops[0] += 1
+
+    def observe_listing(self, prefix: str, count: int):
+        """Record how many objects a listing returned."""
+        with self._lock:
+            histogram = self._listed.get(prefix)
+            if histogram is None:
+                histogram = self._listed[prefix] = Histogram(LISTING_BUCKETS)
+            histogram.observe(count)
+
+    def begin_request(self):
+        """Start counting the operations made by the current request (and work it hands to the fetch pool)."""
+        return _request_ops.set([0])
+
+    def end_request(self, endpoint: str, token=None) -> int:
+        """Stop counting for the current request, record the count under its endpoint and return it."""
+        request_ops = _request_ops.get()
+        if token is not None:
+            _request_ops.reset(token)
+        else:
+            _request_ops.set(None)
+        if request_ops is None:
+            return 0
+        with self._lock:
+            histogram = self._request_ops.get(endpoint)
+            if histogram is None:
+                histogram = self._request_ops[endpoint] = Histogram(REQUEST_OPS_BUCKETS)
+            histogram.observe(request_ops[0])
+        return request_ops[0]
+
+    def render(self, gauges: Dict[str, Dict[str, Any]] = None) -> str:
+        """Render every metric in the Prometheus text format.
+
+        ``gauges`` maps a metric name to ``{'help': ..., 'values': {label_string: value}}``
+        (plus an optional ``'type'``, default gauge) for values owned elsewhere
+        (cache, connection pool).
+        """
+        lines = []
+        with self._lock:
+            lines += ['# HELP storage_operations_total Cloud Storage operations by kind, prefix and outcome.',
+                      '# TYPE storage_operations_total counter']
+            for (op, prefix, outcome), count in sorted(self._operations.items()):
+                lines.append(f'storage_operations_total{{op="{op}",prefix="{prefix}",outcome="{outcome}"}} {count}')
+
+            lines += ['# HELP storage_operation_seconds Cloud Storage operation latency.',
+                      '# TYPE storage_operation_seconds histogram']
+            for (op, prefix), histogram in sorted(self._latency.items()):
+                lines += histogram.render('storage_operation_seconds', f'op="{op}",prefix="{prefix}"')
+
+            lines += ['# HELP storage_listing_objects Objects returned per listing.',
+                      '# TYPE storage_listing_objects histogram']
+            for prefix, histogram in sorted(self._listed.items()):
+                lines += histogram.render('storage_listing_objects', f'prefix="{prefix}"')
+
+            lines += ['# HELP storage_operations_per_request Cloud Storage operations made per web request.',
+                      '# TYPE storage_operations_per_request histogram']
+            for endpoint, histogram in sorted(self._request_ops.items()):
+                lines += histogram.render('storage_operations_per_request', f'endpoint="{endpoint}"')
+
+        for name, gauge in (gauges or {}).items():
+            lines += [f'# HELP {name} {gauge["help"]}', f'# TYPE {name} {gauge.get("type", "gauge")}']
+            for labels, value in gauge['values'].items():
+                lines.append(f'{name}{{{labels}}} {value}' if labels else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry shared by every storage manager
+metrics = StorageMetrics()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Typeahead index for the search box: project titles, tags, creator names and
+team member names. Every phrase is filed under each of its word starts in one
+sorted array, kept in step with writes, so a keystroke is a binary search plus
+a walk over the matching range, and repeated prefixes are answered from a
+memo until the next write.
+Phrases are ranked by recency: each record adds a weight that doubles every
+RECENCY_HALF_LIFE_DAYS, so newer and more widely used phrases come first.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from facet_index import split_tags
+from search_index import normalize_text
+
+# Phrases offered per collection: record field -> suggestion kind
+SUGGEST_FIELDS = {
+    'projects/': {'title': 'project', 'tags': 'tag', 'creator_name': 'creator'},
+    'team_members/': {'name': 'team_member'},
+}
+
+# A record's weight doubles for every this many days it is newer than another's
+RECENCY_HALF_LIFE_DAYS = 180
+
+# Fixed origin for recency weights; ratios between weights do not depend on it
+RECENCY_EPOCH = datetime(2024, 1, 1)
+
+# Default and largest number of suggestions returned
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 20
+
+# Ranked results kept per (prefix, kinds) until the next change; the memo is emptied when it fills
+MEMO_SIZE = 1024
+
+# Longest phrase kept (titles can be long; nobody types past this)
+MAX_PHRASE_CHARS = 120
+
+
+def phrase_key(text: str) -> str:
+    """Normalize a phrase or query for prefix matching: accents folded, punctuation to single spaces."""
+    return ' '.join(re.findall(r'[a-z0-9]+', normalize_text(text)))
+
+
+def recency_weight(created_at: Optional[str]) -> float:
+    """Get a record's weight from its ISO creation time (records without one weigh as of the epoch)."""
+    try:
+        created = datetime.fromisoformat(created_at[:19]) if created_at else RECENCY_EPOCH
+    except ValueError:
+        created = RECENCY_EPOCH
+    return 2.0 ** ((created - RECENCY_EPOCH).days / RECENCY_HALF_LIFE_DAYS)
+
+
+class SuggestIndex:
+    def __init__(self, docs: Dict[str, Dict] = None):
+        """Initialize the index from stored documents (key -> document)."""
+        self.docs = {}
+        self.entries = {}  # (kind, phrase key) -> {'text', 'kind', 'docs': set of document keys, 'weight'}
+        self._keys = None  # sorted (word start, entry) pairs, built on first use and kept in step
+        self._memo = {}  # (prefix, kinds) -> ranked entry keys, cleared after changes
+        for key, doc in (docs or {}).items():
+            self._add_doc(key, doc)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'SuggestIndex':
+        """Load an index from its stored form."""
+        return cls((data or {}).get('docs'))
+
+    def to_dict(self) -> Dict:
+        """Get the stored form of the index."""
+        return {'docs': self.docs}
+
+    @staticmethod
+    def key(collection: str, record_id: str) -> str:
+        """Get the document key of a record."""
+        return f'{collection}{record_id}'
+
+    @staticmethod
+    def document(collection: str, record: Dict) -> Dict:
+        """Build the document for a record: its id, recency weight and (kind, text) phrases."""
+        phrases = []
+        for field, kind in SUGGEST_FIELDS[collection].items():
+            values = split_tags(record.get(field)) if kind == 'tag' else [record.get(field)]
+            for value in values:
+                text = ' '.join(str(value or '').split())[:MAX_PHRASE_CHARS]
+                if phrase_key(text):
+                    phrases.append([kind, text])
+        return {'id': record['id'], 'weight': recency_weight(record.get('created_at')), 'phrases': phrases}
+
+    def add(self, collection: str, record: Dict):
+        """Index a record, replacing its previous document; inactive records are removed."""
+        key = self.key(collection, record['id'])
+        self._remove_doc(key)
+        if record.get('is_active', True):
+            self._add_doc(key, self.document(collection, record))
+
+    def remove(self, collection: str, record_id: str):
+        """Drop a record from the index."""
+        self._remove_doc(self.key(collection, record_id))
+
+    def apply(self, collection: str, changes: Dict[str, Optional[Dict]]):
+        """Apply record changes (id -> record, or None to drop it) from one collection."""
+        for record_id, record in changes.items():
+            if record is None:
+                self.remove(collection, record_id)
+            else:
+                self.add(collection, record)
+
+    def suggest(self, query: str, limit: int = None, kinds: List[str] = None) -> List[Dict]:
+        """Get the best phrases with a word starting with the query, newest and most used first."""
+        prefix = phrase_key(query)
+        if not prefix:
+            return []
+        limit = min(max(limit or DEFAULT_SUGGESTIONS, 1), MAX_SUGGESTIONS)
+        memo_key = (prefix, tuple(sorted(kinds)) if kinds else None)
+        ranked = self._memo.get(memo_key)
+        if ranked is None:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo = {}
+            ranked = self._memo[memo_key] = self._ranked(prefix, MAX_SUGGESTIONS, set(kinds) if kinds else None)
+        results = []
+        for entry_key in ranked[:limit]:
+            entry = self.entries[entry_key]
+            suggestion = {'text': entry['text'], 'kind': entry['kind'], 'count': len(entry['docs'])}
+            if entry['kind'] in ('project', 'team_member') and len(entry['docs']) == 1:
+                suggestion['id'] = self.docs[next(iter(entry['docs']))]['id']
+            results.append(suggestion)
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Get document and phrase counts."""
+        return {'documents': len(self.docs), 'phrases': len(self.entries)}
+
+    def _ranked(self, prefix: str, limit: int, kinds: set = None) -> List[Tuple[str, str]]:
+        """Get the keys of the heaviest entries with a word starting with a prefix."""
+        keys = self._sorted_keys()
+        matched = set()
+        index = bisect_left(keys, (prefix,))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            entry_key = keys[index][1]
+            if kinds is None or entry_key[0] in kinds:
+                matched.add(entry_key)
+            index += 1
+        return heapq.nlargest(limit, matched, key=lambda entry_key: (self.entries[entry_key]['weight'], entry_key))
+
+    def _sorted_keys(self) -> List[Tuple[str, Tuple[str, str]]]:
+        """Get every (word start, entry key) pair in order, building the array on first use."""
+        if self._keys is None:
+            self._keys = sorted((start, entry_key) for entry_key in self.entries for start in self._word_starts(entry_key))
+        return self._keys
+
+    @staticmethod
+    def _word_starts(entry_key: Tuple[str, str]) -> List[str]:
+        """Get the tails of a phrase key starting at each of its words."""
+        words = entry_key[1].split(' ')
+        return [' '.join(words[position:]) for position in range(len(words))]
+
+    def _add_doc(self, key: str, doc: Dict):
+        """Add a document's weight to each of its phrases."""
+        self.docs[key] = doc
+        for kind, text in doc['phrases']:
+            entry_key = (kind, phrase_key(text))
+            entry = self.entries.get(entry_key)
+            if entry is None:
+                entry = self.entries[entry_key] = {'text': text, 'kind': kind, 'docs': set(), 'weight': 0.0}
+                if self._keys is not None:
+                    for start in self._word_starts(entry_key):
+                        insort(self._keys, (start, entry_key))
+            if key not in entry['docs']:
+                entry['docs'].add(key)
+                entry['weight'] += doc['weight']
+        self._memo = {}
+
+    def _remove_doc(self, key: str):
+        """Remove a document's weight from its phrases, dropping phrases nothing uses any more."""
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        for kind, text in doc['phrases']:
+            entry_key = (kind, phrase_key(text))
+            entry = self.entries.get(entry_key)
+            if entry is None:
+                continue
+            entry['docs'].discard(key)
+            if entry['docs']:
+                entry['weight'] = self._entry_weight(entry)
+            else:
+                del self.entries[entry_key]
+                if self._keys is not None:
+                    for start in self._word_starts(entry_key):
+                        del self._keys[bisect_left(self._keys, (start, entry_key))]
+        self._memo = {}
+
+    def _entry_weight(self, entry: Dict) -> float:
+        """Sum the weights of the documents using a phrase (summed afresh after removals, so they never drift)."""
+        return sum(self.docs[key]['weight'] for key in entry['docs'])
@@ -21,21 +21,21 @@ def sync_deployed_data():
     
     # Force update each team member to ensure consistency
     print("\n=== Force Updating All Team Members ===")
+    updates = {}
     for member in all_members:
-        member_id = member['id']
-        print(f"\nUpdating {member['name']} (ID: {member_id})...")
-        
-        # Force update with current data
-        updated = cloud_storage.update_team_member(
-            member_id=member_id,
-            name=member['name'],
-            title=member['title'],
-            description=member['description'],
-            linkedin_url=member.get('linkedin_url', ''),
-            member_type=member.get('member_type', 'board'),
-            year=member.get('year', '')
-        )
-        
+        updates[member['id']] = {
+            'name': member['name'],
+            'title': member['title'],
+            'description': member['description'],
+            'linkedin_url': member.get('linkedin_url', ''),
+            'member_type': member.get('member_type', 'board'),
+            'year': member.get('year', '')
+        }
+    
+    # Force update with current data
+    results = cloud_storage.update_team_members(updates)
+    for member in all_members:
+        updated = results.get(member['id'])
         if updated:
             print(f"✅ Successfully updated {member['name']}")
             print(f"   New updated_at: {updated.get('updated_at', 'No updated_at')}")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the asyncio storage client returns the same data as the blocking one
+"""
+import asyncio
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import CloudStorageManager
+from async_cloud_storage import AsyncCloudStorageManager
+
+async def test_async_storage():
+    """Compare listings and a concurrent user fan-out between both clients."""
+    print("🔍 Testing Async Storage Client...")
+    blocking = CloudStorageManager()
+
+    async with AsyncCloudStorageManager() as storage:
+        print("\n=== Test 1: Listings Match ===")
+        for name in ('get_all_projects', 'get_all_gallery_items', 'get_all_team_members'):
+            expected = [record['id'] for record in getattr(blocking, name)()]
+            actual = [record['id'] for record in await getattr(storage, name)()]
+            print(f"{'✓' if actual == expected else '❌'} {name}: {len(actual)} records")
+
+        print("\n=== Test 2: Concurrent User Fan-Out ===")
+        user_ids = [user['id'] for user in blocking.get_all_users()]
+        storage.cache.clear()
+        start = time.perf_counter()
+        users = await storage.get_users_by_ids(user_ids)
+        elapsed = time.perf_counter() - start
+        loaded = sum(1 for user in users if user)
+        print(f"{'✓' if loaded == len(user_ids) else '❌'} Loaded {loaded}/{len(user_ids)} users in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    asyncio.run(test_async_storage())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script to verify globe clusters keep every project's count at each zoom (no bucket needed)
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cluster_index import ClusterIndex, clamp_zoom, mercator_x, mercator_y, mercator_lon, mercator_lat, MIN_ZOOM, MAX_ZOOM
+
+WORLD = [-180, -90, 180, 90]
+
+def make_docs():
+    """Spatial documents: a tight group in Europe, a spread over the Pacific and scattered points."""
+    random.seed(11)
+    docs = [{'id': f'eu{i}', 'point': [2 + random.uniform(-0.01, 0.01), 48 + random.uniform(-0.01, 0.01)]}
+            for i in range(50)]
+    docs += [{'id': f'pac{i}', 'point': [random.choice((-1, 1)) * random.uniform(175, 180), random.uniform(-20, -10)]}
+             for i in range(30)]
+    docs += [{'id': f'any{i}', 'point': [random.uniform(-180, 180), random.uniform(-60, 60)]} for i in range(120)]
+    return docs
+
+def point_count(features):
+    """Total projects behind a list of features."""
+    return sum(feature['properties'].get('point_count', 1) for feature in features)
+
+def test_mercator_round_trip():
+    """Projecting and unprojecting returns the same point."""
+    print("\n=== Test 1: Web Mercator ===")
+    for lon, lat in ((0, 0), (-179.5, 60), (151.2, -33.9)):
+        assert abs(mercator_lon(mercator_x(lon)) - lon) < 1e-9
+        assert abs(mercator_lat(mercator_y(lat)) - lat) < 1e-9
+    assert mercator_y(90) == mercator_y(89.9) > 0
+    print("✓ Points round-trip; poles clamp to the Mercator limit")
+
+def test_counts_per_zoom():
+    """Every zoom accounts for every project once, with fewer nodes as the view widens."""
+    print("\n=== Test 2: Counts Per Zoom ===")
+    docs = make_docs()
+    index = ClusterIndex(docs)
+    sizes = []
+    for zoom in range(MIN_ZOOM, MAX_ZOOM + 2):
+        features = index.clusters(WORLD, zoom)
+        assert point_count(features) == len(docs), (zoom, point_count(features))
+        sizes.append(len(features))
+    assert sizes == sorted(sizes), sizes
+    assert sizes[0] < len(docs) // 4 and sizes[-1] == len(docs)
+    assert index.stats() == {'points': len(docs), 'top_level_nodes': sizes[0]}
+    europe = [f for f in index.clusters([1, 47, 3, 49], MIN_ZOOM) if f['properties'].get('cluster')]
+    assert any(f['properties']['point_count'] >= 50 for f in europe)
+    print(f"✓ {len(docs)} projects at every zoom; nodes per zoom {sizes}")
+
+def test_boxes_and_antimeridian():
+    """Box queries count only what is inside, and boxes crossing ±180 see both sides."""
+    print("\n=== Test 3: Boxes ===")
+    docs = make_docs()
+    index = ClusterIndex(docs)
+    unclustered = MAX_ZOOM + 1
+    pacific = index.clusters([170, -25, -170, -5], unclustered)
+    expected = {doc['id'] for doc in docs if (doc['point'][0] >= 170 or doc['point'][0] <= -170)
+                and -25 <= doc['point'][1] <= -5}
+    assert {feature['properties']['id'] for feature in pacific} == expected
+    assert point_count(index.clusters([170, -25, -170, -5], 3)) >= 30
+    single = index.clusters(WORLD, unclustered)[0]
+    assert 'point' not in single['properties'] and single['geometry']['type'] == 'Point'
+    print(f"✓ {len(expected)} projects across the antimeridian")
+
+def test_clamp_zoom():
+    """Zooms outside the served range are clamped."""
+    print("\n=== Test 4: Zoom Clamp ===")
+    assert clamp_zoom(-1000) == MIN_ZOOM
+    assert clamp_zoom(99) == MAX_ZOOM + 1
+    assert clamp_zoom(5) == 5
+    index = ClusterIndex(make_docs())
+    assert index.clusters(WORLD, 99) == index.clusters(WORLD, MAX_ZOOM + 1)
+    assert index.clusters(WORLD, -3) == index.clusters(WORLD, MIN_ZOOM)
+    print("✓ Out-of-range zooms served the nearest level")
+
+if __name__ == "__main__":
+    print("🔍 Testing Cluster Index...")
+    test_mercator_round_trip()
+    test_counts_per_zoom()
+    test_boxes_and_antimeridian()
+    test_clamp_zoom()
@@ -59,7 +59,8 @@ def test_data_consistency():
     
     # Test 3: Check file listing vs actual data
     print("\n=== Test 3: File Listing Check ===")
-    files = cloud_storage._list_files('team_members/')
+    # Record files only: the manifest and other '_' objects share the prefix
+    files = cloud_storage._list_record_files('team_members/')
     print(f"Files found: {len(files)}")
     for file_path in files:
         print(f"  - {file_path}")
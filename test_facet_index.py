@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify facet filtering and per-facet counts under filters (no bucket needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from facet_index import FacetIndex, split_tags, PROJECT_TYPES, PROJECT_COLLECTIONS
+
+PROJECTS = [
+    {'id': 'p1', 'project_type': 'Web App', 'tags': 'Water, GIS', 'created_at': '2024-03-02T10:00:00'},
+    {'id': 'p2', 'project_type': 'Dashboard', 'tags': 'water', 'created_at': '2024-03-20T10:00:00'},
+    {'id': 'p3', 'project_type': 'Dataset', 'tags': ['soil', ' GIS '], 'created_at': '2024-04-01T10:00:00'},
+    {'id': 'p4', 'project_type': 'Form', 'tags': '', 'created_at': '2024-04-15T10:00:00'},
+    {'id': 'p5', 'project_type': 'Web App', 'tags': 'water', 'created_at': '2024-04-20T10:00:00', 'is_active': False},
+]
+
+def build_index():
+    """Index the sample projects."""
+    index = FacetIndex()
+    index.apply({project['id']: project for project in PROJECTS})
+    return index
+
+def counts_of(counts, facet):
+    """A facet's counts as value -> count, zero counts included."""
+    return {item['value']: item['count'] for item in counts[facet]}
+
+def test_split_tags():
+    """Tags are trimmed, lowercased and deduplicated, from strings or lists."""
+    print("\n=== Test 1: Tags ===")
+    assert split_tags(' Water , water,GIS,, ') == ['water', 'gis']
+    assert split_tags(['Soil', 'soil ']) == ['soil']
+    assert split_tags(None) == []
+    print("✓ Tags normalized")
+
+def test_match():
+    """Values within a facet are ORed, facets are ANDed, tags match case-insensitively."""
+    print("\n=== Test 2: Match ===")
+    index = build_index()
+    assert index.match() == {'p1', 'p2', 'p3', 'p4'}, "inactive projects are not indexed"
+    assert index.match({'type': ['Web App', 'Dashboard']}) == {'p1', 'p2'}
+    assert index.match({'collection': ['apps'], 'tag': ['GIS']}) == {'p1'}
+    assert index.match({'month': ['2024-04'], 'tag': ['water']}) == set()
+    assert index.match({'tag': []}) == {'p1', 'p2', 'p3', 'p4'}, "empty filters are ignored"
+    print("✓ OR within a facet, AND across facets")
+
+def test_counts_without_filters():
+    """Every type and collection is listed even at zero; tags and months only when used."""
+    print("\n=== Test 3: Counts ===")
+    counts = build_index().counts()
+    assert [item['value'] for item in counts['type']] == PROJECT_TYPES
+    assert counts_of(counts, 'type')['Web App'] == 1 and counts_of(counts, 'type')['Story Map'] == 0
+    assert counts_of(counts, 'collection') == {'data': 1, 'documents': 1, 'apps': 2}
+    assert list(counts_of(counts, 'collection')) == list(PROJECT_COLLECTIONS)
+    assert counts['tag'] == [{'value': 'gis', 'count': 2}, {'value': 'water', 'count': 2}, {'value': 'soil', 'count': 1}]
+    assert counts['month'] == [{'value': '2024-04', 'count': 2}, {'value': '2024-03', 'count': 2}]
+    print("✓ Unfiltered counts")
+
+def test_counts_under_filters():
+    """Each facet's counts apply the other facets' filters but not its own."""
+    print("\n=== Test 4: Counts Under Filters ===")
+    index = build_index()
+    counts = index.counts({'tag': ['water'], 'type': ['Web App']})
+    # Types are counted under the tag filter only, so the other water project's type still shows
+    assert counts_of(counts, 'type')['Dashboard'] == 1 and counts_of(counts, 'type')['Web App'] == 1
+    # Tags are counted under the type filter only
+    assert counts_of(counts, 'tag') == {'gis': 1, 'water': 1}
+    assert counts_of(counts, 'month') == {'2024-03': 1}
+    within = index.counts({'collection': ['apps']}, within={'p2', 'p3'})
+    assert counts_of(within, 'type')['Dashboard'] == 1 and counts_of(within, 'type')['Web App'] == 0
+    assert counts_of(within, 'collection') == {'data': 1, 'documents': 0, 'apps': 1}
+    print("✓ Disjunctive counts, narrowed by search results")
+
+def test_updates():
+    """Updates move a project between values and drop values nothing uses."""
+    print("\n=== Test 5: Updates ===")
+    index = build_index()
+    index.apply({'p3': dict(PROJECTS[2], tags='water', project_type='Story Map'), 'p4': None})
+    assert index.match({'tag': ['soil']}) == set() and 'soil' not in index.postings['tag']
+    assert index.match({'collection': ['apps'], 'tag': ['water']}) == {'p1', 'p2', 'p3'}
+    restored = FacetIndex.from_dict(index.to_dict())
+    assert restored.counts() == index.counts()
+    print("✓ Changes applied; stored form reloads to the same counts")
+
+if __name__ == "__main__":
+    print("🔍 Testing Facet Index...")
+    test_split_tags()
+    test_match()
+    test_counts_without_filters()
+    test_counts_under_filters()
+    test_updates()
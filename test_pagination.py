@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cursor pagination and invalid cursor handling (no bucket needed)
+"""
+import sys
+import os
+import base64
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import CloudStorageManager, encode_cursor, decode_cursor, MAX_PAGE_SIZE
+
+# The manager connects on first use, and paging never touches the bucket
+storage = CloudStorageManager()
+
+def make_records(count):
+    """Records with distinct creation times, plus one sharing p04's so the tie falls back to the id."""
+    records = [{'id': f'p{i:02d}', 'created_at': f'2024-01-{i + 1:02d}T00:00:00'} for i in range(count)]
+    records.append({'id': 'tie-a', 'created_at': '2024-01-05T00:00:00'})
+    return records
+
+def raw_cursor(value):
+    """Encode any JSON value the way encode_cursor does, for malformed cursors."""
+    return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii').rstrip('=')
+
+def test_cursor_pages_cover_everything_once():
+    """Following next_cursor visits every record once, newest first, ties ordered by id."""
+    print("\n=== Test 1: Cursor Walk ===")
+    records = make_records(10)
+    seen = []
+    result = storage._paginate(records, 'created_at', limit=3)
+    while True:
+        seen.extend(record['id'] for record in result['items'])
+        if not result['next_cursor']:
+            break
+        result = storage._paginate(records, 'created_at', limit=3, cursor=result['next_cursor'])
+    expected = [record['id'] for record in sorted(records, key=lambda r: (r['created_at'], r['id']), reverse=True)]
+    assert seen == expected, seen
+    assert seen.index('tie-a') == seen.index('p04') - 1
+    print(f"✓ {len(seen)} records in {len(seen) // 3 + 1} pages, none repeated")
+
+def test_cursor_is_stable_under_inserts():
+    """A record created after a page was served does not shift the next page."""
+    print("\n=== Test 2: Inserts Between Pages ===")
+    records = make_records(6)
+    first = storage._paginate(records, 'created_at', limit=2)
+    records.append({'id': 'new', 'created_at': '2025-01-01T00:00:00'})
+    second = storage._paginate(records, 'created_at', limit=2, cursor=first['next_cursor'])
+    assert [r['id'] for r in second['items']] == ['p04', 'p03'], second['items']
+    assert second['page'] is None and second['total'] == 8
+    print("✓ Second page unchanged by the new record")
+
+def test_numbered_pages_and_limits():
+    """Numbered pages slice by offset, and limits are clamped."""
+    print("\n=== Test 3: Numbered Pages ===")
+    records = make_records(10)
+    result = storage._paginate(records, 'created_at', limit=4, page=3)
+    assert [r['id'] for r in result['items']] == ['p02', 'p01', 'p00'] and result['next_cursor'] is None
+    assert storage._paginate(records, 'created_at', limit=10 ** 6)['limit'] == MAX_PAGE_SIZE
+    assert storage._paginate(records, 'created_at', limit=-5)['limit'] == 1
+    print("✓ Last page has no cursor; limits clamped")
+
+def test_numeric_sort_field():
+    """Score-ordered hits page by number, records without a score sorting last."""
+    print("\n=== Test 4: Numeric Sort ===")
+    hits = [{'id': 'a', 'score': 2.5}, {'id': 'b', 'score': 10}, {'id': 'c'}, {'id': 'd', 'score': 7}]
+    first = storage._paginate(hits, 'score', limit=2)
+    second = storage._paginate(hits, 'score', limit=2, cursor=first['next_cursor'])
+    assert [h['id'] for h in first['items'] + second['items']] == ['b', 'd', 'a', 'c']
+    print("✓ Hits ordered by score across pages")
+
+def test_invalid_cursors():
+    """Malformed cursors, or ones from a listing with another sort type, raise ValueError."""
+    print("\n=== Test 5: Invalid Cursors ===")
+    assert decode_cursor(encode_cursor('2024-01-01', 'p1')) == ('2024-01-01', 'p1')
+    assert decode_cursor(encode_cursor(3.5, 'p1'), (int, float)) == (3.5, 'p1')
+    bad = {
+        'not base64': '!!!',
+        'not json': base64.urlsafe_b64encode(b'{oops').decode('ascii'),
+        'not a list': raw_cursor({'a': 1}),
+        'wrong length': raw_cursor(['2024-01-01']),
+        'id not a string': raw_cursor(['2024-01-01', 5]),
+        'number for a date field': raw_cursor([5, 'p1']),
+        'bool': raw_cursor([True, 'p1']),
+    }
+    for name, cursor in bad.items():
+        try:
+            storage._paginate(make_records(3), 'created_at', cursor=cursor)
+        except ValueError:
+            continue
+        raise AssertionError(f"{name} cursor should be rejected")
+    try:
+        storage._paginate([{'id': 'a', 'score': 1}], 'score', cursor=encode_cursor('2024-01-01', 'p1'))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a date cursor should be rejected for a score listing")
+    print(f"✓ {len(bad) + 1} malformed cursors rejected with ValueError")
+
+if __name__ == "__main__":
+    print("🔍 Testing Pagination...")
+    test_cursor_pages_cover_everything_once()
+    test_cursor_is_stable_under_inserts()
+    test_numbered_pages_and_limits()
+    test_numeric_sort_field()
+    test_invalid_cursors()
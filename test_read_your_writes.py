@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script to verify read-your-writes consistency across instances
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cloud_storage import cloud_storage, CloudStorageManager
+
+def test_read_your_writes():
+    """Test that a write is visible immediately to the session that made it."""
+    print("🔍 Testing Read-Your-Writes Consistency...")
+
+    # A second manager stands in for another App Engine instance with its own cache
+    other_instance = CloudStorageManager()
+
+    team_members = cloud_storage.get_all_team_members()
+    if not team_members:
+        print("❌ No team members found to test with")
+        return
+
+    test_member = team_members[0]
+    member_id = test_member['id']
+    original_description = test_member['description']
+
+    # Warm the other instance's cache with the current data
+    print("\n=== Test 1: Warm Other Instance Cache ===")
+    other_instance.get_all_team_members()
+    cached = other_instance.get_team_member(member_id)
+    print(f"✓ Other instance cached: {cached.get('updated_at', 'No updated_at')}")
+
+    try:
+        # Write through this instance and collect the session write tokens
+        print("\n=== Test 2: Write and Collect Tokens ===")
+        cloud_storage.pop_write_tokens()
+        test_description = f"{original_description} [RYW TEST]"
+        updated = cloud_storage.update_team_member(member_id=member_id, description=test_description)
+        tokens = cloud_storage.pop_write_tokens()
+        if updated and 'team_members/' in tokens:
+            print(f"✓ Write recorded token: {tokens}")
+        else:
+            print(f"❌ Expected a team_members/ write token, got: {tokens}")
+            return
+
+        # The other instance must honour the token without any sleep
+        print("\n=== Test 3: Read on Other Instance With Tokens ===")
+        other_instance.require_versions(tokens)
+        direct_load = other_instance.get_team_member(member_id)
+        listing = {m['id']: m for m in other_instance.get_all_team_members()}
+        if direct_load and direct_load['description'] == test_description:
+            print("✓ Direct read sees the write")
+        else:
+            print("❌ Direct read returned stale data")
+        if member_id in listing and listing[member_id]['description'] == test_description:
+            print("✓ Listing sees the write")
+        else:
+            print("❌ Listing returned stale data")
+
+        # The writing instance must see its own write too
+        print("\n=== Test 4: Read on Writing Instance ===")
+        cloud_storage.require_versions(tokens)
+        own_load = cloud_storage.get_team_member(member_id)
+        if own_load and own_load['description'] == test_description:
+            print("✓ Writing instance sees its own write")
+        else:
+            print("❌ Writing instance returned stale data")
+    finally:
+        # Restore the original description
+        cloud_storage.update_team_member(member_id=member_id, description=original_description)
+        cloud_storage.pop_write_tokens()
+        print("\n✓ Restored original description")
+
+if __name__ == "__main__":
+    test_read_your_writes()
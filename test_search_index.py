@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script to verify search ranking, prefix matching, incremental updates and paged hits (no bucket needed)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from search_index import SearchIndex, tokenize
+from cloud_storage import CloudStorageManager
+
+PROJECTS = [
+    {'id': 'p1', 'title': 'Flood Maps', 'tags': 'water, hazards', 'creator_name': 'Ana', 'description': 'River flooding'},
+    {'id': 'p2', 'title': 'Soil Survey', 'tags': 'soil', 'creator_name': 'Ben', 'description': 'Flood plain soils'},
+    {'id': 'p3', 'title': 'Crop Yields', 'tags': 'farming', 'creator_name': 'Cy', 'description': 'Corn and wheat'},
+    {'id': 'p4', 'title': 'Old Flood Map', 'tags': '', 'creator_name': 'Di', 'description': '', 'is_active': False},
+]
+MEMBERS = [{'id': 'm1', 'name': 'Flo Rivers', 'title': 'Flood mapping lead', 'description': 'Builds dashboards'}]
+
+def build_index():
+    """Index the sample projects and team members."""
+    index = SearchIndex()
+    index.apply('projects/', {project['id']: project for project in PROJECTS})
+    index.apply('team_members/', {member['id']: member for member in MEMBERS})
+    return index
+
+def ids(hits):
+    """Hit ids, best first, as _paginate orders them."""
+    return [hit['id'] for hit in sorted(hits, key=lambda hit: (hit['score'], hit['id']), reverse=True)]
+
+def test_tokenize():
+    """Terms are lowercased, accent-folded, stemmed and stripped of stopwords."""
+    print("\n=== Test 1: Tokenize ===")
+    assert tokenize('The Maps of Café Counties') == ['map', 'cafe', 'county']
+    print("✓ 'The Maps of Café Counties' -> map, cafe, county")
+
+def test_ranking():
+    """A title match outranks a description match; inactive records are not indexed."""
+    print("\n=== Test 2: Ranking ===")
+    index = build_index()
+    hits = index.search('flood')
+    assert ids(hits) == ['p1', 'm1', 'p2'], ids(hits)
+    assert all(hit['score'] > 0 for hit in hits)
+    assert {hit['type'] for hit in hits} == {'projects', 'team_members'}
+    assert ids(index.search('flood', ['team_members/'])) == ['m1']
+    print(f"✓ flood -> {ids(hits)}")
+
+def test_every_term_and_prefix():
+    """Every term must match, and the last one also matches as a prefix."""
+    print("\n=== Test 3: All Terms And Prefix ===")
+    index = build_index()
+    assert ids(index.search('flood hazard')) == ['p1']
+    assert set(ids(index.search('crop yie'))) == {'p3'}
+    assert index.search('flood corn') == []
+    assert index.search('the of') == []
+    print("✓ AND semantics and last-term prefix expansion")
+
+def test_incremental_updates():
+    """Replacing, deactivating and removing records update the postings."""
+    print("\n=== Test 4: Incremental Updates ===")
+    index = build_index()
+    index.add('projects/', dict(PROJECTS[2], title='Flood Crops'))
+    assert 'p3' in ids(index.search('flood'))
+    index.apply('projects/', {'p1': None, 'p3': dict(PROJECTS[2], is_active=False)})
+    assert ids(index.search('flood')) == ['m1', 'p2']
+    assert index.search('yields') == []
+    restored = SearchIndex.from_dict(index.to_dict())
+    assert ids(restored.search('flood')) == ids(index.search('flood'))
+    print("✓ Changes applied; stored form reloads to the same results")
+
+def test_paged_hits():
+    """Hits page by score through the same cursor pagination as listings."""
+    print("\n=== Test 5: Paged Hits ===")
+    index = SearchIndex()
+    index.apply('projects/', {f'p{i}': {'id': f'p{i}', 'title': 'map ' * (i % 4 + 1), 'description': f'survey {i}'}
+                              for i in range(12)})
+    storage = CloudStorageManager()
+    hits = index.search('map')
+    page = storage._paginate(hits, 'score', limit=5)
+    seen = []
+    while True:
+        seen.extend(hit['id'] for hit in page['items'])
+        if not page['next_cursor']:
+            break
+        page = storage._paginate(hits, 'score', limit=5, cursor=page['next_cursor'])
+    assert seen == ids(hits) and len(seen) == 12
+    print(f"✓ {len(seen)} hits over 3 pages, best first")
+
+if __name__ == "__main__":
+    print("🔍 Testing Search Index...")
+    test_tokenize()
+    test_ranking()
+    test_every_term_and_prefix()
+    test_incremental_updates()
+    test_paged_hits()
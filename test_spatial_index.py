@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script to verify antimeridian boxes, radius bounds and nearest-first proximity queries (no bucket needed)
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from spatial_index import (SpatialIndex, split_box, radius_box, haversine_km, project_point,
+                           check_extent)
+
+def place(record_id, lat, lon, **fields):
+    """A project record placed at a point."""
+    return dict({'id': record_id, 'title': record_id, 'location': {'lat': lat, 'lon': lon}}, **fields)
+
+def contains(boxes, lat, lon):
+    """Whether any of the boxes holds the point."""
+    return any(west <= lon <= east and south <= lat <= north for west, south, east, north in boxes)
+
+def test_split_box():
+    """Boxes crossing the antimeridian split in two; others are kept whole."""
+    print("\n=== Test 1: Split At The Antimeridian ===")
+    assert split_box(170, -10, -170, 10) == [(170, -10, 180.0, 10), (-180.0, -10, -170, 10)]
+    assert split_box(-10, -10, 10, 10) == [(-10, -10, 10, 10)]
+    assert project_point({'extent': [170, -10, -170, 10]}) == (180.0, 0.0)
+    assert project_point({'extent': [160, 0, -140, 10]}) == (-170.0, 5.0)
+    try:
+        check_extent([0, 10, 5, -10])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("south above north should be rejected")
+    print("✓ 170..-170 split into two boxes; extent centers wrap")
+
+def test_radius_box():
+    """Radius boxes wrap across ±180 and span every longitude once they reach a pole."""
+    print("\n=== Test 2: Radius Boxes ===")
+    boxes = radius_box(0, 179.5, 200)
+    assert len(boxes) == 2, boxes
+    assert contains(boxes, 0, -179.5) and contains(boxes, 0, 178.5) and not contains(boxes, 0, 170)
+    boxes = radius_box(0, -179.5, 200)
+    assert len(boxes) == 2 and contains(boxes, 0, 179.5)
+    (west, south, east, north), = radius_box(89, 45, 500)
+    assert (west, east, north) == (-180.0, 180.0, 90.0) and south < 89
+    assert [box[0::2] for box in radius_box(-85, 0, 1000)] == [(-180.0, 180.0)]
+    assert len(radius_box(45, 10, 100)) == 1
+    # Every point on the circle falls inside its boxes
+    random.seed(3)
+    for _ in range(200):
+        lat, lon, radius = random.uniform(-80, 80), random.uniform(-180, 180), random.uniform(1, 3000)
+        boxes = radius_box(lat, lon, radius)
+        for target_lat, target_lon in ((random.uniform(-90, 90), random.uniform(-180, 180)) for _ in range(20)):
+            if haversine_km(lat, lon, target_lat, target_lon) <= radius:
+                assert contains(boxes, target_lat, target_lon), (lat, lon, radius, target_lat, target_lon)
+    print("✓ Circles wrap at ±180 and cover the poles")
+
+def test_near_ordering():
+    """near returns everything within the radius, nearest first, matching a brute-force scan."""
+    print("\n=== Test 3: Nearest First ===")
+    random.seed(7)
+    records = [place(f'p{i:03d}', random.uniform(-60, 60), random.uniform(-180, 180)) for i in range(400)]
+    index = SpatialIndex()
+    index.apply({record['id']: record for record in records})
+    for lat, lon, radius in ((0, 179.9, 1500), (45, -120, 800), (-30, -179, 2500)):
+        hits = index.near(lat, lon, radius)
+        expected = sorted((round(haversine_km(lat, lon, r['location']['lat'], r['location']['lon']), 3), r['id'])
+                          for r in records)
+        expected = [record_id for distance, record_id in expected if distance <= radius]
+        assert [hit['id'] for hit in hits] == expected
+        assert [hit['distance_km'] for hit in hits] == sorted(hit['distance_km'] for hit in hits)
+    print("✓ Same hits and order as a brute-force scan, including across ±180")
+
+def test_within_and_extents():
+    """Boxes crossing the antimeridian find points and extents on both sides."""
+    print("\n=== Test 4: Within And Extents ===")
+    index = SpatialIndex()
+    index.apply({
+        'fiji': place('fiji', -17.7, 178.1),
+        'samoa': place('samoa', -13.8, -172.1),
+        'quito': place('quito', -0.2, -78.5),
+        'pacific': {'id': 'pacific', 'title': 'Pacific', 'extent': [170, -30, -160, 0]},
+        'hidden': place('hidden', -15, 179, is_active=False),
+    })
+    assert {hit['id'] for hit in index.within(175, -20, -170, -10)} == {'fiji', 'samoa', 'pacific'}
+    assert {hit['id'] for hit in index.within(-175, -5, -165, -1)} == {'pacific'}
+    assert {hit['id'] for hit in index.within(-80, -1, -70, 1)} == {'quito'}
+    nearest = index.near(-5, -165, 300)
+    assert [hit['id'] for hit in nearest] == ['pacific'] and nearest[0]['distance_km'] == 0
+    # Two degrees west of the extent's edge, far from any point
+    edge = index.near(-15, 168, 300)
+    assert [hit['id'] for hit in edge] == ['pacific'], "distance to an extent is to its nearest edge"
+    assert edge[0]['distance_km'] < 2 * 111.2
+    index.remove('pacific')
+    assert index.near(-5, -165, 300) == []
+    print("✓ Antimeridian queries and extent distances")
+
+if __name__ == "__main__":
+    print("🔍 Testing Spatial Index...")
+    test_split_box()
+    test_radius_box()
+    test_near_ordering()
+    test_within_and_extents()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the storage cache's eviction, TTLs and generation revalidation (no bucket needed)
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from storage_cache import JsonCache, parse_prefix_ttls
+
+# Short enough to wait out, long enough not to expire while a test is still reading
+SHORT_TTL = 0.05
+
+def test_lru_eviction():
+    """Entries over the byte budget are evicted least recently used first."""
+    print("\n=== Test 1: LRU Eviction ===")
+    cache = JsonCache(max_bytes=300, default_ttl=60, prefix_ttls={})
+    cache.put('a.json', {'n': 'a'}, 100)
+    cache.put('b.json', {'n': 'b'}, 100)
+    cache.put('c.json', {'n': 'c'}, 100)
+    assert cache.get('a.json') == {'n': 'a'}  # a is now the most recently used
+    cache.put('d.json', {'n': 'd'}, 100)
+    assert cache.get('b.json') is None, "b should have been evicted first"
+    assert [cache.get(path) is not None for path in ('a.json', 'c.json', 'd.json')] == [True, True, True]
+    assert cache.current_bytes == 300
+    assert cache.stats()['evictions'] == 1
+    cache.put('huge.json', {'n': 'huge'}, 200)
+    assert cache.get('huge.json') is None, "entries over half the budget are not cached"
+    print("✓ Least recently used entry evicted; oversized entry skipped")
+
+def test_ttl_for_longest_prefix():
+    """The longest matching prefix decides an entry's TTL."""
+    print("\n=== Test 2: TTL Per Prefix ===")
+    ttls = parse_prefix_ttls('projects/=60, projects/_manifest.json=5,users/=10')
+    assert ttls == {'projects/': 60.0, 'projects/_manifest.json': 5.0, 'users/': 10.0}
+    cache = JsonCache(max_bytes=1000, default_ttl=30, prefix_ttls=ttls)
+    assert cache.ttl_for('projects/p1.json') == 60
+    assert cache.ttl_for('projects/_manifest.json') == 5
+    assert cache.ttl_for('users/u1.json') == 10
+    assert cache.ttl_for('gallery/g1.json') == 30
+    print("✓ Longest prefix wins; unmatched paths use the default")
+
+def test_expiry_without_generation():
+    """An expired entry without a generation is dropped."""
+    print("\n=== Test 3: Expiry Without Generation ===")
+    cache = JsonCache(max_bytes=1000, default_ttl=SHORT_TTL, prefix_ttls={})
+    cache.put('a.json', {'n': 1}, 10)
+    assert cache.get('a.json') == {'n': 1}
+    time.sleep(SHORT_TTL * 1.5)
+    assert cache.get('a.json') is None
+    assert cache.stale_generation('a.json') is None
+    assert cache.stats()['entries'] == 0 and cache.current_bytes == 0
+    print("✓ Entry removed once its TTL passed")
+
+def test_expiry_with_generation_and_revalidation():
+    """An expired entry with a generation is kept for revalidation and served again once confirmed."""
+    print("\n=== Test 4: Expiry With Generation ===")
+    cache = JsonCache(max_bytes=1000, default_ttl=SHORT_TTL, prefix_ttls={})
+    cache.put('a.json', {'n': 1}, 10, generation=7, metageneration=1)
+    assert cache.stale_generation('a.json') is None, "a fresh entry needs no revalidation"
+    time.sleep(SHORT_TTL * 1.5)
+    assert cache.get('a.json') is None
+    assert cache.stale_generation('a.json') == 7
+    assert cache.revalidated('a.json') == {'n': 1}
+    assert cache.get('a.json') == {'n': 1}
+    assert cache.generation('a.json') == (7, 1)
+    assert cache.revalidated('missing.json') is None
+    print("✓ Expired entry kept with its generation and served after a 304")
+
+def test_confirm():
+    """A listing's generation restarts the TTL only if it matches the cached one."""
+    print("\n=== Test 5: Confirm From Listing ===")
+    cache = JsonCache(max_bytes=1000, default_ttl=SHORT_TTL, prefix_ttls={})
+    cache.put('p/a.json', {'n': 'a'}, 10, generation=3)
+    cache.put('p/b.json', {'n': 'b'}, 10, generation=4)
+    cache.put('p/c.json', {'n': 'c'}, 10)
+    cache.put('q/d.json', {'n': 'd'}, 10, generation=5)
+    assert cache.generations('p/') == {'p/a.json': 3, 'p/b.json': 4, 'p/c.json': None}
+    time.sleep(SHORT_TTL * 1.5)
+    assert cache.confirm('p/a.json', 3)
+    assert not cache.confirm('p/b.json', 9), "a changed generation must not be confirmed"
+    assert not cache.confirm('p/c.json', 1), "entries without a generation cannot be confirmed"
+    assert not cache.confirm('p/missing.json', 1)
+    assert cache.get('p/a.json') == {'n': 'a'}
+    assert cache.get('p/b.json') is None
+    print("✓ Only entries still at the listed generation were confirmed")
+
+def test_private_copies():
+    """Callers get copies, so mutating a loaded record never changes the cache."""
+    print("\n=== Test 6: Private Copies ===")
+    cache = JsonCache(max_bytes=1000, default_ttl=60, prefix_ttls={})
+    record = {'tags': ['a']}
+    cache.put('a.json', record, 10)
+    record['tags'].append('b')
+    cache.get('a.json')['tags'].append('c')
+    assert cache.get('a.json') == {'tags': ['a']}
+    cache.invalidate_prefix('a')
+    assert cache.get('a.json') is None
+    print("✓ Stored and returned values are independent copies")
+
+if __name__ == "__main__":
+    print("🔍 Testing Storage Cache...")
+    test_lru_eviction()
+    test_ttl_for_longest_prefix()
+    test_expiry_without_generation()
+    test_expiry_with_generation_and_revalidation()
+    test_confirm()
+    test_private_copies()
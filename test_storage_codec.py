@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script to verify stored records round-trip through the codec and legacy JSON still reads (no bucket needed)
+"""
+import sys
+import os
+import gzip
+import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from storage_codec import encode_record, decode_record, RECORD_MAGIC, GZIP_MIN_BYTES
+
+RECORD = {'id': 'p1', 'title': 'Flood map', 'tags': ['water', 'GIS'], 'is_active': True, 'score': 1.5}
+
+def test_small_record_round_trip():
+    """Small records are stored uncompressed behind the GISREC/1 header."""
+    print("\n=== Test 1: Headered Round Trip ===")
+    for serializer in ('json', 'orjson'):
+        body, encoding = encode_record(RECORD, serializer)
+        assert encoding is None
+        assert body.startswith(RECORD_MAGIC + f'1 {serializer}\n'.encode('ascii')), body[:20]
+        assert decode_record(body) == RECORD
+    print("✓ Both serializers round-trip behind the header")
+
+def test_large_record_is_gzipped():
+    """Records past GZIP_MIN_BYTES are gzip-compressed and still decode, compressed or not."""
+    print("\n=== Test 2: Gzip Round Trip ===")
+    record = dict(RECORD, description='x' * (GZIP_MIN_BYTES * 2))
+    body, encoding = encode_record(record)
+    assert encoding == 'gzip'
+    assert len(body) < GZIP_MIN_BYTES
+    # Served as stored (no decompressive transcoding) and as the client decodes it
+    assert decode_record(body) == record
+    assert decode_record(gzip.decompress(body)) == record
+    print(f"✓ {GZIP_MIN_BYTES * 2}-byte description stored in {len(body)} bytes")
+
+def test_legacy_json():
+    """Objects written before the header existed are plain JSON and still read."""
+    print("\n=== Test 3: Legacy Plain JSON ===")
+    assert decode_record(json.dumps(RECORD, indent=2).encode('utf-8')) == RECORD
+    assert decode_record(gzip.compress(json.dumps(RECORD).encode('utf-8'))) == RECORD
+    print("✓ Plain and gzipped legacy JSON decode")
+
+def test_unreadable_headers():
+    """Records from a newer format version or an unknown serializer are refused, not misread."""
+    print("\n=== Test 4: Unsupported Headers ===")
+    for body in (RECORD_MAGIC + b'2 json\n{}', RECORD_MAGIC + b'1 msgpack\n{}'):
+        try:
+            decode_record(body)
+        except ValueError as e:
+            print(f"✓ Refused {body[:16]!r}: {e}")
+        else:
+            raise AssertionError(f"{body!r} should not decode")
+
+if __name__ == "__main__":
+    print("🔍 Testing Storage Codec...")
+    test_small_record_round_trip()
+    test_large_record_is_gzipped()
+    test_legacy_json()
+    test_unreadable_headers()
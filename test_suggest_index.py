@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script to verify typeahead prefix matching, recency ranking and incremental updates (no bucket needed)
+"""
+import sys
+import os
+from datetime import timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from suggest_index import SuggestIndex, phrase_key, recency_weight, RECENCY_HALF_LIFE_DAYS, RECENCY_EPOCH, MAX_SUGGESTIONS
+
+PROJECTS = [
+    {'id': 'p1', 'title': 'Flood Maps', 'tags': 'Water, GIS', 'creator_name': 'Ana Lopez', 'created_at': '2024-01-01T00:00:00'},
+    {'id': 'p2', 'title': 'River Flooding', 'tags': 'water', 'creator_name': 'Ben', 'created_at': '2025-06-01T00:00:00'},
+    {'id': 'p3', 'title': 'Café Survey', 'tags': 'soil', 'creator_name': 'Ana Lopez', 'created_at': '2024-03-01T00:00:00'},
+    {'id': 'p4', 'title': 'Flood Archive', 'tags': '', 'creator_name': 'Di', 'created_at': '2026-01-01T00:00:00', 'is_active': False},
+]
+MEMBERS = [{'id': 'm1', 'name': 'Flo Rivers'}]
+
+def build_index():
+    """Index the sample projects and team members."""
+    index = SuggestIndex()
+    index.apply('projects/', {project['id']: project for project in PROJECTS})
+    index.apply('team_members/', {member['id']: member for member in MEMBERS})
+    return index
+
+def texts(suggestions):
+    """Suggestion texts, in the order returned."""
+    return [suggestion['text'] for suggestion in suggestions]
+
+def test_phrase_keys_and_weights():
+    """Phrases fold accents and punctuation; weights double every half-life."""
+    print("\n=== Test 1: Phrase Keys And Weights ===")
+    assert phrase_key('  Café -- Survey! ') == 'cafe survey'
+    assert recency_weight('2024-01-01T00:00:00') == 1.0
+    half_life_later = (RECENCY_EPOCH + timedelta(days=RECENCY_HALF_LIFE_DAYS)).isoformat()
+    assert recency_weight(half_life_later) == 2.0
+    assert recency_weight(None) == recency_weight('not a date') == 1.0
+    print("✓ Keys normalized; weight doubles per half-life")
+
+def test_word_start_prefixes():
+    """Any word of a phrase can start the match, but not the middle of a word."""
+    print("\n=== Test 2: Word Starts ===")
+    index = build_index()
+    assert set(texts(index.suggest('flo'))) == {'Flood Maps', 'River Flooding', 'Flo Rivers'}
+    assert texts(index.suggest('lop')) == ['Ana Lopez']
+    assert texts(index.suggest('cafe')) == ['Café Survey']
+    assert index.suggest('lood') == []
+    assert index.suggest('archive') == [], "inactive records are not indexed"
+    assert index.suggest('  ') == []
+    print("✓ Prefixes match at word starts only")
+
+def test_ranking_and_kinds():
+    """Newer and more widely used phrases come first; kinds filter the results."""
+    print("\n=== Test 3: Ranking ===")
+    index = build_index()
+    assert texts(index.suggest('flood')) == ['River Flooding', 'Flood Maps']
+    water = index.suggest('wat')
+    assert water == [{'text': 'water', 'kind': 'tag', 'count': 2}]
+    assert index.suggest('flood', kinds=['project'])[0] == {'text': 'River Flooding', 'kind': 'project', 'count': 1, 'id': 'p2'}
+    assert index.suggest('ana')[0] == {'text': 'Ana Lopez', 'kind': 'creator', 'count': 2}
+    assert texts(index.suggest('f', kinds=['team_member'])) == ['Flo Rivers']
+    assert len(index.suggest('f', limit=1)) == 1
+    print("✓ Recency ranking; single-record phrases carry their id")
+
+def test_limits():
+    """Limits are clamped to MAX_SUGGESTIONS."""
+    print("\n=== Test 4: Limits ===")
+    index = SuggestIndex()
+    index.apply('projects/', {f'p{i}': {'id': f'p{i}', 'title': f'Map {i}'} for i in range(30)})
+    assert len(index.suggest('map', limit=100)) == MAX_SUGGESTIONS
+    assert len(index.suggest('map', limit=-1)) == 1
+    print(f"✓ At most {MAX_SUGGESTIONS} suggestions")
+
+def test_incremental_updates():
+    """Changes after a query update the sorted keys and clear the memo."""
+    print("\n=== Test 5: Incremental Updates ===")
+    index = build_index()
+    assert texts(index.suggest('flood')) == ['River Flooding', 'Flood Maps']
+    index.apply('projects/', {'p2': None, 'p3': dict(PROJECTS[2], title='Flood Survey')})
+    assert texts(index.suggest('flood')) == ['Flood Survey', 'Flood Maps']
+    assert index.suggest('river') == [{'text': 'Flo Rivers', 'kind': 'team_member', 'count': 1, 'id': 'm1'}]
+    assert index.suggest('wat') == [{'text': 'water', 'kind': 'tag', 'count': 1}]
+    assert index.suggest('cafe') == []
+    restored = SuggestIndex.from_dict(index.to_dict())
+    assert restored.suggest('f') == index.suggest('f')
+    assert restored.stats() == index.stats()
+    print("✓ Changes applied; stored form reloads to the same suggestions")
+
+if __name__ == "__main__":
+    print("🔍 Testing Suggest Index...")
+    test_phrase_keys_and_weights()
+    test_word_start_prefixes()
+    test_ranking_and_kinds()
+    test_limits()
+    test_incremental_updates()